@@ -0,0 +1,47 @@
+from backend.src.ingestion.embeddings import SentenceTransformerEmbedder, OnnxEmbedder
+import numpy as np
+import asyncio
+import time
+
+
+async def measure(embedder, texts, is_query):
+    # the first call pays one-off costs (thread start, memory allocation)
+    await embedder.embed(texts[:8], is_query=is_query)
+    start = time.perf_counter()
+    embeddings = await embedder.embed(texts, is_query=is_query)
+    return np.asarray(embeddings, dtype=np.float32), time.perf_counter() - start
+
+
+async def main():
+    model_name = "sentence-transformers/all-MiniLM-L6-v2"
+    texts = [
+        "Qual é o prazo para o exame de qualificação do doutorado?",
+        "Como comprovar a proficiência em inglês no mestrado?",
+        "O aluno deverá completar o número mínimo de créditos exigido pelo programa antes da defesa.",
+        "A prorrogação de prazo poderá ser concedida pela Comissão de Pós-Graduação mediante justificativa.",
+        "Bolsistas devem manter dedicação integral às atividades do programa e bom desempenho acadêmico.",
+        "O trancamento de matrícula não poderá exceder dois períodos letivos, consecutivos ou não.",
+    ] * 100
+
+    start = time.perf_counter()
+    reference = SentenceTransformerEmbedder(model_name)
+    print(f"pytorch load {time.perf_counter() - start:.2f}s")
+    reference_vectors, seconds = await measure(reference, texts, is_query=False)
+    print(f"pytorch: {len(texts) / seconds:.1f} texts/s")
+
+    for quantize in (False, True):
+        start = time.perf_counter()
+        embedder = OnnxEmbedder(model_name, quantize=quantize)
+        load_seconds = time.perf_counter() - start
+        vectors, seconds = await measure(embedder, texts, is_query=False)
+        cosine = np.sum(vectors * reference_vectors, axis=1) / (
+            np.linalg.norm(vectors, axis=1) * np.linalg.norm(reference_vectors, axis=1)
+        )
+        print(f"{embedder.fingerprint()}: load {load_seconds:.2f}s, {len(texts) / seconds:.1f} texts/s, "
+              f"cosine to pytorch mean {cosine.mean():.5f} min {cosine.min():.5f}")
+        embedder.close()
+    reference.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,37 @@
+from backend.src.ingestion.extraction import DoclingExtractor
+from collections import Counter
+import time
+
+
+def main():
+    sources = [
+        "../ingestion/data/Edital-PG-INF-2025.2.pdf",
+        "../ingestion/data/Edital_PIPD.pdf",
+        "../ingestion/data/Regulamento-PG-DI-2022-12-06.pdf",
+    ]
+    default_extractor = DoclingExtractor()
+    fast_extractor = DoclingExtractor(fast=True)
+    default_extractor.warm_up()
+    fast_extractor.warm_up()
+
+    for source in sources:
+        name = source.split("/")[-1]
+
+        start = time.perf_counter()
+        default_extractor.convert_to_markdown(source)
+        default_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        fast_extractor.convert_to_markdown(source)
+        fast_seconds = time.perf_counter() - start
+
+        reports = fast_extractor.page_reports[name]
+        methods = Counter(r.method for r in reports)
+        print(f"{name}: default {default_seconds:.2f}s, fast {fast_seconds:.2f}s "
+              f"({default_seconds / fast_seconds:.1f}x), pages {dict(methods)}")
+        for r in reports:
+            print(f"    page {r.page_number:3d}: {r.method:10s} {r.text_chars:6d} chars {r.seconds:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+from backend.src.ingestion.vector_db import NumpyVectorDatabase, QdrantVectorDatabase
+from backend.src.ingestion.data_models import ChunkBatch, DataPoint
+from backend.src.ingestion.embeddings import BaseEmbedder
+from typing import List
+import numpy as np
+import subprocess
+import tempfile
+import resource
+import asyncio
+import time
+import uuid
+import sys
+
+
+DIMENSION = 1536
+CHUNKS = 20_000
+# chunks embedded and inserted together, as when a large document is updated
+WINDOW = 5_000
+
+
+class RandomEmbedder(BaseEmbedder):
+    """
+        Stands in for the embedding model, so the benchmark measures the pipeline's own copies.
+    """
+    def __init__(self):
+        self._rng = np.random.default_rng(0)
+
+    def dimension(self) -> int:
+        return DIMENSION
+
+    async def embed(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        return (await self.embed_array(texts, is_query)).tolist()
+
+    async def embed_array(self, texts: List[str], is_query: bool) -> np.ndarray:
+        return self._rng.standard_normal((len(texts), DIMENSION), dtype=np.float32)
+
+
+def make_windows():
+    document_id = uuid.uuid4()
+    for start in range(0, CHUNKS, WINDOW):
+        yield [
+            DataPoint(id=uuid.uuid4(), document_id=document_id, document_name=f"doc-{i // 1_000}",
+                      chunk_text=f"chunk {i} " * 50, ordinal=i, vector=[])
+            for i in range(start, start + WINDOW)
+        ]
+
+
+async def ingest_data_points(db_client, embedder: BaseEmbedder, collection_name: str):
+    # one boxed-float list per chunk, copied into each DataPoint
+    for data_points in make_windows():
+        embeddings = await embedder.embed([p.chunk_text for p in data_points], is_query=False)
+        for p, e in zip(data_points, embeddings):
+            p.vector = e
+        await db_client.insert(collection_name=collection_name, data_points=data_points)
+
+
+async def ingest_chunk_batches(db_client, embedder: BaseEmbedder, collection_name: str):
+    # one float32 matrix per window, carried alongside the chunk columns
+    for data_points in make_windows():
+        batch = ChunkBatch.from_data_points(data_points)
+        batch.vectors = await embedder.embed_array(batch.chunk_texts, is_query=False)
+        await db_client.insert_batch(collection_name=collection_name, batch=batch)
+
+
+async def run(mode: str, backend: str):
+    with tempfile.TemporaryDirectory() as path:
+        if backend == "qdrant":
+            db_client = QdrantVectorDatabase(url="http://localhost:6333")
+        else:
+            db_client = NumpyVectorDatabase(path=path)
+        collection_name = f"bench_ingestion_{mode}"
+        await db_client.create_collection(collection_name, vector_field_dimension=DIMENSION)
+        ingest = ingest_chunk_batches if mode == "chunk_batch" else ingest_data_points
+        start = time.perf_counter()
+        await ingest(db_client, RandomEmbedder(), collection_name)
+        seconds = time.perf_counter() - start
+        await db_client.delete_collection(collection_name)
+        await db_client.close()
+    # ru_maxrss is reported in KiB on Linux
+    peak_rss_mib = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{backend:6s} {mode:11s}: {CHUNKS / seconds:8.0f} chunks/s, peak RSS {peak_rss_mib:7.1f} MiB")
+
+
+def main():
+    # each configuration runs in its own process, so peak RSS is not shared between them
+    backends = sys.argv[1:] or ["numpy", "qdrant"]
+    for backend in backends:
+        for mode in ("data_point", "chunk_batch"):
+            subprocess.run([sys.executable, "-m", "backend.src.benchmarks.bench_ingestion", "--run", mode, backend], check=False)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 4 and sys.argv[1] == "--run":
+        asyncio.run(run(sys.argv[2], sys.argv[3]))
+    else:
+        main()
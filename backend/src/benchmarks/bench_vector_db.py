@@ -0,0 +1,57 @@
+from backend.src.ingestion.vector_db import NumpyVectorDatabase, QdrantVectorDatabase
+from backend.src.ingestion.data_models import DataPoint
+import numpy as np
+import tempfile
+import asyncio
+import time
+import uuid
+
+
+DIMENSION = 1536
+QUERIES = 100
+
+
+def make_data_points(count: int, rng: np.random.Generator):
+    vectors = rng.standard_normal((count, DIMENSION), dtype=np.float32)
+    document_id = uuid.uuid4()
+    return [
+        DataPoint(id=uuid.uuid4(), document_id=document_id, document_name=f"doc-{i // 100}", chunk_text=f"chunk {i}",
+                  ordinal=i % 100, vector=v.tolist())
+        for i, v in enumerate(vectors)
+    ]
+
+
+async def measure(db_client, collection_name: str, data_points, queries):
+    await db_client.create_collection(collection_name, vector_field_dimension=DIMENSION)
+    start = time.perf_counter()
+    for i in range(0, len(data_points), 1_000):
+        await db_client.insert(collection_name=collection_name, data_points=data_points[i:i + 1_000])
+    insert_seconds = time.perf_counter() - start
+
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        await db_client.retrieve(collection_name=collection_name, query_vector=query, top_k=5)
+        latencies.append(time.perf_counter() - start)
+    await db_client.delete_collection(collection_name)
+    latencies = np.array(latencies) * 1000
+    return insert_seconds, np.median(latencies), np.percentile(latencies, 95)
+
+
+async def main():
+    rng = np.random.default_rng(0)
+    queries = rng.standard_normal((QUERIES, DIMENSION), dtype=np.float32).tolist()
+    qdrant = QdrantVectorDatabase(url="http://localhost:6333")
+
+    with tempfile.TemporaryDirectory() as path:
+        numpy_db = NumpyVectorDatabase(path=path)
+        for count in (1_000, 10_000, 100_000):
+            data_points = make_data_points(count, rng)
+            for name, db_client in (("qdrant", qdrant), ("numpy", numpy_db)):
+                insert_seconds, p50, p95 = await measure(db_client, f"bench_{count}", data_points, queries)
+                print(f"{name:6s} {count:7d} chunks: insert {insert_seconds:.2f}s, retrieve p50 {p50:.2f}ms p95 {p95:.2f}ms")
+    await qdrant.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,7 +1,12 @@
+from .ingestion.cache import AnswerCache
+from .ingestion.data_models import DataPoint
 from .ingestion.embeddings import BaseEmbedder
-from .ingestion.vector_db import BaseVectorDatabase
+from .ingestion.lexical_index import BM25Index
+from .ingestion.vector_db import BaseVectorDatabase, merge_neighbors, reciprocal_rank_fusion
 from .llm import BaseLlm
-from typing import List, Dict
+from .prompt import PromptBuilder
+from typing import Any, AsyncIterator, List, Dict, Optional, Tuple
+import re
 
 
 class ChatBot:
@@ -12,7 +17,10 @@ class ChatBot:
         context from a vector database, and uses a Large Language Model (LLM) to generate
         a precise, context-bound response based on a specialized prompt template.
     """
-    def __init__(self, embedder: BaseEmbedder, vector_db: BaseVectorDatabase, llm: BaseLlm, collection_name: str):
+    def __init__(self, embedder: BaseEmbedder, vector_db: BaseVectorDatabase, llm: BaseLlm, collection_name: str, top_k: int = 3, neighbors: int = 0,
+                 lexical_index: Optional[BM25Index] = None, fusion_candidates: int = 10, rrf_k: int = 60,
+                 lexical_shortcut_coverage: Optional[float] = None, multi_query: bool = False, sub_questions: int = 0,
+                 answer_cache: Optional[AnswerCache] = None, prompt_builder: Optional[PromptBuilder] = None):
         """
             Initializes the ChatBot with required components and the retrieval context.
             Args:
@@ -20,49 +28,196 @@ class ChatBot:
                 vector_db (BaseVectorDatabase): The service used to search for and retrieve relevant documents/chunks.
                 llm (BaseLlm): The service used to generate the final text response based on the prompt and context.
                 collection_name (str): The name of the vector database collection containing the document chunks.
+                top_k (int, optional): The number of chunks retrieved per question. Defaults to 3.
+                neighbors (int, optional): The number of neighboring chunks, before and after each retrieved chunk,
+                                           added to its context. Defaults to 0.
+                lexical_index (Optional[BM25Index], optional): A BM25 index of the chunks. When set, lexical and dense
+                                                               results are fused with reciprocal-rank fusion. Defaults to None.
+                fusion_candidates (int, optional): The number of results of each retriever entering the fusion. Defaults to 10.
+                rrf_k (int, optional): The rank smoothing constant of the fusion. Defaults to 60.
+                lexical_shortcut_coverage (Optional[float], optional): If set, the first question of a conversation is answered
+                                                                       from lexical results alone, without calling the
+                                                                       embedding model, when the best lexical match covers at
+                                                                       least this share of the question's terms. Defaults to None.
+                multi_query (bool, optional): If True, the last user message is searched on its own in addition to the
+                                              conversation, in the same batched search. Defaults to False.
+                sub_questions (int, optional): The maximum number of sub-questions the LLM splits the last user message
+                                               into, each searched as one more query variant. 0 disables the extra LLM
+                                               call. Defaults to 0.
+                answer_cache (Optional[AnswerCache], optional): A cache of answers, reused for similar queries whose
+                                                                retrieval returns the same chunks. Defaults to None.
+                prompt_builder (Optional[PromptBuilder], optional): Packs the retrieved chunks into the prompt within a token
+                                                                    budget. Defaults to a PromptBuilder with default settings.
         """
         self._embedder = embedder
         self._vector_db = vector_db
         self._llm = llm
         self._collection_name = collection_name
-        self._prompt_template = """
-            Você é um assistente especializado em **Normas Acadêmicas do Programa de Pós-Graduação da PUC-Rio**.
-
-            **1. Papel e Objetivo:**
-            Seu único objetivo é responder à pergunta do usuário utilizando estritamente o contexto fornecido.
-            
-            **2. Instruções de Resposta:**
-            * **Priorize a Informação do contexto:** A resposta DEVE ser baseada exclusivamente nas informações contidas no contexto. Não utilize conhecimento prévio, nem mesmo que pareça correto, se ele não estiver explicitamente suportado no texto fornecido.
-            * **Clareza e Precisão:** Seja direto, claro e preciso.
-            * **Mantenha o Foco:** Responda apenas o que foi perguntado.
-            * **Citação:** Se a informação puder ser atribuída a um parágrafo ou seção específica no contexto, faça a citação no final da resposta, conforme o formato do contexto (exemplo: "Ver Seção 3.2 do documento Regimento.pdf").
-            * **Caso de Informação Ausente:** Se a resposta para a pergunta não puder ser encontrada **de forma alguma** no contexto fornecidos, você deve responder educadamente: "Não encontrei informações suficientes sobre este tópico nos documentos normativos fornecidos. Por favor, reformule a pergunta ou consulte o site do Departamento de Informática ou a Secretaria do Programa de Pós-Graduação da PUC-Rio."
-            
-            **3. Fonte de Informação (Contexto):**
-            O contexto abaixo é derivado de documentos oficiais das normas do programa:
-            ---
-            {chunks}
-            ---
-            
-            **4. Pergunta do Usuário:**
-            {query}
-            
-            **5. Resposta:**
-        """
-        self._chunk_template = """
-            Contexto: {context}
-            Fonte: {source}
+        self._top_k = top_k
+        self._neighbors = neighbors
+        self._lexical_index = lexical_index
+        self._fusion_candidates = fusion_candidates
+        self._rrf_k = rrf_k
+        self._lexical_shortcut_coverage = lexical_shortcut_coverage
+        self._multi_query = multi_query
+        self._sub_questions = sub_questions
+        self._answer_cache = answer_cache
+        self._prompt_builder = prompt_builder if prompt_builder is not None else PromptBuilder()
+        self._sub_question_template = (
+            "Divida a pergunta abaixo em até {count} perguntas mais simples e independentes, que juntas cubram tudo o que "
+            "foi perguntado. Escreva uma pergunta por linha, sem numeração nem comentários. Se a pergunta já for simples, "
+            "repita-a sem alterações.\n\nPergunta: {question}"
+        )
+
+    @staticmethod
+    def _build_query_text(messages: List[Dict[str, str]]) -> str:
+        """
+            Concatenates the last 5 messages of a conversation into the text used as retrieval query.
+            Args:
+                messages (List[Dict[str, str]]): The conversation history.
+            Returns:
+                str: The query text.
+        """
+        return "\n".join([f'{msg["role"]}: {msg["content"]}' for msg in messages[-5:]])
+
+    @staticmethod
+    def _last_question(messages: List[Dict[str, str]]) -> str:
+        """
+            Returns the last user message of a conversation, or the last message if there is none.
+            Args:
+                messages (List[Dict[str, str]]): The conversation history.
+            Returns:
+                str: The last question.
+        """
+        user_messages = [msg["content"] for msg in messages if msg["role"] == "user"]
+        return user_messages[-1] if user_messages else messages[-1]["content"]
+
+    async def _split_question(self, question: str) -> List[str]:
+        """
+            Asks the LLM to split a question into up to `sub_questions` simpler ones.
+            Args:
+                question (str): The question to split.
+            Returns:
+                List[str]: The sub-questions, or an empty list if the LLM call fails.
         """
+        try:
+            response = await self._llm.complete(
+                msg=self._sub_question_template.format(count=self._sub_questions, question=question), model="gpt-5-mini"
+            )
+        except Exception as e:
+            print(f"Error splitting question: {e}")
+            return []
+        # drop any numbering or bullets the model adds anyway
+        lines = [re.sub(r"^\s*(?:[-*•]|\d+[.)])\s*", "", line).strip() for line in response.splitlines()]
+        return [line for line in lines if line][:self._sub_questions]
+
+    async def _query_variants(self, messages: List[Dict[str, str]], text_message: str) -> List[str]:
+        """
+            Builds the texts searched for a conversation turn: the condensed conversation, then, if enabled,
+            the last user message on its own and its sub-questions. Duplicate variants are dropped.
+            Args:
+                messages (List[Dict[str, str]]): The conversation history.
+                text_message (str): The query text built from the conversation.
+            Returns:
+                List[str]: The query variants, the condensed conversation first.
+        """
+        variants = [text_message]
+        question = self._last_question(messages)
+        # on the first turn the condensed conversation already is the question
+        if self._multi_query and len(messages) > 1:
+            variants.append(question)
+        if self._sub_questions > 0:
+            variants.extend(await self._split_question(question))
+        return list(dict.fromkeys(variants))
+
+    async def warm_up(self, questions: List[str]) -> int:
+        """
+            Embeds frequent questions as they are embedded when asked at the start of a conversation,
+            so a caching embedder can answer them without calling the embedding model.
+            Args:
+                questions (List[str]): The frequent questions.
+            Returns:
+                int: The number of questions that were not cached yet, or 0 if the embedder does not cache.
+        """
+        warm = getattr(self._embedder, "warm", None)
+        if warm is None or not questions:
+            return 0
+        return await warm([self._build_query_text([{"role": "user", "content": q}]) for q in questions], is_query=True)
+
+    async def _retrieve(self, messages: List[Dict[str, str]], text_message: str) -> Tuple[List[DataPoint], Optional[List[float]]]:
+        """
+            Retrieves the context chunks of a conversation. The query variants of the turn are embedded in one call
+            and searched in one batched vector database request. A single variant without a lexical index is a plain
+            dense search. Otherwise, the last user message is also searched in the BM25 index (if set) and all rankings
+            are fused with reciprocal-rank fusion, which also dedups chunks found by several variants. A first question
+            whose terms are (almost) all found in one chunk skips the dense search, and the embedding call, entirely:
+            follow-up questions always use the dense search, whose query carries the conversation context.
+            Neighbor expansion runs once, on the merged chunks.
+            Args:
+                messages (List[Dict[str, str]]): The conversation history.
+                text_message (str): The query text built from the conversation.
+            Returns:
+                Tuple[List[DataPoint], Optional[List[float]]]: The retrieved chunks, expanded with their neighbors if
+                                                               `neighbors` is set, and the embedding of the query text
+                                                               (None if the dense search was skipped).
+        """
+        lexical = []
+        query_vector = None
+        if self._lexical_index is not None and len(self._lexical_index) > 0:
+            question = self._last_question(messages)
+            lexical = self._lexical_index.search(question, top_k=self._fusion_candidates)
+
+        if (
+            self._lexical_shortcut_coverage is not None
+            and lexical
+            and sum(msg["role"] == "user" for msg in messages) == 1
+            and lexical[0][1] >= self._lexical_shortcut_coverage
+            # a single term matches too many chunks to be conclusive
+            and self._lexical_index.query_terms(question) >= 2
+        ):
+            chunks = [chunk for chunk, _ in lexical[:self._top_k]]
+        else:
+            variants = await self._query_variants(messages, text_message)
+            fused = lexical or len(variants) > 1
+            vectors = await self._embedder.embed(variants, is_query=True)
+            query_vector = vectors[0]
+            dense = await self._vector_db.retrieve_batch(
+                collection_name=self._collection_name,
+                query_vectors=vectors,
+                top_k=self._fusion_candidates if fused else self._top_k,
+            )
+            if fused:
+                rankings = dense + ([[chunk for chunk, _ in lexical]] if lexical else [])
+                chunks = reciprocal_rank_fusion(rankings, k=self._rrf_k)[:self._top_k]
+            else:
+                chunks = dense[0]
+
+        if self._neighbors > 0 and chunks:
+            window_points = await self._vector_db.fetch_neighbors(self._collection_name, chunks, self._neighbors)
+            chunks = merge_neighbors(chunks, window_points, self._neighbors)
+        return chunks, query_vector
+
+    def _cache_answer(self, text_message: str, query_vector: Optional[List[float]], chunks: List[DataPoint], answer: str):
+        """
+            Stores an answer in the answer cache, if one is set.
+        """
+        if self._answer_cache is not None and answer:
+            self._answer_cache.put(text_message, query_vector, [c.id for c in chunks], {c.document_name for c in chunks}, answer)
 
     async def interact(self, messages: List[Dict[str, str]]) -> str:
         """
             Processes a conversation history to generate a context-aware response using RAG.
             The interaction sequence is:
             1. Query Generation: Concatenates the last 5 messages to form a single text message for the query.
-            2. Embedding: Generates a vector embedding for the combined query text.
-            3. Retrieval: Searches the vector database for relevant text chunks using the query vector.
-            4. Prompt Formatting: Inserts the retrieved chunks and the user's query into the specialized prompt template.
-            5. Completion: Sends the complete prompt to the LLM for final answer generation.
+            2. Embedding: Generates vector embeddings for the combined query text and, if enabled, the last user
+               message and its sub-questions, in one call.
+            3. Retrieval: Searches the vector database for relevant text chunks using the query vectors in one batch,
+               fused with lexical (BM25) results if a lexical index is set, and expands each hit with its
+               neighboring chunks if `neighbors` is set.
+            4. Prompt Formatting: Packs the retrieved chunks, without overlaps and near-duplicates, into the token budget
+               of the prompt, after the static instructions and before the user's query.
+            5. Completion: Sends the complete prompt to the LLM for final answer generation, unless the answer
+               cache holds the answer of a similar query that was answered from the same chunks.
             Args:
                 messages (List[Dict[str, str]]): The conversation history, where each element is a dict
                                                  with 'role' and 'content' keys.
@@ -70,18 +225,58 @@ class ChatBot:
                 str: The final, context-based answer generated by the Large Language Model.
         """
         # embed last 3 text messages
-        text_message = "\n".join([f'{msg["role"]}: {msg["content"]}' for msg in messages[-5:]])
-        vector = await self._embedder.embed([text_message], is_query=True)
+        text_message = self._build_query_text(messages)
 
         # retrieve relevant chunks
-        chunks = await self._vector_db.retrieve(collection_name=self._collection_name, query_vector=vector[0])
-        chunks_with_source = [self._chunk_template.format(context=c.payload["chunk_text"], source=c.payload["document_name"]) for c in chunks]
+        chunks, query_vector = await self._retrieve(messages, text_message)
+
+        # a similar query answered from the same chunks can be served from the cache
+        if self._answer_cache is not None:
+            cached = self._answer_cache.get(text_message, query_vector, [c.id for c in chunks])
+            if cached is not None:
+                return cached
 
         # format prompt
-        prompt = self._prompt_template.format(
-            chunks="\n".join(chunks_with_source),
-            query=text_message
-        )
+        prompt, _ = self._prompt_builder.build(text_message, chunks)
         # llm complete
         response = await self._llm.complete(msg=prompt, model="gpt-5-mini")
+        self._cache_answer(text_message, query_vector, chunks, response)
         return response
+
+    async def interact_stream(self, messages: List[Dict[str, str]]) -> AsyncIterator[Dict[str, Any]]:
+        """
+            Same as `interact`, but streams the response as events: the sources of the retrieved chunks
+            first, as soon as retrieval is done, then the answer text as the LLM generates it (or all at
+            once, on an answer cache hit).
+            Args:
+                messages (List[Dict[str, str]]): The conversation history, where each element is a dict
+                                                 with 'role' and 'content' keys.
+            Yields:
+                Dict[str, Any]: A {"type": "sources", "sources": [...]} event, then {"type": "delta", "text": ...}
+                                events, and a final {"type": "done", "prompt_tokens": ...} event, where prompt_tokens is
+                                None when the answer came from the answer cache.
+        """
+        text_message = self._build_query_text(messages)
+        chunks, query_vector = await self._retrieve(messages, text_message)
+        yield {
+            "type": "sources",
+            "sources": [
+                {"document_name": c.document_name, "section": c.section, "ordinal": c.ordinal, "chunk_id": c.id.hex}
+                for c in chunks
+            ],
+        }
+        cached = None
+        prompt_tokens = None
+        if self._answer_cache is not None:
+            cached = self._answer_cache.get(text_message, query_vector, [c.id for c in chunks])
+        if cached is not None:
+            yield {"type": "delta", "text": cached}
+        else:
+            deltas = []
+            prompt, prompt_tokens = self._prompt_builder.build(text_message, chunks)
+            async for delta in self._llm.stream(msg=prompt, model="gpt-5-mini"):
+                deltas.append(delta)
+                yield {"type": "delta", "text": delta}
+            # only a fully streamed answer is cached
+            self._cache_answer(text_message, query_vector, chunks, "".join(deltas))
+        yield {"type": "done", "prompt_tokens": prompt_tokens}
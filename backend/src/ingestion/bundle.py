@@ -0,0 +1,140 @@
+from .data_models import ChunkBatch, DataPoint, DocumentRecord
+from .vector_db import data_point_to_payload
+from pydantic import BaseModel
+from typing import Iterator, List, Tuple
+import numpy as np
+import shutil
+import json
+import uuid
+import os
+
+
+# Bumped whenever the layout of a bundle changes, so an old bundle is never misread.
+BUNDLE_FORMAT_VERSION = 1
+
+MANIFEST_FILE = "manifest.json"
+VECTORS_FILE = "vectors.npy"
+PAYLOADS_FILE = "payloads.jsonl"
+REGISTRY_FILE = "registry.json"
+
+
+class BundleManifest(BaseModel):
+    """
+        Describes the content of an index bundle and the configuration it was built with.
+    """
+    """The version of the bundle layout."""
+    format_version: int = BUNDLE_FORMAT_VERSION
+    """When the bundle was written, as a Unix timestamp."""
+    created_at: float
+    """The name of the collection the bundle was exported from."""
+    collection_name: str
+    """The dimensionality of the stored vectors."""
+    dimension: int
+    """The number of stored chunks."""
+    point_count: int
+    """The number of stored documents."""
+    document_count: int
+    """The fingerprint of the embedder that produced the vectors."""
+    embedder: str
+    """The fingerprint of the chunker that produced the chunks."""
+    chunker: str
+
+
+def write_bundle(path: str, manifest: BundleManifest, data_points: List[DataPoint], records: List[DocumentRecord]):
+    """
+        Writes an index bundle: a directory holding the manifest, the vectors as one float32 matrix,
+        the payloads as JSON lines (in the same row order) and the document registry.
+        The bundle is written next to its destination and moved in place once complete.
+        Args:
+            path (str): The directory of the bundle. An existing bundle there is replaced.
+            manifest (BundleManifest): The manifest of the bundle.
+            data_points (List[DataPoint]): The stored chunks, with their vectors.
+            records (List[DocumentRecord]): The records of the stored documents.
+    """
+    tmp_path = f"{path.rstrip(os.sep)}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+
+    vectors = np.asarray([p.vector for p in data_points], dtype=np.float32).reshape(len(data_points), manifest.dimension)
+    np.save(os.path.join(tmp_path, VECTORS_FILE), vectors)
+    with open(os.path.join(tmp_path, PAYLOADS_FILE), "w", encoding="utf-8") as f:
+        for p in data_points:
+            f.write(json.dumps({"id": p.id.hex, "payload": data_point_to_payload(p)}) + "\n")
+    with open(os.path.join(tmp_path, REGISTRY_FILE), "w", encoding="utf-8") as f:
+        json.dump([r.model_dump(mode="json") for r in records], f, indent=2)
+    # the manifest is written last, so a bundle without one is known to be incomplete
+    with open(os.path.join(tmp_path, MANIFEST_FILE), "w", encoding="utf-8") as f:
+        f.write(manifest.model_dump_json(indent=2))
+
+    shutil.rmtree(path, ignore_errors=True)
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: str) -> BundleManifest:
+    """
+        Reads the manifest of an index bundle.
+        Args:
+            path (str): The directory of the bundle.
+        Returns:
+            BundleManifest: The manifest.
+        Raises:
+            ValueError: If the bundle was written with another layout version.
+    """
+    with open(os.path.join(path, MANIFEST_FILE), "r", encoding="utf-8") as f:
+        manifest = BundleManifest.model_validate_json(f.read())
+    if manifest.format_version != BUNDLE_FORMAT_VERSION:
+        raise ValueError(f"Unsupported index bundle version {manifest.format_version}, expected {BUNDLE_FORMAT_VERSION}.")
+    return manifest
+
+
+def read_registry(path: str) -> List[DocumentRecord]:
+    """
+        Reads the document registry of an index bundle.
+        Args:
+            path (str): The directory of the bundle.
+        Returns:
+            List[DocumentRecord]: The records of the bundled documents.
+    """
+    with open(os.path.join(path, REGISTRY_FILE), "r", encoding="utf-8") as f:
+        return [DocumentRecord(**r) for r in json.load(f)]
+
+
+def iter_chunk_batches(path: str, batch_size: int = 1_000) -> Iterator[ChunkBatch]:
+    """
+        Reads the chunks of an index bundle in batches. The vector matrix is memory-mapped, and each
+        batch carries a slice of it, so only the batch being inserted is read from disk.
+        Args:
+            path (str): The directory of the bundle.
+            batch_size (int, optional): The number of chunks per batch. Defaults to 1,000.
+        Yields:
+            ChunkBatch: The next batch of chunks, with their vectors.
+    """
+    vectors = np.load(os.path.join(path, VECTORS_FILE), mmap_mode="r")
+    batch: List[Tuple[str, dict]] = []
+    row = 0
+    with open(os.path.join(path, PAYLOADS_FILE), "r", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            batch.append((entry["id"], entry["payload"]))
+            if len(batch) == batch_size:
+                yield _to_chunk_batch(batch, vectors[row:row + len(batch)])
+                row += len(batch)
+                batch = []
+    if batch:
+        yield _to_chunk_batch(batch, vectors[row:row + len(batch)])
+
+
+def _to_chunk_batch(entries: List[Tuple[str, dict]], vectors: np.ndarray) -> ChunkBatch:
+    payloads = [payload for _, payload in entries]
+    return ChunkBatch(
+        ids=[uuid.UUID(point_id) for point_id, _ in entries],
+        document_ids=[uuid.UUID(p["document_id"]) for p in payloads],
+        document_names=[p["document_name"] for p in payloads],
+        chunk_texts=[p["chunk_text"] for p in payloads],
+        chunk_hashes=[p.get("chunk_hash", "") for p in payloads],
+        ordinals=[p.get("ordinal", 0) for p in payloads],
+        sections=[p.get("section") for p in payloads],
+        content_hashes=[p.get("content_hash", "") for p in payloads],
+        ingested_ats=[p.get("ingested_at") for p in payloads],
+        vectors=vectors,
+    )
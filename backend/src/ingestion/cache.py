@@ -0,0 +1,542 @@
+import hashlib
+import os
+import struct
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+
+class MarkdownCache:
+    """
+        Content-addressed, size-bounded on-disk cache for extracted Markdown documents.
+
+        Each entry is stored as one UTF-8 file named after its key. The file modification time
+        doubles as the last-access time, so least recently used entries are evicted first once
+        the total size of the cache exceeds `max_size_bytes`.
+    """
+    def __init__(self, cache_dir: str, max_size_bytes: int = 512 * 1024 * 1024):
+        """
+            Initializes the cache, creating its directory if needed and measuring its current size.
+            Args:
+                cache_dir (str): The directory where cached Markdown files are stored.
+                max_size_bytes (int, optional): The maximum total size of the cache. Defaults to 512 MiB.
+        """
+        self._cache_dir = cache_dir
+        self._max_size_bytes = max_size_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self._cache_dir, exist_ok=True)
+        self._size_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(self._cache_dir) if entry.name.endswith(".md")
+        )
+
+    @staticmethod
+    def make_key(file_path: str, fingerprint: str) -> str:
+        """
+            Builds a cache key from the bytes of a file and the fingerprint of the extractor configuration.
+            Args:
+                file_path (str): The path of the source file (e.g., a PDF).
+                fingerprint (str): A string identifying the extractor, its version and its options.
+            Returns:
+                str: A hex SHA-256 digest usable as a cache key.
+        """
+        digest = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(block)
+        digest.update(b"\0")
+        digest.update(fingerprint.encode("utf-8"))
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        return os.path.join(self._cache_dir, f"{key}.md")
+
+    def get(self, key: str) -> Optional[str]:
+        """
+            Returns the cached Markdown for a key and marks the entry as recently used.
+            Args:
+                key (str): The cache key.
+            Returns:
+                Optional[str]: The cached Markdown, or None on a cache miss.
+        """
+        path = self._entry_path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                markdown = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return markdown
+
+    def put(self, key: str, markdown: str):
+        """
+            Stores the Markdown for a key, evicting least recently used entries if the cache grows too large.
+            Args:
+                key (str): The cache key.
+                markdown (str): The Markdown content to store.
+        """
+        path = self._entry_path(key)
+        data = markdown.encode("utf-8")
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self._size_bytes += len(data) - previous_size
+            self._evict(keep=path)
+
+    def _evict(self, keep: str):
+        """
+            Removes least recently used entries until the cache fits in `max_size_bytes`.
+            Must be called with the lock held.
+            Args:
+                keep (str): The path of an entry that must not be evicted (the one just written).
+        """
+        if self._size_bytes <= self._max_size_bytes:
+            return
+        entries = [e for e in os.scandir(self._cache_dir) if e.name.endswith(".md") and e.path != keep]
+        entries.sort(key=lambda e: e.stat().st_mtime)
+        for entry in entries:
+            if self._size_bytes <= self._max_size_bytes:
+                break
+            size = entry.stat().st_size
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:
+                continue
+            self._size_bytes -= size
+            self.evictions += 1
+
+    def stats(self) -> Dict[str, float]:
+        """
+            Returns the cache counters.
+            Returns:
+                Dict[str, float]: Hits, misses, hit rate, evictions and the current size in bytes.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "size_bytes": self._size_bytes,
+            }
+
+
+class EmbeddingCache:
+    """
+        Two-tier cache of embedding vectors: an in-memory LRU tier backed by a compact,
+        append-only on-disk store of float32 vectors.
+
+        Each disk record holds a 32-byte key, the vector dimension and the raw float32 values.
+        The disk index (key -> offset) is rebuilt from the file on startup; a truncated trailing
+        record left by an interrupted write is ignored. Beyond `max_disk_entries` vectors, the least
+        recently used ones are dropped from the index, and once dropped records take up more than half
+        of the file, the live records are rewritten to a new file.
+    """
+    _HEADER = struct.Struct("<32sI")
+
+    def __init__(self, cache_dir: str, max_memory_entries: int = 10_000, max_disk_entries: int = 100_000):
+        """
+            Initializes the cache and loads the index of the on-disk store.
+            Args:
+                cache_dir (str): The directory where the vector store file is kept.
+                max_memory_entries (int, optional): The number of vectors kept in the in-memory tier. Defaults to 10,000.
+                max_disk_entries (int, optional): The number of vectors kept in the on-disk store. Defaults to 100,000.
+        """
+        os.makedirs(cache_dir, exist_ok=True)
+        self._path = os.path.join(cache_dir, "embeddings.f32")
+        self._max_memory_entries = max_memory_entries
+        self._max_disk_entries = max_disk_entries
+        self._memory: OrderedDict[bytes, np.ndarray] = OrderedDict()
+        # in least recently used order
+        self._disk_index: OrderedDict[bytes, tuple] = OrderedDict()
+        self._file_bytes = 0
+        # bytes of the records still in the index
+        self._live_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.compactions = 0
+        self._file = open(self._path, "a+b")
+        self._load_index()
+
+    def _load_index(self):
+        """
+            Scans the on-disk store and records the offset and dimension of each vector.
+        """
+        self._file.seek(0, os.SEEK_END)
+        size = self._file.tell()
+        self._file.seek(0)
+        offset = 0
+        while offset + self._HEADER.size <= size:
+            key, dimension = self._HEADER.unpack(self._file.read(self._HEADER.size))
+            end = offset + self._HEADER.size + 4 * dimension
+            if end > size:
+                break
+            if key in self._disk_index:
+                self._live_bytes -= self._HEADER.size + 4 * self._disk_index[key][1]
+            self._disk_index[key] = (offset + self._HEADER.size, dimension)
+            self._disk_index.move_to_end(key)
+            self._live_bytes += end - offset
+            self._file.seek(end)
+            offset = end
+        if offset < size:
+            # drop the partial record so later appends stay aligned
+            self._file.truncate(offset)
+        self._file_bytes = offset
+        # the bound may have been lowered since the store was written
+        self._evict_disk()
+
+    @staticmethod
+    def make_key(fingerprint: str, is_query: bool, text: str) -> bytes:
+        """
+            Builds the cache key of a text embedded by a given model.
+            Args:
+                fingerprint (str): The fingerprint of the embedder (model name and options).
+                is_query (bool): Whether the text is embedded as a query or as a document.
+                text (str): The embedded text.
+            Returns:
+                bytes: The 32-byte SHA-256 digest used as key.
+        """
+        digest = hashlib.sha256()
+        digest.update(fingerprint.encode("utf-8"))
+        digest.update(b"\0q\0" if is_query else b"\0d\0")
+        digest.update(text.encode("utf-8"))
+        return digest.digest()
+
+    def _remember(self, key: bytes, vector: np.ndarray):
+        """
+            Adds a vector to the in-memory tier, evicting the least recently used one if it is full.
+            Must be called with the lock held.
+        """
+        self._memory[key] = vector
+        self._memory.move_to_end(key)
+        while len(self._memory) > self._max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def _evict_disk(self):
+        """
+            Drops the least recently used vectors beyond `max_disk_entries` from the disk index, and
+            compacts the store once dropped records take up more than half of it.
+            Must be called with the lock held.
+        """
+        while len(self._disk_index) > self._max_disk_entries:
+            _, (_, dimension) = self._disk_index.popitem(last=False)
+            self._live_bytes -= self._HEADER.size + 4 * dimension
+            self.evictions += 1
+        if self._file_bytes > 2 * self._live_bytes:
+            self._compact()
+
+    def _compact(self):
+        """
+            Rewrites the live records to a new store file, in least recently used order, and replaces the old one.
+            Must be called with the lock held.
+        """
+        tmp_path = f"{self._path}.tmp"
+        index = OrderedDict()
+        offset = 0
+        with open(tmp_path, "wb") as f:
+            for key, (data_offset, dimension) in self._disk_index.items():
+                self._file.seek(data_offset)
+                data = self._file.read(4 * dimension)
+                f.write(self._HEADER.pack(key, dimension))
+                f.write(data)
+                index[key] = (offset + self._HEADER.size, dimension)
+                offset += self._HEADER.size + len(data)
+        self._file.close()
+        os.replace(tmp_path, self._path)
+        self._file = open(self._path, "a+b")
+        self._disk_index = index
+        self._file_bytes = offset
+        self.compactions += 1
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[np.ndarray]]:
+        """
+            Looks vectors up in memory, then on disk (promoting them to memory). Disk reads block,
+            so callers on the event loop should run this in a worker thread.
+            Args:
+                keys (List[bytes]): The cache keys.
+            Returns:
+                List[Optional[np.ndarray]]: The float32 vector of each key, or None on a cache miss.
+        """
+        vectors = []
+        with self._lock:
+            for key in keys:
+                vector = self._memory.get(key)
+                if key in self._disk_index:
+                    self._disk_index.move_to_end(key)
+                if vector is not None:
+                    self._memory.move_to_end(key)
+                    self.memory_hits += 1
+                    vectors.append(vector)
+                    continue
+                location = self._disk_index.get(key)
+                if location is None:
+                    self.misses += 1
+                    vectors.append(None)
+                    continue
+                offset, dimension = location
+                self._file.seek(offset)
+                vector = np.frombuffer(self._file.read(4 * dimension), dtype=np.float32)
+                self._remember(key, vector)
+                self.disk_hits += 1
+                vectors.append(vector)
+        return vectors
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        """
+            Looks a vector up in memory, then on disk (promoting it to memory).
+            Args:
+                key (bytes): The cache key.
+            Returns:
+                Optional[np.ndarray]: The float32 vector, or None on a cache miss.
+        """
+        return self.get_many([key])[0]
+
+    def put_many(self, keys: List[bytes], vectors: Iterable[np.ndarray]):
+        """
+            Stores vectors in both tiers, appending the new ones to disk in a single write.
+            Vectors already on disk are not written again. Disk writes block, so callers on
+            the event loop should run this in a worker thread.
+            Args:
+                keys (List[bytes]): The cache keys.
+                vectors (Iterable[np.ndarray]): The vector of each key, stored as float32.
+        """
+        records = []
+        with self._lock:
+            offset = self._file_bytes
+            for key, vector in zip(keys, vectors):
+                # a copy, so a cached row never keeps the whole matrix it came from alive
+                vector = np.array(vector, dtype=np.float32)
+                self._remember(key, vector)
+                if key in self._disk_index:
+                    continue
+                records.append(self._HEADER.pack(key, vector.shape[0]))
+                records.append(vector.tobytes())
+                self._disk_index[key] = (offset + self._HEADER.size, vector.shape[0])
+                offset += self._HEADER.size + 4 * vector.shape[0]
+            self._live_bytes += offset - self._file_bytes
+            if not records:
+                return
+            self._file.seek(0, os.SEEK_END)
+            self._file.write(b"".join(records))
+            self._file.flush()
+            self._file_bytes = offset
+            self._evict_disk()
+
+    def put(self, key: bytes, vector: np.ndarray):
+        """
+            Stores a vector in both tiers. Vectors already on disk are not written again.
+            Args:
+                key (bytes): The cache key.
+                vector (np.ndarray): The vector, stored as float32.
+        """
+        self.put_many([key], [vector])
+
+    def stats(self) -> Dict[str, float]:
+        """
+            Returns the cache counters.
+            Returns:
+                Dict[str, float]: Memory hits, disk hits, misses, hit rate, the number of stored vectors,
+                                  the disk evictions and compactions, and the size of the store in bytes.
+        """
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._memory),
+                "disk_entries": len(self._disk_index),
+                "disk_evictions": self.evictions,
+                "compactions": self.compactions,
+                "disk_bytes": self._file_bytes,
+            }
+
+    def close(self):
+        """
+            Closes the on-disk store.
+        """
+        with self._lock:
+            self._file.close()
+
+
+class AnswerCache:
+    """
+        Semantic cache of chatbot answers, for the paraphrases of the same few questions that make
+        up most of the traffic.
+
+        Each entry stores the normalized query vector, the normalized query text, the IDs of the
+        retrieved chunks, the names of their documents and the answer. A query is answered from the
+        cache when its vector is within `similarity_threshold` cosine similarity of an entry's (or its
+        text is identical, for queries answered without embedding) and retrieval returned exactly the
+        same chunks, so the answer was generated from the same context. Entries expire after
+        `ttl_seconds`, the least recently used ones are evicted beyond `max_entries`, and entries that
+        depend on a document are dropped when that document is re-indexed or removed.
+    """
+    def __init__(self, max_entries: int = 1_000, ttl_seconds: float = 3_600.0, similarity_threshold: float = 0.95):
+        """
+            Initializes an empty cache.
+            Args:
+                max_entries (int, optional): The maximum number of cached answers. Defaults to 1,000.
+                ttl_seconds (float, optional): How long an answer stays valid, in seconds. Defaults to 3,600.
+                similarity_threshold (float, optional): The minimum cosine similarity between two queries
+                                                        for them to share an answer. Defaults to 0.95.
+        """
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._similarity_threshold = similarity_threshold
+        self._entries: OrderedDict[int, dict] = OrderedDict()
+        self._next_key = 0
+        # stacked query vectors of the entries that have one, rebuilt after changes
+        self._matrix: Optional[np.ndarray] = None
+        self._matrix_keys: List[int] = []
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @staticmethod
+    def _normalize_text(text: str) -> str:
+        return " ".join(text.lower().split())
+
+    def _drop(self, key: int):
+        """
+            Removes an entry. Must be called with the lock held.
+        """
+        del self._entries[key]
+        self._matrix = None
+
+    def _vectors(self):
+        """
+            Returns the stacked query vectors and the entry key of each row. Must be called with the lock held.
+        """
+        if self._matrix is None:
+            self._matrix_keys = [key for key, entry in self._entries.items() if entry["vector"] is not None]
+            self._matrix = (
+                np.stack([self._entries[key]["vector"] for key in self._matrix_keys]) if self._matrix_keys else None
+            )
+        return self._matrix, self._matrix_keys
+
+    def get(self, query_text: str, query_vector: Optional[List[float]], chunk_ids: Iterable) -> Optional[str]:
+        """
+            Looks up the answer of a query, given the chunks retrieved for it.
+            Args:
+                query_text (str): The query text.
+                query_vector (Optional[List[float]]): The query embedding, or None if the query was not embedded.
+                chunk_ids (Iterable): The IDs of the retrieved chunks.
+            Returns:
+                Optional[str]: The cached answer, or None on a cache miss.
+        """
+        chunk_ids = frozenset(chunk_ids)
+        text = self._normalize_text(query_text)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [key for key, entry in self._entries.items() if entry["text"] == text]
+            if query_vector is not None:
+                matrix, keys = self._vectors()
+                if matrix is not None:
+                    query = np.asarray(query_vector, dtype=np.float32)
+                    scores = matrix @ (query / max(float(np.linalg.norm(query)), 1e-12))
+                    order = np.argsort(-scores)
+                    candidates += [keys[i] for i in order if scores[i] >= self._similarity_threshold]
+            for key in candidates:
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if now - entry["created_at"] > self._ttl_seconds:
+                    self._drop(key)
+                    continue
+                if entry["chunk_ids"] == chunk_ids:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry["answer"]
+            self.misses += 1
+            return None
+
+    def put(self, query_text: str, query_vector: Optional[List[float]], chunk_ids: Iterable, document_names: Iterable[str], answer: str):
+        """
+            Stores the answer of a query, evicting the least recently used entry if the cache is full.
+            Args:
+                query_text (str): The query text.
+                query_vector (Optional[List[float]]): The query embedding, or None if the query was not embedded.
+                chunk_ids (Iterable): The IDs of the chunks the answer was generated from.
+                document_names (Iterable[str]): The names of the documents of those chunks.
+                answer (str): The answer.
+        """
+        vector = None
+        if query_vector is not None:
+            vector = np.asarray(query_vector, dtype=np.float32)
+            vector = vector / max(float(np.linalg.norm(vector)), 1e-12)
+        with self._lock:
+            self._entries[self._next_key] = {
+                "text": self._normalize_text(query_text),
+                "vector": vector,
+                "chunk_ids": frozenset(chunk_ids),
+                "documents": frozenset(document_names),
+                "answer": answer,
+                "created_at": time.monotonic(),
+            }
+            self._next_key += 1
+            self._matrix = None
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate_documents(self, document_names: Iterable[str]) -> int:
+        """
+            Drops the answers generated from chunks of any of the given documents.
+            Args:
+                document_names (Iterable[str]): The names of the documents that changed.
+            Returns:
+                int: The number of dropped answers.
+        """
+        document_names = set(document_names)
+        with self._lock:
+            stale = [key for key, entry in self._entries.items() if entry["documents"] & document_names]
+            for key in stale:
+                self._drop(key)
+            self.invalidations += len(stale)
+            return len(stale)
+
+    def clear(self):
+        """
+            Drops every answer, e.g., after the whole index was replaced.
+        """
+        with self._lock:
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+            self._matrix = None
+
+    def stats(self) -> Dict[str, float]:
+        """
+            Returns the cache counters.
+            Returns:
+                Dict[str, float]: Hits, misses, hit rate, evictions, invalidations and the number of cached answers.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+                "entries": len(self._entries),
+            }
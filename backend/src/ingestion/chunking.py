@@ -1,8 +1,16 @@
 from chonkie import Pipeline
-from .data_models import DataPoint
+from .data_models import DataPoint, chunk_id_from_hash, hash_chunk_text
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from typing import List, Tuple
+import multiprocessing
+import asyncio
 import uuid
+import re
+
+
+# Matches Markdown ATX headings, capturing the heading text.
+HEADING_PATTERN = re.compile(r"^#{1,6}\s+(.+?)\s*#*\s*$", re.MULTILINE)
 
 
 class BaseChunker(ABC):
@@ -13,27 +21,128 @@ class BaseChunker(ABC):
         semantically meaningful segments, each represented as a DataPoint object.
     """
     @abstractmethod
-    async def chunk_text(self, document_text: str, document_id: uuid.UUID, document_name: str) -> List[DataPoint]:
+    async def chunk_text(self, document_text: str, document_id: uuid.UUID, document_name: str, first_ordinal: int = 0, section: str | None = None) -> List[DataPoint]:
         """
             Asynchronously chunks a document's text content into a list of DataPoint objects.
             Args:
                 document_text (str): The full text content of the document to be chunked.
                 document_id (uuid.UUID): The unique ID of the source document.
                 document_name (str): The human-readable name of the source document.
+                first_ordinal (int, optional): The ordinal of the first chunk, when the text continues
+                                               a document that is chunked in parts. Defaults to 0.
+                section (str | None, optional): The section heading in effect at the start of the text,
+                                                when the text continues a document. Defaults to None.
             Returns:
                 List[DataPoint]: A list of DataPoint objects, each containing a chunk of text
                                  and the associated metadata.
         """
         pass
 
+    async def chunk_batch(self, documents: List[Tuple]) -> List[List[DataPoint]]:
+        """
+            Asynchronously chunks several documents at once. The default implementation chunks
+            them one after the other.
+            Args:
+                documents (List[Tuple]): A list where each element is a tuple containing the document text, its ID
+                                         and its name, optionally followed by the `first_ordinal` and `section`
+                                         of `chunk_text`, when the text continues a document.
+            Returns:
+                List[List[DataPoint]]: The DataPoints of each document, in the order of the input list.
+        """
+        return [
+            await self.chunk_text(text, document_id, document_name, *position)
+            for text, document_id, document_name, *position in documents
+        ]
+
+    def fingerprint(self) -> str:
+        """
+            Identifies the chunking strategy and options that determine the chunk texts, and thus the chunk IDs.
+            Returns:
+                str: The fingerprint of the chunker.
+        """
+        return type(self).__name__
+
+
+def _build_pipeline(recursive_size: int, semantic_size: int | None, overlap: int | None) -> Pipeline:
+    """
+        Builds and warms up the 'chonkie' chunking pipeline, so the tokenizer and the optional
+        semantic model are loaded once instead of on the first document.
+        Args:
+            recursive_size (int): The target chunk size for the initial recursive split.
+            semantic_size (int | None): The target chunk size for the optional semantic split.
+            overlap (int | None): The size of the context to overlap between refined chunks.
+        Returns:
+            Pipeline: The configured pipeline.
+    """
+    pipe = Pipeline().chunk_with(
+        "recursive",
+        tokenizer="gpt2",
+        chunk_size=recursive_size,
+        recipe="markdown"
+    )
+    if semantic_size is not None:
+        pipe = pipe.chunk_with("semantic", chunk_size=semantic_size)
+    if overlap is not None:
+        pipe = pipe.refine_with("overlap", context_size=overlap)
+    # components are instantiated on the first run and cached by the pipeline
+    pipe.run(texts=["# Warm up\n\nPipeline warm up."])
+    return pipe
+
+
+def _run_pipeline(pipeline: Pipeline, texts: List[str]) -> List[List[str]]:
+    """
+        Runs a list of texts through the pipeline.
+        Args:
+            pipeline (Pipeline): The chunking pipeline.
+            texts (List[str]): The texts to be chunked.
+        Returns:
+            List[List[str]]: The chunk texts of each input text.
+    """
+    docs = pipeline.run(texts=texts)
+    return [[chunk.text for chunk in doc.chunks] for doc in docs]
+
+
+# Pipeline owned by each pool worker process, created once by `_init_worker`.
+_worker_pipeline: Pipeline | None = None
+
+
+def _init_worker(recursive_size: int, semantic_size: int | None, overlap: int | None):
+    """
+        Process pool initializer. Builds and warms up the worker's own chunking pipeline.
+    """
+    global _worker_pipeline
+    _worker_pipeline = _build_pipeline(recursive_size, semantic_size, overlap)
+
+
+def _ping_worker() -> bool:
+    """
+        No-op job used to force the pool to spawn (and initialize) its worker processes.
+    """
+    return _worker_pipeline is not None
+
+
+def _run_in_worker(texts: List[str]) -> List[List[str]]:
+    """
+        Runs a list of texts through the worker's pipeline.
+        Args:
+            texts (List[str]): The texts to be chunked.
+        Returns:
+            List[List[str]]: The chunk texts of each input text.
+    """
+    return _run_pipeline(_worker_pipeline, texts)
+
 
 class MarkdownChunker(BaseChunker):
     """
         Concrete implementation of BaseChunker using the 'chonkie' library pipeline.
         It is specifically configured to chunk Markdown-formatted text, optionally applying
         semantic chunking and overlap refinement.
+
+        The pipeline never runs on the event loop. By default, a single pre-warmed pipeline
+        runs in a worker thread. With `num_workers` > 0, each process of a worker pool holds
+        its own pre-warmed pipeline and batches of documents are spread across the workers.
     """
-    def __init__(self, recursive_size: int = 2048, semantic_size: int | None = None, overlap: int | None = None):
+    def __init__(self, recursive_size: int = 2048, semantic_size: int | None = None, overlap: int | None = None, num_workers: int = 0):
         """
             Initializes and configures the 'chonkie' chunking pipeline.
             The pipeline is built sequentially:
@@ -46,40 +155,141 @@ class MarkdownChunker(BaseChunker):
                 recursive_size (int, optional): The target chunk size for the initial recursive split. Defaults to 2048.
                 semantic_size (int | None, optional): The target chunk size for the optional semantic split. Defaults to None.
                 overlap (int | None, optional): The size of the context to overlap between refined chunks. Defaults to None.
+                num_workers (int, optional): The number of worker processes. 0 runs the pipeline in a single
+                                             worker thread of this process. Defaults to 0.
+        """
+        self._pipeline_args = (recursive_size, semantic_size, overlap)
+        self._num_workers = num_workers
+        if num_workers > 0:
+            self._pipeline = None
+            self._executor = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=self._pipeline_args,
+            )
+        else:
+            self._pipeline = _build_pipeline(*self._pipeline_args)
+            # the pipeline caches its components and is not shared between threads
+            self._executor = ThreadPoolExecutor(max_workers=1)
+
+    def fingerprint(self) -> str:
+        recursive_size, semantic_size, overlap = self._pipeline_args
+        return f"markdown:{recursive_size}:{semantic_size}:{overlap}"
+
+    async def warm_up(self):
         """
-        pipe = Pipeline().chunk_with(
-            "recursive",
-            tokenizer="gpt2",
-            chunk_size=recursive_size,
-            recipe="markdown"
+            Spawns every worker process and waits until each one has built its pipeline.
+            The in-process pipeline is already warm after construction.
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *[loop.run_in_executor(self._executor, _ping_worker) for _ in range(self._num_workers)]
         )
-        if semantic_size is not None:
-            pipe = pipe.chunk_with("semantic", chunk_size=semantic_size)
-        if overlap is not None:
-            pipe = pipe.refine_with("overlap", context_size=overlap)
-        self._pipeline = pipe
 
+    async def _chunk_texts(self, texts: List[str]) -> List[List[str]]:
+        """
+            Runs texts through the pipeline off the event loop. With a process pool, the texts
+            are split into one contiguous slice per worker and chunked in parallel.
+            Args:
+                texts (List[str]): The texts to be chunked.
+            Returns:
+                List[List[str]]: The chunk texts of each input text, in input order.
+        """
+        if not texts:
+            return []
+        loop = asyncio.get_running_loop()
+        if self._pipeline is not None:
+            return await loop.run_in_executor(self._executor, _run_pipeline, self._pipeline, texts)
+
+        slice_size = -(-len(texts) // self._num_workers)
+        slices = await asyncio.gather(
+            *[loop.run_in_executor(self._executor, _run_in_worker, texts[i:i + slice_size]) for i in range(0, len(texts), slice_size)]
+        )
+        return [chunks for s in slices for chunks in s]
 
-    async def chunk_text(self, document_text: str | list[str], document_id: uuid.UUID, document_name: str) -> List[DataPoint]:
+    @staticmethod
+    def _to_data_points(chunk_texts: List[str], document_id: uuid.UUID, document_name: str, first_ordinal: int = 0, section: str | None = None) -> List[DataPoint]:
         """
-            Runs the text through the configured 'chonkie' pipeline and converts the results
-            into a list of DataPoint objects.
-            Each resulting chunk text is mapped to a new DataPoint with a unique ID,
-            its text content, and the source document's metadata. The vector field is
-            initialized as an empty list (to be populated later by the embedder).
+            Converts chunk texts into DataPoint objects.
+            Each chunk text is mapped to a new DataPoint whose ID is derived from the
+            document ID and the hash of the chunk text, so unchanged chunks keep their IDs when a
+            document is re-indexed. Identical chunks of the same document share an ID, so whoever stores
+            the chunks of a whole document keeps one of them.
+            Each chunk also records its position in the document and the section heading in effect
+            where it starts, so neighboring chunks can be fetched at retrieval time.
             Args:
-                document_text (str | list[str]): The text to be chunked.
+                chunk_texts (List[str]): The chunk texts of one document.
                 document_id (uuid.UUID): The unique ID of the source document.
                 document_name (str): The human-readable name of the source document.
+                first_ordinal (int, optional): The ordinal of the first chunk. Defaults to 0.
+                section (str | None, optional): The section heading in effect before the first chunk. Defaults to None.
             Returns:
                 List[DataPoint]: A list of DataPoint objects ready for embedding and indexing.
         """
-        docs = self._pipeline.run(texts=document_text)
         data_points = []
-        for chunk in docs.chunks:
-            data_point = DataPoint(id=uuid.uuid4(), document_id=document_id, document_name=document_name, chunk_text= chunk.text, vector=[])
+        for ordinal, text in enumerate(chunk_texts, start=first_ordinal):
+            headings = HEADING_PATTERN.findall(text)
+            # a chunk starting with a heading belongs to that section
+            chunk_section = headings[0] if headings and text.lstrip().startswith("#") else section
+            if headings:
+                section = headings[-1]
+            chunk_hash = hash_chunk_text(text)
+            data_point = DataPoint(
+                id=chunk_id_from_hash(document_id, chunk_hash),
+                document_id=document_id,
+                document_name=document_name,
+                chunk_text=text,
+                chunk_hash=chunk_hash,
+                ordinal=ordinal,
+                section=chunk_section,
+                vector=[]
+            )
             data_points.append(
                 data_point
             )
         return data_points
-    
\ No newline at end of file
+
+    async def chunk_text(self, document_text: str | list[str], document_id: uuid.UUID, document_name: str, first_ordinal: int = 0, section: str | None = None) -> List[DataPoint]:
+        """
+            Runs the text through the configured 'chonkie' pipeline and converts the results
+            into a list of DataPoint objects. The vector field is initialized as an empty
+            list (to be populated later by the embedder).
+            Args:
+                document_text (str | list[str]): The text to be chunked. A list is treated as consecutive
+                                                 parts of the same document.
+                document_id (uuid.UUID): The unique ID of the source document.
+                document_name (str): The human-readable name of the source document.
+                first_ordinal (int, optional): The ordinal of the first chunk, when the text continues
+                                               a document that is chunked in parts. Defaults to 0.
+                section (str | None, optional): The section heading in effect at the start of the text,
+                                                when the text continues a document. Defaults to None.
+            Returns:
+                List[DataPoint]: A list of DataPoint objects ready for embedding and indexing.
+        """
+        texts = document_text if isinstance(document_text, list) else [document_text]
+        chunks = await self._chunk_texts(texts)
+        return self._to_data_points([c for doc_chunks in chunks for c in doc_chunks], document_id, document_name, first_ordinal, section)
+
+    async def chunk_batch(self, documents: List[Tuple]) -> List[List[DataPoint]]:
+        """
+            Runs many documents through the pipeline in a single batch and maps the resulting
+            chunks back to their source documents.
+            Args:
+                documents (List[Tuple]): A list where each element is a tuple containing the document text, its ID
+                                         and its name, optionally followed by the `first_ordinal` and `section`
+                                         of `chunk_text`, when the text continues a document.
+            Returns:
+                List[List[DataPoint]]: The DataPoints of each document, in the order of the input list.
+        """
+        chunks = await self._chunk_texts([text for text, *_ in documents])
+        return [
+            self._to_data_points(doc_chunks, document_id, document_name, *position)
+            for doc_chunks, (_, document_id, document_name, *position) in zip(chunks, documents)
+        ]
+
+    def close(self):
+        """
+            Shuts down the worker thread or process pool.
+        """
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,6 +1,63 @@
+import hashlib
 import uuid
-from typing import List, Optional
+from typing import Iterable, List, Optional
 from pydantic import BaseModel
+import numpy as np
+
+
+# Namespace of the deterministic document IDs derived from document names.
+DOCUMENT_NAMESPACE = uuid.uuid5(uuid.NAMESPACE_URL, "gradbot/documents")
+
+
+def document_id_from_name(document_name: str) -> uuid.UUID:
+    """
+        Derives a stable document ID from a document name, so re-uploads of the same file
+        map to the same document.
+        Args:
+            document_name (str): The human-readable name of the document (e.g., its filename).
+        Returns:
+            uuid.UUID: The document ID.
+    """
+    return uuid.uuid5(DOCUMENT_NAMESPACE, document_name)
+
+
+def hash_chunk_text(chunk_text: str) -> str:
+    """
+        Hashes the text of a chunk.
+        Args:
+            chunk_text (str): The text of the chunk.
+        Returns:
+            str: The hex SHA-256 digest of the text.
+    """
+    return hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
+
+
+def hash_file(file_path: str) -> str:
+    """
+        Hashes the content of a file (e.g., an uploaded PDF).
+        Args:
+            file_path (str): The path of the file.
+        Returns:
+            str: The hex SHA-256 digest of the file bytes.
+    """
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def chunk_id_from_hash(document_id: uuid.UUID, chunk_hash: str) -> uuid.UUID:
+    """
+        Derives a deterministic chunk ID from the source document and the hash of the chunk text.
+        An unchanged chunk keeps its ID across re-indexing, so it does not need to be embedded again.
+        Args:
+            document_id (uuid.UUID): The unique ID of the source document.
+            chunk_hash (str): The hash of the chunk text.
+        Returns:
+            uuid.UUID: The chunk ID.
+    """
+    return uuid.uuid5(document_id, chunk_hash)
 
 
 class DataPoint(BaseModel):
@@ -19,8 +76,150 @@ class DataPoint(BaseModel):
     document_name: str
     """The actual segment (chunk) of text that was used to generate the vector."""
     chunk_text: str
+    """The hash of 'chunk_text', from which the (deterministic) 'id' is derived."""
+    chunk_hash: str = ""
+    """The position of the chunk within its source document (0-based)."""
+    ordinal: int = 0
+    """The Markdown section heading in effect where the chunk starts, if any."""
+    section: Optional[str] = None
+    """The hash of the source file version that produced the chunk."""
+    content_hash: str = ""
+    """When the chunk was indexed, as a Unix timestamp. None if unknown."""
+    ingested_at: Optional[float] = None
+    """The similarity score of the chunk when it is returned by a search. None otherwise."""
+    score: Optional[float] = None
     """
         The dense vector embedding corresponding to the 'chunk_text'. 
         This is typically None until the embedding process is completed.
     """
     vector: Optional[List[float]]
+
+
+class ChunkBatch:
+    """
+        Columnar batch of chunks carried from the chunker to the embedder and the vector database
+        during ingestion. Chunk fields are kept in parallel lists and the vectors in one contiguous
+        float32 matrix, instead of one DataPoint with a list of boxed floats per chunk.
+    """
+    __slots__ = (
+        "ids", "document_ids", "document_names", "chunk_texts", "chunk_hashes", "ordinals", "sections",
+        "content_hashes", "ingested_ats", "vectors",
+    )
+
+    def __init__(self, ids: List[uuid.UUID], document_ids: List[uuid.UUID], document_names: List[str], chunk_texts: List[str],
+                 chunk_hashes: List[str], ordinals: List[int], sections: List[Optional[str]], content_hashes: List[str],
+                 ingested_ats: List[Optional[float]], vectors: Optional[np.ndarray] = None):
+        """
+            Initializes a batch from parallel lists, one element per chunk.
+            Args:
+                vectors (Optional[np.ndarray], optional): The (chunks x dimension) float32 matrix of embeddings,
+                                                          None until the batch is embedded. Defaults to None.
+        """
+        self.ids = ids
+        self.document_ids = document_ids
+        self.document_names = document_names
+        self.chunk_texts = chunk_texts
+        self.chunk_hashes = chunk_hashes
+        self.ordinals = ordinals
+        self.sections = sections
+        self.content_hashes = content_hashes
+        self.ingested_ats = ingested_ats
+        self.vectors = vectors
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @classmethod
+    def from_data_points(cls, data_points: Iterable[DataPoint], content_hash: Optional[str] = None, ingested_at: Optional[float] = None) -> "ChunkBatch":
+        """
+            Builds a batch from DataPoints. Their vectors are not copied.
+            Args:
+                data_points (Iterable[DataPoint]): The chunks.
+                content_hash (Optional[str], optional): If set, overrides the content hash of every chunk. Defaults to None.
+                ingested_at (Optional[float], optional): If set, overrides the ingestion time of every chunk. Defaults to None.
+            Returns:
+                ChunkBatch: The batch, without vectors.
+        """
+        data_points = list(data_points)
+        return cls(
+            ids=[p.id for p in data_points],
+            document_ids=[p.document_id for p in data_points],
+            document_names=[p.document_name for p in data_points],
+            chunk_texts=[p.chunk_text for p in data_points],
+            chunk_hashes=[p.chunk_hash for p in data_points],
+            ordinals=[p.ordinal for p in data_points],
+            sections=[p.section for p in data_points],
+            content_hashes=[p.content_hash if content_hash is None else content_hash for p in data_points],
+            ingested_ats=[p.ingested_at if ingested_at is None else ingested_at for p in data_points],
+        )
+
+    def to_data_points(self, with_vectors: bool = False) -> List[DataPoint]:
+        """
+            Converts the batch back into DataPoints (e.g., for the lexical index).
+            Args:
+                with_vectors (bool, optional): Whether the vectors are copied into the DataPoints. Defaults to False.
+            Returns:
+                List[DataPoint]: One DataPoint per chunk.
+        """
+        return [
+            DataPoint(
+                id=self.ids[i],
+                document_id=self.document_ids[i],
+                document_name=self.document_names[i],
+                chunk_text=self.chunk_texts[i],
+                chunk_hash=self.chunk_hashes[i],
+                ordinal=self.ordinals[i],
+                section=self.sections[i],
+                content_hash=self.content_hashes[i],
+                ingested_at=self.ingested_ats[i],
+                vector=self.vectors[i].tolist() if with_vectors and self.vectors is not None else None,
+            )
+            for i in range(len(self))
+        ]
+
+    def slice(self, start: int, stop: int) -> "ChunkBatch":
+        """
+            Returns the chunks in [start, stop) as a new batch. The vectors are a view, not a copy.
+        """
+        return ChunkBatch(
+            ids=self.ids[start:stop],
+            document_ids=self.document_ids[start:stop],
+            document_names=self.document_names[start:stop],
+            chunk_texts=self.chunk_texts[start:stop],
+            chunk_hashes=self.chunk_hashes[start:stop],
+            ordinals=self.ordinals[start:stop],
+            sections=self.sections[start:stop],
+            content_hashes=self.content_hashes[start:stop],
+            ingested_ats=self.ingested_ats[start:stop],
+            vectors=self.vectors[start:stop] if self.vectors is not None else None,
+        )
+
+
+class PageReport(BaseModel):
+    """
+        Describes how a single page of a document was extracted and how long it took.
+    """
+    """The 1-based number of the page in the source document."""
+    page_number: int
+    """The extraction path chosen for the page: 'text_layer' (embedded text, no OCR or table models) or 'ocr'."""
+    method: str
+    """The number of non-whitespace characters found in the page's embedded text layer."""
+    text_chars: int
+    """The conversion time attributed to the page, in seconds."""
+    seconds: float
+
+
+class DocumentRecord(BaseModel):
+    """
+        Catalog entry of an indexed document, kept by the document registry.
+    """
+    """The human-readable name of the document (its filename)."""
+    name: str
+    """The unique identifier of the document."""
+    document_id: uuid.UUID
+    """The number of chunks stored for the document."""
+    chunk_count: int
+    """The hash of the indexed version of the file."""
+    content_hash: str = ""
+    """When the document was last indexed, as a Unix timestamp. None if unknown."""
+    ingested_at: Optional[float] = None
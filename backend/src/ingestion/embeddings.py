@@ -1,8 +1,18 @@
 from abc import ABC, abstractmethod
-from typing import List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Tuple
 
+from .cache import EmbeddingCache
 from sentence_transformers import SentenceTransformer
-from openai import OpenAI
+from transformers import AutoTokenizer
+import onnxruntime as ort
+from openai import AsyncOpenAI, APIConnectionError, InternalServerError, RateLimitError
+import numpy as np
+import tiktoken
+import asyncio
+import random
+import time
+import json
 import os
 
 
@@ -27,25 +37,215 @@ class BaseEmbedder(ABC):
         """
         pass
 
+    async def embed_array(self, texts: List[str], is_query: bool) -> np.ndarray:
+        """
+            Generates vector embeddings as one contiguous float32 matrix, the form a chunk batch
+            carries them in. The default implementation converts the output of `embed`.
+            Args:
+                texts (List[str]): The list of text strings to be embedded.
+                is_query (bool): Whether the texts are queries or documents.
+            Returns:
+                np.ndarray: A (texts x dimension) float32 matrix of embeddings.
+        """
+        return np.asarray(await self.embed(texts, is_query), dtype=np.float32).reshape(len(texts), self.dimension())
+
+    @abstractmethod
+    def dimension(self) -> int:
+        """
+            Returns the size of the vectors produced by the embedder, which the vector collection must match.
+            Returns:
+                int: The embedding dimension.
+        """
+        pass
+
+    def fingerprint(self) -> str:
+        """
+            Identifies the model and options that determine the embeddings, so cached vectors
+            are never reused across models.
+            Returns:
+                str: The fingerprint of the embedder.
+        """
+        return type(self).__name__
+
+
+def _truncate_and_normalize(embeddings: np.ndarray, dimension: int | None) -> np.ndarray:
+    """
+        Shortens Matryoshka-style embeddings to their first `dimension` components and re-normalizes
+        them to unit length, so cosine and dot-product scores stay comparable.
+        Args:
+            embeddings (np.ndarray): The (n, full dimension) embeddings.
+            dimension (int | None): The target dimension. None keeps the embeddings unchanged.
+        Returns:
+            np.ndarray: The shortened embeddings.
+    """
+    if dimension is None or dimension >= embeddings.shape[1]:
+        return embeddings
+    embeddings = embeddings[:, :dimension]
+    return embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+
+
+class MicroBatcher:
+    """
+        Background inference worker that merges concurrent embedding requests into batches.
+
+        Requests wait in a queue. The worker takes the first pending request, keeps collecting
+        requests for up to `max_wait_ms` or until `max_batch_size` texts are gathered, then runs one
+        batched encode per `is_query` group in a dedicated thread and resolves each caller's future.
+        The event loop is never blocked by the model, and under load many queries share a single
+        forward pass.
+    """
+    def __init__(self, encode: Callable[[List[str], bool], np.ndarray], max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        """
+            Initializes the batcher. The queue and the worker task are created on first use,
+            inside the running event loop.
+            Args:
+                encode (Callable[[List[str], bool], np.ndarray]): The blocking function embedding a list of texts,
+                                                                  as queries or as documents.
+                max_batch_size (int, optional): The number of texts after which a batch is sent without waiting.
+                                                Defaults to 64.
+                max_wait_ms (float, optional): How long the first request of a batch waits for others. Defaults to 5 ms.
+        """
+        self._encode = encode
+        self._max_batch_size = max_batch_size
+        self._max_wait = max_wait_ms / 1000
+        # the model is not shared between threads
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._queue: asyncio.Queue | None = None
+        self._worker: asyncio.Task | None = None
+
+    async def submit(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        """
+            Queues texts for embedding and waits for the batch that includes them.
+            Args:
+                texts (List[str]): The texts to be embedded.
+                is_query (bool): Whether the texts are queries or documents.
+            Returns:
+                List[List[float]]: The embeddings, in the order of the input texts.
+        """
+        if not texts:
+            return []
+        return (await self.submit_array(texts, is_query)).tolist()
+
+    async def submit_array(self, texts: List[str], is_query: bool) -> np.ndarray:
+        """
+            Queues texts for embedding and waits for the batch that includes them.
+            Args:
+                texts (List[str]): The texts to be embedded.
+                is_query (bool): Whether the texts are queries or documents.
+            Returns:
+                np.ndarray: The float32 embeddings, one row per input text.
+        """
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((texts, is_query, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[List[str], bool, asyncio.Future]]:
+        """
+            Waits for a request, then gathers the requests arriving within the batching window.
+            Returns:
+                List[Tuple[List[str], bool, asyncio.Future]]: The requests of the batch.
+        """
+        requests = [await self._queue.get()]
+        size = len(requests[0][0])
+        deadline = time.monotonic() + self._max_wait
+        while size < self._max_batch_size:
+            timeout = deadline - time.monotonic()
+            if timeout <= 0:
+                break
+            try:
+                request = await asyncio.wait_for(self._queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            requests.append(request)
+            size += len(request[0])
+        return requests
+
+    async def _run(self):
+        """
+            Worker loop: encodes each batch off the event loop and resolves the callers' futures.
+        """
+        loop = asyncio.get_running_loop()
+        while True:
+            requests = await self._collect()
+            for is_query in (True, False):
+                group = [(texts, future) for texts, q, future in requests if q == is_query and not future.done()]
+                if not group:
+                    continue
+                try:
+                    embeddings = await loop.run_in_executor(
+                        self._executor, self._encode, [t for texts, _ in group for t in texts], is_query
+                    )
+                except Exception as e:
+                    for _, future in group:
+                        if not future.done():
+                            future.set_exception(e)
+                    continue
+                start = 0
+                for texts, future in group:
+                    if not future.done():
+                        future.set_result(np.asarray(embeddings[start:start + len(texts)], dtype=np.float32))
+                    start += len(texts)
+
+    def close(self):
+        """
+            Stops the worker task and its inference thread.
+        """
+        if self._worker is not None:
+            self._worker.cancel()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
 
 class SentenceTransformerEmbedder(BaseEmbedder):
     """
         Concrete implementation of BaseEmbedder using a local Sentence Transformer model.
         This class performs embedding operations locally without needing an external API.
+
+        Concurrent requests are merged by a MicroBatcher, so the model runs batched encodes in
+        a worker thread instead of one forward pass per request on the event loop.
     """
-    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2"):
+    def __init__(self, model_name: str = "sentence-transformers/all-MiniLM-L6-v2", dimensions: int | None = None, max_batch_size: int = 64, max_wait_ms: float = 5.0):
         """
-            Initializes the Sentence Transformer model.
+            Initializes the Sentence Transformer model and its batching worker.
             Args:
                 model_name (str, optional): The name of the Hugging Face model to load.
                                             Defaults to 'sentence-transformers/all-MiniLM-L6-v2'.
+                dimensions (int | None, optional): Shortens the embeddings to this size (truncation and re-normalization).
+                                                   Only meaningful for Matryoshka-trained models. Defaults to None (full size).
+                max_batch_size (int, optional): The number of texts after which a batch is encoded without
+                                                waiting for more requests. Defaults to 64.
+                max_wait_ms (float, optional): How long a request waits for others to share its batch. Defaults to 5 ms.
         """
+        self._model_name = model_name
         self._model = SentenceTransformer(model_name)
-    async def embed(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        self._dimensions = dimensions
+        self._batcher = MicroBatcher(self._encode, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    def dimension(self) -> int:
+        full_dimension = self._model.get_sentence_embedding_dimension()
+        return min(self._dimensions, full_dimension) if self._dimensions else full_dimension
+
+    def fingerprint(self) -> str:
+        return f"sentence-transformers:{self._model_name}:{self.dimension()}"
+
+    def _encode(self, texts: List[str], is_query: bool) -> np.ndarray:
         """
-            Generates embeddings using the loaded Sentence Transformer model.
+            Blocking batched encode, run by the batching worker thread.
             It utilizes specialized `encode_query` or `encode_document` methods based
             on the `is_query` flag for optimal performance with certain models.
+        """
+        if is_query:
+            embeddings = self._model.encode_query(texts)
+        else:
+            embeddings = self._model.encode_document(texts)
+        return _truncate_and_normalize(embeddings, self._dimensions)
+
+    async def embed(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        """
+            Generates embeddings using the loaded Sentence Transformer model. The texts are
+            queued and encoded together with the other requests arriving in the same window.
             Args:
                 texts (List[str]): The list of text strings to be embedded.
                 is_query (bool): If True, uses the query encoding method; otherwise, uses
@@ -53,35 +253,351 @@ class SentenceTransformerEmbedder(BaseEmbedder):
             Returns:
                 List[List[float]]: A list of vector embeddings.
         """
-        if is_query:
-            embeddings = self._model.encode_query(texts)
+        return await self._batcher.submit(texts, is_query)
+
+    async def embed_array(self, texts: List[str], is_query: bool) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dimension()), dtype=np.float32)
+        return await self._batcher.submit_array(texts, is_query)
+
+    def close(self):
+        """
+            Stops the batching worker.
+        """
+        self._batcher.close()
+
+
+# pooling modes of sentence-transformers' Pooling module that OnnxEmbedder reproduces
+ONNX_POOLING_MODES = {"pooling_mode_cls_token": "cls", "pooling_mode_mean_tokens": "mean", "pooling_mode_max_tokens": "max"}
+
+
+def _onnx_pooling_mode(model: SentenceTransformer) -> str:
+    """
+        Checks that OnnxEmbedder can reproduce the embeddings of a sentence-transformers model: a Transformer,
+        then a Pooling with a single cls, mean or max mode, then optionally a Normalize.
+        Args:
+            model (SentenceTransformer): The model to be exported.
+        Returns:
+            str: The pooling mode, "cls", "mean" or "max".
+        Raises:
+            ValueError: If the model has other modules or another pooling mode.
+    """
+    module_names = [type(module).__name__ for module in model]
+    if module_names not in (["Transformer", "Pooling"], ["Transformer", "Pooling", "Normalize"]):
+        raise ValueError(f"Cannot export modules {module_names} to ONNX: expected Transformer, Pooling and an optional Normalize")
+    pooling = model[1]
+    pooling_modes = [name for name, value in vars(pooling).items() if name.startswith("pooling_mode_") and value]
+    if len(pooling_modes) != 1 or pooling_modes[0] not in ONNX_POOLING_MODES:
+        raise ValueError(f"Cannot export pooling {pooling_modes} to ONNX: expected one of {list(ONNX_POOLING_MODES)}")
+    if not getattr(pooling, "include_prompt", True):
+        raise ValueError("Cannot export pooling that excludes the prompt tokens to ONNX")
+    return ONNX_POOLING_MODES[pooling_modes[0]]
+
+
+def _export_onnx_model(model_name: str, model_dir: str, quantize: bool):
+    """
+        Exports the transformer of a sentence-transformers model to ONNX, together with its tokenizer
+        and the settings needed to reproduce its embeddings (pooling, normalization, prompts and maximum
+        sequence length). Optionally writes an int8 dynamically quantized copy of the model.
+        Args:
+            model_name (str): The name of the Hugging Face model to export.
+            model_dir (str): The directory where the exported files are written.
+            quantize (bool): Whether to also write the quantized model.
+        Raises:
+            ValueError: If OnnxEmbedder cannot reproduce the model's embeddings (see `_onnx_pooling_mode`).
+    """
+    import torch
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model = SentenceTransformer(model_name, device="cpu")
+    pooling_mode = _onnx_pooling_mode(model)
+    transformer = model[0].auto_model.eval()
+    tokenizer = model.tokenizer
+    os.makedirs(model_dir, exist_ok=True)
+
+    inputs = tokenizer(["ONNX export"], return_tensors="pt")
+    input_names = [name for name in ("input_ids", "attention_mask", "token_type_ids") if name in inputs]
+    dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in input_names}
+    dynamic_axes["last_hidden_state"] = {0: "batch", 1: "sequence"}
+    with torch.no_grad():
+        torch.onnx.export(
+            transformer,
+            # positional order of the transformer's forward: input_ids, attention_mask, token_type_ids
+            args=tuple(inputs[name] for name in input_names),
+            f=os.path.join(model_dir, "model.onnx"),
+            input_names=input_names,
+            output_names=["last_hidden_state"],
+            dynamic_axes=dynamic_axes,
+            opset_version=17,
+        )
+    tokenizer.save_pretrained(model_dir)
+
+    settings = {
+        "model_name": model_name,
+        "pooling_mode": pooling_mode,
+        "normalize": type(model[-1]).__name__ == "Normalize",
+        "max_seq_length": model.max_seq_length,
+        "prompts": model.prompts,
+    }
+    with open(os.path.join(model_dir, "embedding_settings.json"), "w", encoding="utf-8") as f:
+        json.dump(settings, f, indent=2)
+
+    if quantize:
+        quantize_dynamic(
+            os.path.join(model_dir, "model.onnx"),
+            os.path.join(model_dir, "model_int8.onnx"),
+            weight_type=QuantType.QInt8,
+        )
+
+
+class OnnxEmbedder(BaseEmbedder):
+    """
+        Concrete implementation of BaseEmbedder running a sentence-transformers model with ONNX Runtime
+        on CPU, optionally with int8 dynamic quantization.
+
+        The model is exported from PyTorch once and stored in `export_dir`. Later starts only load the
+        ONNX file and the tokenizer, which is much faster than loading the PyTorch model. Pooling,
+        normalization and query/document prompts follow the original model, so its embeddings can be
+        compared with (and, without quantization, match) the SentenceTransformerEmbedder ones.
+        Concurrent requests are merged by a MicroBatcher.
+    """
+    def __init__(
+        self,
+        model_name: str = "sentence-transformers/all-MiniLM-L6-v2",
+        export_dir: str = "./onnx_models",
+        quantize: bool = True,
+        dimensions: int | None = None,
+        num_threads: int = 0,
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+    ):
+        """
+            Loads the ONNX model, exporting (and quantizing) it first if it is not in `export_dir` yet.
+            Args:
+                model_name (str, optional): The name of the Hugging Face model.
+                                            Defaults to 'sentence-transformers/all-MiniLM-L6-v2'.
+                export_dir (str, optional): The directory where exported models are stored. Defaults to './onnx_models'.
+                quantize (bool, optional): Whether to run the int8 dynamically quantized model. Defaults to True.
+                dimensions (int | None, optional): Shortens the embeddings to this size (truncation and re-normalization).
+                                                   Only meaningful for Matryoshka-trained models. Defaults to None (full size).
+                num_threads (int, optional): The number of threads used by ONNX Runtime within an operator.
+                                             0 lets ONNX Runtime decide. Defaults to 0.
+                max_batch_size (int, optional): The number of texts after which a batch is encoded without
+                                                waiting for more requests. Defaults to 64.
+                max_wait_ms (float, optional): How long a request waits for others to share its batch. Defaults to 5 ms.
+        """
+        self._model_name = model_name
+        self._quantize = quantize
+        self._dimensions = dimensions
+        model_dir = os.path.join(export_dir, model_name.replace("/", "__"))
+        model_file = os.path.join(model_dir, "model_int8.onnx" if quantize else "model.onnx")
+        if not os.path.isfile(model_file):
+            print(f"Exporting {model_name} to ONNX in {model_dir}")
+            _export_onnx_model(model_name, model_dir, quantize)
+
+        with open(os.path.join(model_dir, "embedding_settings.json"), "r", encoding="utf-8") as f:
+            self._settings = json.load(f)
+        self._tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        options = ort.SessionOptions()
+        options.intra_op_num_threads = num_threads
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self._session = ort.InferenceSession(model_file, sess_options=options, providers=["CPUExecutionProvider"])
+        self._input_names = {i.name for i in self._session.get_inputs()}
+        # pooling keeps the hidden size of the transformer
+        self._full_dimension = self._session.get_outputs()[0].shape[-1]
+        self._batcher = MicroBatcher(self._encode, max_batch_size=max_batch_size, max_wait_ms=max_wait_ms)
+
+    def dimension(self) -> int:
+        return min(self._dimensions, self._full_dimension) if self._dimensions else self._full_dimension
+
+    def fingerprint(self) -> str:
+        return f"onnx:{self._model_name}:{'int8' if self._quantize else 'fp32'}:{self.dimension()}"
+
+    def _encode(self, texts: List[str], is_query: bool) -> np.ndarray:
+        """
+            Blocking batched encode, run by the batching worker thread: tokenizes the texts, runs the
+            transformer and pools its token embeddings like the original model.
+        """
+        prompt = self._settings["prompts"].get("query" if is_query else "document", "")
+        tokens = self._tokenizer(
+            [prompt + t for t in texts],
+            padding=True,
+            truncation=True,
+            max_length=self._settings["max_seq_length"],
+            return_tensors="np",
+        )
+        inputs = {name: tokens[name].astype(np.int64) for name in self._input_names}
+        hidden = self._session.run(None, inputs)[0]
+
+        mask = tokens["attention_mask"][..., None].astype(np.float32)
+        if self._settings["pooling_mode"] == "cls":
+            embeddings = hidden[:, 0]
+        elif self._settings["pooling_mode"] == "max":
+            embeddings = np.where(mask > 0, hidden, -np.inf).max(axis=1)
         else:
-            embeddings = self._model.encode_document(texts)
-        return embeddings.tolist()
+            embeddings = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+        if self._settings["normalize"]:
+            embeddings = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        return _truncate_and_normalize(embeddings, self._dimensions).astype(np.float32)
+
+    async def embed(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        """
+            Generates embeddings with ONNX Runtime. The texts are queued and encoded together
+            with the other requests arriving in the same window.
+            Args:
+                texts (List[str]): The list of text strings to be embedded.
+                is_query (bool): Whether the texts are queries or documents, which selects the model's prompt if any.
+            Returns:
+                List[List[float]]: A list of vector embeddings.
+        """
+        return await self._batcher.submit(texts, is_query)
+
+    async def embed_array(self, texts: List[str], is_query: bool) -> np.ndarray:
+        if not texts:
+            return np.empty((0, self.dimension()), dtype=np.float32)
+        return await self._batcher.submit_array(texts, is_query)
+
+    def close(self):
+        """
+            Stops the batching worker.
+        """
+        self._batcher.close()
+
+
+# Full output size of the OpenAI embedding models.
+OPENAI_EMBEDDING_DIMENSIONS = {
+    "text-embedding-3-small": 1536,
+    "text-embedding-3-large": 3072,
+    "text-embedding-ada-002": 1536,
+}
 
 
 class OpenAiEmbedder(BaseEmbedder):
     """
         Concrete implementation of BaseEmbedder using the OpenAI API.
         This relies on the 'openai' package and requires the OPENAI_API_KEY environment variable.
+
+        Requests go through the asynchronous client, so they never block the event loop. Inputs are
+        packed into batches by token count, batches are sent concurrently up to a configurable number
+        of in-flight requests, and rate-limit (429) and server (5xx) errors are retried with
+        exponential backoff.
     """
-    def __init__(self, model_name: str = "text-embedding-3-small"):
+    def __init__(
+        self,
+        model_name: str = "text-embedding-3-small",
+        dimensions: int | None = None,
+        max_batch_tokens: int = 100_000,
+        max_batch_size: int = 2048,
+        max_input_tokens: int = 8191,
+        max_in_flight: int = 4,
+        max_retries: int = 6,
+        timeout: float = 60.0,
+    ):
         """
-            Initializes the OpenAI client and checks for the API key.
+            Initializes the asynchronous OpenAI client and checks for the API key.
             Args:
                 model_name (str, optional): The name of the OpenAI embedding model to use.
                                             Defaults to 'text-embedding-3-small'.
+                dimensions (int | None, optional): Requests shortened embeddings of this size through the API
+                                                   `dimensions` parameter (text-embedding-3 models only).
+                                                   Defaults to None (full size).
+                max_batch_tokens (int, optional): The maximum number of tokens sent in one request. Defaults to 100,000.
+                max_batch_size (int, optional): The maximum number of inputs sent in one request. Defaults to 2048.
+                max_input_tokens (int, optional): The maximum number of tokens of a single input. Longer inputs are
+                                                  truncated. Defaults to 8191.
+                max_in_flight (int, optional): The maximum number of concurrent requests. Defaults to 4.
+                max_retries (int, optional): The number of retries of a request failing with a 429 or 5xx error,
+                                             or a connection error. Defaults to 6.
+                timeout (float, optional): The timeout of a single request, in seconds. Defaults to 60.
             Raises:
                 EnvironmentError: If the 'OPENAI_API_KEY' environment variable is not set.
         """
         if os.environ.get("OPENAI_API_KEY") is None:
             raise EnvironmentError("OpenAI API key not set")
-        self._client = OpenAI()
+        # retries are handled here, with backoff shared across batches
+        self._client = AsyncOpenAI(max_retries=0, timeout=timeout)
         self._model_name = model_name
+        self._dimensions = dimensions
+        self._max_batch_tokens = max_batch_tokens
+        self._max_batch_size = max_batch_size
+        self._max_input_tokens = max_input_tokens
+        self._max_retries = max_retries
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        try:
+            self._encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+
+    def dimension(self) -> int:
+        return self._dimensions or OPENAI_EMBEDDING_DIMENSIONS.get(self._model_name, 1536)
+
+    def fingerprint(self) -> str:
+        return f"openai:{self._model_name}:{self.dimension()}"
+
+    def _make_batches(self, texts: List[str]) -> List[List[Tuple[int, str]]]:
+        """
+            Packs texts into batches that respect the per-request token and input limits.
+            Inputs longer than `max_input_tokens` are truncated.
+            Args:
+                texts (List[str]): The texts to be embedded.
+            Returns:
+                List[List[Tuple[int, str]]]: The batches, each holding (position in `texts`, text) pairs.
+        """
+        batches = []
+        batch = []
+        batch_tokens = 0
+        for idx, tokens in enumerate(self._encoding.encode_ordinary_batch(texts)):
+            text = texts[idx]
+            if len(tokens) > self._max_input_tokens:
+                print(f"Truncating embedding input {idx} from {len(tokens)} to {self._max_input_tokens} tokens")
+                tokens = tokens[:self._max_input_tokens]
+                text = self._encoding.decode(tokens)
+            if batch and (batch_tokens + len(tokens) > self._max_batch_tokens or len(batch) >= self._max_batch_size):
+                batches.append(batch)
+                batch = []
+                batch_tokens = 0
+            batch.append((idx, text))
+            batch_tokens += len(tokens)
+        if batch:
+            batches.append(batch)
+        return batches
+
+    async def _embed_batch(self, batch: List[Tuple[int, str]]) -> List[List[float]]:
+        """
+            Sends one batch to the embeddings API, retrying rate-limit, server and connection errors
+            with exponential backoff and jitter (or the delay requested by the server).
+            Args:
+                batch (List[Tuple[int, str]]): The (position, text) pairs of the batch.
+            Returns:
+                List[List[float]]: The embeddings of the batch, in batch order.
+        """
+        for attempt in range(self._max_retries + 1):
+            try:
+                async with self._in_flight:
+                    response = await self._client.embeddings.create(
+                        input=[text for _, text in batch],
+                        model=self._model_name,
+                        **({"dimensions": self._dimensions} if self._dimensions else {})
+                    )
+                return [data.embedding for data in sorted(response.data, key=lambda d: d.index)]
+            except (RateLimitError, InternalServerError, APIConnectionError) as e:
+                if attempt == self._max_retries:
+                    raise
+                delay = min(2 ** attempt, 30) * (0.5 + random.random())
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("retry-after") if response is not None else None
+                if retry_after is not None:
+                    try:
+                        delay = max(delay, float(retry_after))
+                    except ValueError:
+                        pass
+                print(f"Embedding request failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
 
     async def embed(self, texts: List[str], is_query: bool) -> List[List[float]]:
         """
-            Generates embeddings by calling the OpenAI embeddings API endpoint.
+            Generates embeddings by calling the OpenAI embeddings API endpoint, with token-aware
+            batches sent concurrently. Embeddings are returned in the order of the input texts.
             Note: OpenAI's official embedding models do not currently differentiate their
             vector generation based on the `is_query` flag, but the parameter is kept
             for compliance with the `BaseEmbedder` interface.
@@ -91,9 +607,97 @@ class OpenAiEmbedder(BaseEmbedder):
             Returns:
                 List[List[float]]: A list of vector embeddings received from the API.
         """
-        response = self._client.embeddings.create(
-            input=texts,
-            model=self._model_name
-        )
-        embeddings = [data.embedding for data in response.data]
+        if not texts:
+            return []
+        # tokenizing a whole document is CPU work, so it runs off the event loop
+        batches = await asyncio.to_thread(self._make_batches, texts)
+        results = await asyncio.gather(*[self._embed_batch(batch) for batch in batches])
+
+        embeddings: List[List[float]] = [[] for _ in range(len(texts))]
+        for batch, batch_embeddings in zip(batches, results):
+            for (idx, _), embedding in zip(batch, batch_embeddings):
+                embeddings[idx] = embedding
         return embeddings
+
+
+class CachedEmbedder(BaseEmbedder):
+    """
+        Wraps any BaseEmbedder with an EmbeddingCache, so repeated questions and unchanged
+        chunk texts are embedded only once. Entries are keyed by the wrapped embedder's
+        fingerprint, the `is_query` flag and the text hash.
+    """
+    def __init__(self, embedder: BaseEmbedder, cache: EmbeddingCache):
+        """
+            Initializes the caching wrapper.
+            Args:
+                embedder (BaseEmbedder): The embedder used on cache misses.
+                cache (EmbeddingCache): The cache holding the embeddings.
+        """
+        self._embedder = embedder
+        self._cache = cache
+
+    def dimension(self) -> int:
+        return self._embedder.dimension()
+
+    def fingerprint(self) -> str:
+        return self._embedder.fingerprint()
+
+    async def embed(self, texts: List[str], is_query: bool) -> List[List[float]]:
+        """
+            Returns cached embeddings and embeds only the missing texts, in a single call to the
+            wrapped embedder. Repeated texts within the same call are embedded once.
+            Args:
+                texts (List[str]): The list of text strings to be embedded.
+                is_query (bool): Whether the texts are queries or documents.
+            Returns:
+                List[List[float]]: A list of vector embeddings, in the order of the input texts.
+        """
+        return (await self.embed_array(texts, is_query)).tolist()
+
+    async def embed_array(self, texts: List[str], is_query: bool) -> np.ndarray:
+        """
+            Same as `embed`, returning the embeddings as one float32 matrix.
+            Args:
+                texts (List[str]): The list of text strings to be embedded.
+                is_query (bool): Whether the texts are queries or documents.
+            Returns:
+                np.ndarray: A (texts x dimension) float32 matrix of embeddings.
+        """
+        fingerprint = self.fingerprint()
+        keys = [EmbeddingCache.make_key(fingerprint, is_query, text) for text in texts]
+        # cache lookups and writes may hit the disk, so they run off the event loop, once per call
+        vectors = await asyncio.to_thread(self._cache.get_many, keys)
+
+        # unique missing texts, mapped to their key
+        missing = {}
+        for text, key, vector in zip(texts, keys, vectors):
+            if vector is None:
+                missing.setdefault(key, text)
+        if missing:
+            embeddings = await self._embedder.embed_array(list(missing.values()), is_query=is_query)
+            # vectors are stored as float32, so hits and misses return the same values
+            computed = dict(zip(missing, embeddings))
+            await asyncio.to_thread(self._cache.put_many, list(computed), list(computed.values()))
+            vectors = [computed[key] if vector is None else vector for key, vector in zip(keys, vectors)]
+        if not vectors:
+            return np.empty((0, self.dimension()), dtype=np.float32)
+        return np.stack(vectors)
+
+    async def warm(self, texts: List[str], is_query: bool = True) -> int:
+        """
+            Pre-computes the embeddings of frequent texts (e.g., frequently asked questions).
+            Args:
+                texts (List[str]): The texts to be cached.
+                is_query (bool, optional): Whether the texts are queries or documents. Defaults to True.
+            Returns:
+                int: The number of texts that were not cached yet.
+        """
+        misses_before = self._cache.misses
+        await self.embed(texts, is_query=is_query)
+        return self._cache.misses - misses_before
+
+    def stats(self):
+        """
+            Returns the counters of the underlying cache.
+        """
+        return self._cache.stats()
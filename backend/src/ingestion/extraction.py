@@ -1,5 +1,69 @@
-from docling.document_converter import DocumentConverter
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions
+from docling.document_converter import DocumentConverter, PdfFormatOption
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing.queues import Queue
+from importlib.metadata import version
+from functools import partial
+from itertools import count, groupby
+from .cache import MarkdownCache
+from .data_models import PageReport
+import pypdfium2 as pdfium
+import multiprocessing
+import asyncio
+import signal
+import weakref
+import queue
+import time
+import os
+
+
+# Separator placed between the Markdown of consecutive page windows when they are joined.
+PAGE_WINDOW_SEPARATOR = "\n\n"
+
+
+def _page_windows(page_count: int, pages_per_batch: int) -> List[Tuple[int, int]]:
+    """
+        Splits a document into consecutive windows of pages.
+        Args:
+            page_count (int): The number of pages in the document.
+            pages_per_batch (int): The maximum number of pages per window.
+        Returns:
+            List[Tuple[int, int]]: The (first_page, last_page) pairs of each window, 1-based and inclusive.
+    """
+    if pages_per_batch < 1:
+        raise ValueError("pages_per_batch must be at least 1")
+    return [(first, min(first + pages_per_batch - 1, page_count)) for first in range(1, page_count + 1, pages_per_batch)]
+
+
+async def _stream_windows(windows: List[Tuple[int, int]], convert: Callable[[int, int], Awaitable[Any]], prefetch: int) -> AsyncIterator[Any]:
+    """
+        Converts page windows ahead of the consumer and yields their results in document order.
+        At most `prefetch` windows are converted while the consumer processes the current one,
+        which bounds memory to a window of pages instead of the whole document.
+        Args:
+            windows (List[Tuple[int, int]]): The (first_page, last_page) windows to convert.
+            convert (Callable[[int, int], Awaitable[Any]]): Converts one window, e.g. into Markdown.
+            prefetch (int): The number of windows converted ahead of the consumer.
+        Yields:
+            Any: The conversion result of each window.
+    """
+    pending = []
+    next_window = 0
+    try:
+        while next_window < len(windows) or pending:
+            while next_window < len(windows) and len(pending) <= prefetch:
+                pending.append(asyncio.ensure_future(convert(*windows[next_window])))
+                next_window += 1
+            task = pending.pop(0)
+            yield await task
+    finally:
+        # the consumer stopped early or a conversion failed: drop the conversions running ahead
+        for task in pending:
+            task.cancel()
 
 
 class BaseExtractor(ABC):
@@ -21,29 +85,585 @@ class BaseExtractor(ABC):
         """
         pass
 
+    async def extract_pages(self, pdf_path: str, pages_per_batch: int = 4) -> AsyncIterator[str]:
+        """
+            Asynchronously extracts text content page by page, yielding the text of each group of pages
+            as soon as it is ready so callers can process early pages while later ones are converted.
+            The default implementation does not stream and yields the whole document at once.
+            Args:
+                pdf_path (str): The file path to the document (e.g., a PDF) to be processed.
+                pages_per_batch (int, optional): The number of pages per yielded group. Defaults to 4.
+            Yields:
+                str: The extracted text of each group of pages, typically formatted as Markdown.
+        """
+        yield await self.extract_text(pdf_path)
+
+    def fingerprint(self) -> str:
+        """
+            Identifies the extraction method and its configuration. Two extractors with the same
+            fingerprint must produce the same text for the same file, so the fingerprint can be
+            used to key caches of extracted text.
+            Returns:
+                str: A string identifying the extractor, its library version and its options.
+        """
+        return type(self).__name__
+
 
 class DoclingExtractor(BaseExtractor):
     """
         Concrete implementation of BaseExtractor that uses the Docling library
         (via DocumentConverter) to convert documents, such as PDFs, into Markdown text.
+
+        In fast mode, each page is first checked for an embedded text layer. Born-digital pages are
+        converted from that text layer with OCR and table-structure models disabled, and only pages
+        that are scanned or have no usable text go through the full OCR pipeline.
     """
-    def __init__(self):
+    def __init__(self, fast: bool = False, min_text_chars: int = 100):
         """
-            Initializes the Docling DocumentConverter instance, which is used for
+            Initializes the Docling DocumentConverter instances, which are used for
             handling the document conversion logic.
+            Args:
+                fast (bool, optional): If True, enables text-layer-first extraction. Defaults to False.
+                min_text_chars (int, optional): The minimum number of non-whitespace characters in a page's
+                                                text layer for it to skip OCR in fast mode. Defaults to 100.
         """
+        self._fast = fast
+        self._min_text_chars = min_text_chars
         self.converter = DocumentConverter()
+        self.text_layer_converter = None
+        if fast:
+            text_layer_options = PdfPipelineOptions(do_ocr=False, do_table_structure=False)
+            self.text_layer_converter = DocumentConverter(
+                format_options={InputFormat.PDF: PdfFormatOption(pipeline_options=text_layer_options)}
+            )
+        self.page_reports: Dict[str, List[PageReport]] = {}
+        # converters are not shared between threads, so streamed windows are converted one at a time
+        self._conversion_thread = ThreadPoolExecutor(max_workers=1)
+
+    def warm_up(self):
+        """
+            Loads the layout, OCR and table-structure models of the PDF pipeline up front,
+            so the first conversion does not pay for model initialization.
+        """
+        self.converter.initialize_pipeline(InputFormat.PDF)
+        if self.text_layer_converter is not None:
+            self.text_layer_converter.initialize_pipeline(InputFormat.PDF)
+
+    def fingerprint(self) -> str:
+        """
+            Identifies the Docling version and conversion options used by this extractor.
+            Returns:
+                str: The extractor fingerprint.
+        """
+        return _docling_fingerprint(fast=self._fast, min_text_chars=self._min_text_chars)
+
+    def convert_to_markdown(self, pdf_path: str) -> str:
+        """
+            Synchronously converts a PDF file into Markdown using the Docling DocumentConverter.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+            Returns:
+                str: The extracted content formatted as a Markdown string.
+        """
+        return self.convert_pages_to_markdown(pdf_path, 1, self.count_pages(pdf_path))
+
+    def count_pages(self, pdf_path: str) -> int:
+        """
+            Counts the pages of a PDF file without converting it.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+            Returns:
+                int: The number of pages.
+        """
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            return len(pdf)
+        finally:
+            pdf.close()
+
+    def count_text_layer_chars(self, pdf_path: str, first_page: int, last_page: int) -> List[int]:
+        """
+            Measures the embedded text layer of a range of pages, without running any model.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+                first_page (int): The first page to inspect (1-based, inclusive).
+                last_page (int): The last page to inspect (1-based, inclusive).
+            Returns:
+                List[int]: The number of non-whitespace characters in the text layer of each page.
+        """
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            counts = []
+            for index in range(first_page - 1, last_page):
+                page = pdf[index]
+                text_page = page.get_textpage()
+                try:
+                    counts.append(len("".join(text_page.get_text_range().split())))
+                finally:
+                    text_page.close()
+                    page.close()
+            return counts
+        finally:
+            pdf.close()
+
+    def convert_pages_with_report(self, pdf_path: str, first_page: int, last_page: int) -> Tuple[str, List[PageReport]]:
+        """
+            Synchronously converts a range of pages of a PDF file into Markdown, reporting the
+            extraction path and time of each page. Only the requested pages are loaded into the
+            Docling document model. In fast mode, consecutive pages with the same extraction path
+            are converted together.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+                first_page (int): The first page to convert (1-based, inclusive).
+                last_page (int): The last page to convert (1-based, inclusive).
+            Returns:
+                Tuple[str, List[PageReport]]: The content of the pages formatted as a Markdown string,
+                                              and the report of each page.
+        """
+        text_chars = self.count_text_layer_chars(pdf_path, first_page, last_page)
+        pages = list(zip(range(first_page, last_page + 1), text_chars))
+        if self._fast:
+            runs = [list(run) for _, run in groupby(pages, key=lambda p: p[1] >= self._min_text_chars)]
+        else:
+            runs = [pages]
+
+        markdowns = []
+        reports = []
+        for run in runs:
+            use_text_layer = self._fast and run[0][1] >= self._min_text_chars
+            converter = self.text_layer_converter if use_text_layer else self.converter
+            start = time.perf_counter()
+            result = converter.convert(pdf_path, page_range=(run[0][0], run[-1][0]))
+            markdowns.append(result.document.export_to_markdown())
+            seconds = (time.perf_counter() - start) / len(run)
+            reports.extend(
+                PageReport(page_number=page, method="text_layer" if use_text_layer else "ocr", text_chars=chars, seconds=seconds)
+                for page, chars in run
+            )
+        return PAGE_WINDOW_SEPARATOR.join(markdowns), reports
+
+    def convert_pages_to_markdown(self, pdf_path: str, first_page: int, last_page: int) -> str:
+        """
+            Synchronously converts a range of pages of a PDF file into Markdown, recording the
+            page reports in `page_reports`.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+                first_page (int): The first page to convert (1-based, inclusive).
+                last_page (int): The last page to convert (1-based, inclusive).
+            Returns:
+                str: The content of the pages formatted as a Markdown string.
+        """
+        markdown, reports = self.convert_pages_with_report(pdf_path, first_page, last_page)
+        _record_page_reports(self.page_reports, pdf_path, reports)
+        return markdown
+
     async def extract_text(self, pdf_path: str) -> str:
         """
             Asynchronously extracts text from a PDF file using the Docling DocumentConverter.
-            The process involves:
-            1. Converting the document using `self.converter.convert(pdf_path)`.
-            2. Exporting the result's document object to a Markdown string.
+            Note: the conversion runs on the calling thread. Use `ProcessPoolExtractor` to keep
+            the event loop responsive while documents are being converted.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+            Returns:
+                str: The extracted content formatted as a Markdown string.
+        """
+        return self.convert_to_markdown(pdf_path)
+
+    async def extract_pages(self, pdf_path: str, pages_per_batch: int = 4) -> AsyncIterator[str]:
+        """
+            Asynchronously extracts text from a PDF file in windows of pages. Conversions run in a
+            background thread, one window ahead of the consumer.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+                pages_per_batch (int, optional): The number of pages per window. Defaults to 4.
+            Yields:
+                str: The content of each window of pages formatted as a Markdown string.
+        """
+        loop = asyncio.get_running_loop()
+        page_count = await asyncio.to_thread(self.count_pages, pdf_path)
+        windows = _page_windows(page_count, pages_per_batch)
+
+        def convert(first_page: int, last_page: int) -> Awaitable[str]:
+            return loop.run_in_executor(self._conversion_thread, self.convert_pages_to_markdown, pdf_path, first_page, last_page)
+
+        async for markdown in _stream_windows(windows, convert, prefetch=1):
+            yield markdown
+
+
+def _docling_fingerprint(fast: bool = False, min_text_chars: int = 100) -> str:
+    """
+        Builds the fingerprint of a DoclingExtractor created with the given options.
+        Args:
+            fast (bool, optional): Whether text-layer-first extraction is enabled. Defaults to False.
+            min_text_chars (int, optional): The text layer threshold used in fast mode. Defaults to 100.
+        Returns:
+            str: The extractor fingerprint.
+    """
+    options = f"fast={fast},min_text_chars={min_text_chars}" if fast else "fast=False"
+    return f"docling=={version('docling')};{options}"
+
+
+# Number of documents whose page reports are kept by an extractor.
+MAX_REPORTED_DOCUMENTS = 32
+
+
+def _record_page_reports(page_reports: Dict[str, List[PageReport]], pdf_path: str, reports: List[PageReport]):
+    """
+        Stores the page reports of a converted window and logs a summary of the extraction paths.
+        Reports restart when the first page of a document is converted again.
+        Args:
+            page_reports (Dict[str, List[PageReport]]): The reports kept per document name.
+            pdf_path (str): The file path to the PDF document.
+            reports (List[PageReport]): The reports of the converted pages.
+    """
+    if not reports:
+        return
+    document_name = pdf_path.split("/")[-1]
+    if reports[0].page_number == 1 or document_name not in page_reports:
+        page_reports.pop(document_name, None)
+        page_reports[document_name] = []
+        while len(page_reports) > MAX_REPORTED_DOCUMENTS:
+            page_reports.pop(next(iter(page_reports)))
+    page_reports[document_name].extend(reports)
+    text_layer_pages = sum(r.method == "text_layer" for r in reports)
+    print(
+        f"Extracted pages {reports[0].page_number}-{reports[-1].page_number} of {document_name}: "
+        f"{text_layer_pages} from text layer, {len(reports) - text_layer_pages} with OCR "
+        f"in {sum(r.seconds for r in reports):.2f}s"
+    )
+
+
+# Seconds between checks of a pooled job: whether it finished, started running, or ran past its timeout.
+JOB_POLL_INTERVAL = 0.1
+
+# Extractor owned by each pool worker process, created once by `_init_worker`.
+_worker_extractor: DoclingExtractor | None = None
+# Queue on which each worker reports the jobs it starts, created by the parent and set by `_init_worker`.
+_worker_job_pids: Queue | None = None
+
+
+def _init_worker(extractor_kwargs: dict, job_pids: Queue):
+    """
+        Process pool initializer. Builds and warms up the worker's own DoclingExtractor.
+        Args:
+            extractor_kwargs (dict): Keyword arguments forwarded to the DoclingExtractor constructor.
+            job_pids (Queue): The queue on which the worker reports the (job ID, process ID)
+                                              of each job it starts.
+    """
+    global _worker_extractor, _worker_job_pids
+    _worker_job_pids = job_pids
+    _worker_extractor = DoclingExtractor(**extractor_kwargs)
+    _worker_extractor.warm_up()
+
+
+def _ping_worker() -> bool:
+    """
+        No-op job used to force the pool to spawn (and initialize) its worker processes.
+    """
+    return _worker_extractor is not None
+
+
+def _run_in_worker(job_id: int, method_name: str, *args):
+    """
+        Calls a synchronous method of the worker's DoclingExtractor, after reporting which process runs the job.
+        Args:
+            job_id (int): The ID of the job, assigned by the parent process.
+            method_name (str): The name of the DoclingExtractor method to call.
+            *args: Positional arguments forwarded to the method.
+        Returns:
+            The method's return value, pickled back to the parent process.
+    """
+    _worker_job_pids.put((job_id, os.getpid()))
+    return getattr(_worker_extractor, method_name)(*args)
+
+
+class ProcessPoolExtractor(BaseExtractor):
+    """
+        Concrete implementation of BaseExtractor that runs Docling conversions in a dedicated
+        pool of worker processes, each holding its own warmed DocumentConverter.
+
+        Conversions never run on the event loop, so the API keeps serving other requests while
+        documents are being converted. The timeout of a job starts when a worker picks it up, so time
+        spent queued behind other jobs does not count. When a job exceeds the timeout, only the worker
+        running it is killed, and the error is surfaced to that job's caller. Since the loss of any worker
+        breaks a ProcessPoolExecutor, the pool is then rebuilt, and the other jobs it held are resubmitted
+        to the new pool. Jobs caught in a pool that broke for an unknown reason (a crashed worker) are
+        retried once, and reported as a worker crash if that happens again.
+    """
+    def __init__(self, num_workers: int = 2, job_timeout: float | None = 600.0, extractor_kwargs: dict | None = None):
+        """
+            Initializes the worker pool. Worker processes are spawned lazily on the first job,
+            or eagerly by calling `warm_up`.
+            Args:
+                num_workers (int, optional): The number of worker processes. Defaults to 2.
+                job_timeout (float | None, optional): The maximum number of seconds a single conversion may take.
+                                                      None disables the timeout. Defaults to 600.
+                extractor_kwargs (dict | None, optional): Keyword arguments forwarded to the DoclingExtractor
+                                                          created in each worker. Defaults to None.
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers must be at least 1")
+        self._num_workers = num_workers
+        self._job_timeout = job_timeout
+        self._extractor_kwargs = extractor_kwargs or {}
+        self.page_reports: Dict[str, List[PageReport]] = {}
+        # "spawn" avoids forking a parent that already runs threads (uvicorn, torch, grpc)
+        self._mp_context = multiprocessing.get_context("spawn")
+        self._job_pids = self._mp_context.Queue()
+        self._job_ids = count()
+        # process ID of each job in flight, once its worker has reported it
+        self._running_jobs: Dict[int, int | None] = {}
+        # why each replaced pool was replaced: "timeout" (a hung worker was killed) or "crash"
+        self._pool_failures: weakref.WeakKeyDictionary[ProcessPoolExecutor, str] = weakref.WeakKeyDictionary()
+        self._pool = self._create_pool()
+
+    def _create_pool(self) -> ProcessPoolExecutor:
+        """
+            Creates a new process pool whose workers build their own DoclingExtractor on start.
+            Returns:
+                ProcessPoolExecutor: The new process pool.
+        """
+        return ProcessPoolExecutor(
+            max_workers=self._num_workers,
+            mp_context=self._mp_context,
+            initializer=_init_worker,
+            initargs=(self._extractor_kwargs, self._job_pids),
+        )
+
+    def _collect_job_pids(self):
+        """
+            Reads the process IDs reported by the workers, keeping those of the jobs still in flight.
+        """
+        while True:
+            try:
+                job_id, pid = self._job_pids.get_nowait()
+            except queue.Empty:
+                return
+            if job_id in self._running_jobs:
+                self._running_jobs[job_id] = pid
+
+    def _kill_job(self, job_id: int):
+        """
+            Terminates the worker process running a job.
+            ProcessPoolExecutor cannot cancel a running job, so a hung conversion has to be killed.
+            Args:
+                job_id (int): The ID of the job.
+        """
+        self._collect_job_pids()
+        pid = self._running_jobs.get(job_id)
+        if pid is None:
+            return
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            pass
+
+    def _replace_pool(self, pool: ProcessPoolExecutor, reason: str):
+        """
+            Records why a pool broke and replaces it with a fresh one.
+            Args:
+                pool (ProcessPoolExecutor): The pool that broke. If it was already replaced
+                                            by another job, only the first reason is kept.
+                reason (str): "timeout" if a hung worker was killed, "crash" otherwise.
+        """
+        self._pool_failures.setdefault(pool, reason)
+        if pool is not self._pool:
+            return
+        self._pool = self._create_pool()
+        # queued jobs are not cancelled: the broken pool fails them, and they are resubmitted
+        pool.shutdown(wait=False)
+
+    async def _submit(self, method_name: str, *args):
+        """
+            Runs a DoclingExtractor method in the worker pool, enforcing the job timeout from the moment a
+            worker reports it started the job. If the pool breaks because another job timed out, the job
+            is resubmitted to the new pool; if it breaks for any other reason, the job is retried once.
+            Args:
+                method_name (str): The name of the DoclingExtractor method to call in the worker.
+                *args: Positional arguments forwarded to the method.
+            Returns:
+                The method's return value.
+            Raises:
+                TimeoutError: If the job runs longer than `job_timeout` seconds.
+                RuntimeError: If the pool breaks again, for an unknown reason, while the retried job runs.
+        """
+        loop = asyncio.get_running_loop()
+        crash_retried = False
+        while True:
+            pool = self._pool
+            job_id = next(self._job_ids)
+            self._running_jobs[job_id] = None
+            started = None
+            job = None
+            try:
+                job = loop.run_in_executor(pool, _run_in_worker, job_id, method_name, *args)
+                while True:
+                    done, _ = await asyncio.wait({job}, timeout=JOB_POLL_INTERVAL)
+                    if done:
+                        if job.cancelled():
+                            raise BrokenProcessPool("The job was cancelled by the shutdown of its pool")
+                        return job.result()
+                    self._collect_job_pids()
+                    if started is None:
+                        # the job is still queued until its worker reports it
+                        if self._running_jobs.get(job_id) is not None:
+                            started = loop.time()
+                    elif self._job_timeout is not None and loop.time() - started > self._job_timeout:
+                        self._kill_job(job_id)
+                        self._replace_pool(pool, "timeout")
+                        raise TimeoutError(f"Extraction of {args[0]} exceeded {self._job_timeout} seconds")
+            except BrokenProcessPool as e:
+                # no other job killed a worker of this pool, so one of its workers crashed
+                self._replace_pool(pool, "crash")
+                if started is not None and self._job_timeout is not None and loop.time() - started >= self._job_timeout:
+                    raise TimeoutError(f"Extraction of {args[0]} exceeded {self._job_timeout} seconds") from e
+                if self._pool_failures.get(pool) == "crash":
+                    if crash_retried:
+                        raise RuntimeError(f"Extraction worker crashed while processing {args[0]}") from e
+                    crash_retried = True
+                print(f"Extraction pool broke while processing {args[0]}, resubmitting it to a new pool")
+            finally:
+                if job is not None and not job.done():
+                    job.cancel()
+                self._running_jobs.pop(job_id, None)
+                self._collect_job_pids()
+
+    async def warm_up(self):
+        """
+            Spawns every worker process and waits until each one has loaded its models.
+        """
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(
+            *[loop.run_in_executor(self._pool, _ping_worker) for _ in range(self._num_workers)]
+        )
+
+    async def extract_text(self, pdf_path: str) -> str:
+        """
+            Asynchronously extracts text from a PDF file in one of the pool's worker processes.
             Args:
                 pdf_path (str): The file path to the PDF document.
             Returns:
                 str: The extracted content formatted as a Markdown string.
+            Raises:
+                TimeoutError: If the conversion takes longer than the configured job timeout.
+                RuntimeError: If the worker process crashes during the conversion.
         """
-        result = self.converter.convert(pdf_path)
-        markdown = result.document.export_to_markdown()
+        page_count = await self._submit("count_pages", pdf_path)
+        markdown, reports = await self._submit("convert_pages_with_report", pdf_path, 1, page_count)
+        _record_page_reports(self.page_reports, pdf_path, reports)
         return markdown
+
+    async def extract_pages(self, pdf_path: str, pages_per_batch: int = 4) -> AsyncIterator[str]:
+        """
+            Asynchronously extracts text from a PDF file in windows of pages. Windows are converted
+            in parallel by the pool workers, at most `num_workers` windows ahead of the consumer,
+            and yielded in document order.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+                pages_per_batch (int, optional): The number of pages per window. Defaults to 4.
+            Yields:
+                str: The content of each window of pages formatted as a Markdown string.
+            Raises:
+                TimeoutError: If the conversion of a window takes longer than the configured job timeout.
+                RuntimeError: If a worker process crashes during the conversion.
+        """
+        page_count = await self._submit("count_pages", pdf_path)
+        windows = _page_windows(page_count, pages_per_batch)
+
+        convert = partial(self._submit, "convert_pages_with_report", pdf_path)
+        async for markdown, reports in _stream_windows(windows, convert, prefetch=self._num_workers):
+            # windows may finish out of order, so reports are recorded here in document order
+            _record_page_reports(self.page_reports, pdf_path, reports)
+            yield markdown
+
+    def fingerprint(self) -> str:
+        """
+            Identifies the Docling version and conversion options used by the pool workers.
+            Returns:
+                str: The extractor fingerprint.
+        """
+        return _docling_fingerprint(**self._extractor_kwargs)
+
+    def close(self):
+        """
+            Shuts down the worker pool, cancelling queued jobs.
+        """
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class CachedExtractor(BaseExtractor):
+    """
+        Concrete implementation of BaseExtractor that serves extracted Markdown from a
+        content-addressed on-disk cache and only delegates to the wrapped extractor on a miss.
+
+        Entries are keyed by the hash of the file bytes plus the wrapped extractor's fingerprint,
+        so re-uploading an unchanged PDF, or re-indexing it after a chunking or embedding change,
+        skips the conversion entirely.
+    """
+    def __init__(self, extractor: BaseExtractor, cache: MarkdownCache):
+        """
+            Initializes the cached extractor.
+            Args:
+                extractor (BaseExtractor): The extractor used on cache misses.
+                cache (MarkdownCache): The cache holding previously extracted Markdown.
+        """
+        self._extractor = extractor
+        self._cache = cache
+
+    async def extract_text(self, pdf_path: str) -> str:
+        """
+            Returns the cached Markdown for a file, extracting and caching it on a miss.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+            Returns:
+                str: The extracted content formatted as a Markdown string.
+        """
+        key = await asyncio.to_thread(MarkdownCache.make_key, pdf_path, self._extractor.fingerprint())
+        markdown = await asyncio.to_thread(self._cache.get, key)
+        if markdown is None:
+            markdown = await self._extractor.extract_text(pdf_path)
+            await asyncio.to_thread(self._cache.put, key, markdown)
+        return markdown
+
+    async def extract_pages(self, pdf_path: str, pages_per_batch: int = 4) -> AsyncIterator[str]:
+        """
+            Yields the cached Markdown of each window of pages of a file. On a miss, streams the windows of
+            the wrapped extractor, caching each one as it is yielded, so memory stays bounded by the window
+            size. The number of windows is cached last, so a file is only served from the cache once all its
+            windows are stored. Windows are keyed apart from the whole-document entry of `extract_text`, and
+            by window size, so every caller gets the text a conversion with the same arguments would produce.
+            Args:
+                pdf_path (str): The file path to the PDF document.
+                pages_per_batch (int, optional): The number of pages per window. Defaults to 4.
+            Yields:
+                str: The content of each window of pages formatted as a Markdown string.
+        """
+        key = await asyncio.to_thread(MarkdownCache.make_key, pdf_path, self._extractor.fingerprint())
+        windows_key = f"{key}-pages{pages_per_batch}"
+        window_count = await asyncio.to_thread(self._cache.get, windows_key)
+        cached = 0
+        if window_count is not None:
+            for index in range(int(window_count)):
+                markdown = await asyncio.to_thread(self._cache.get, f"{windows_key}-{index}")
+                if markdown is None:
+                    break
+                yield markdown
+                cached += 1
+            else:
+                return
+        # a window was evicted: convert the file again, without yielding the windows already served
+        index = 0
+        async for markdown in self._extractor.extract_pages(pdf_path, pages_per_batch=pages_per_batch):
+            await asyncio.to_thread(self._cache.put, f"{windows_key}-{index}", markdown)
+            if index >= cached:
+                yield markdown
+            index += 1
+        await asyncio.to_thread(self._cache.put, windows_key, str(index))
+
+    def fingerprint(self) -> str:
+        """
+            Returns the fingerprint of the wrapped extractor, since caching does not change the output.
+            Returns:
+                str: The extractor fingerprint.
+        """
+        return self._extractor.fingerprint()
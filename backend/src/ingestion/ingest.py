@@ -1,11 +1,97 @@
+from .cache import AnswerCache
+from .bundle import BundleManifest, iter_chunk_batches, read_manifest, read_registry, write_bundle
 from .chunking import BaseChunker
-from .extraction import BaseExtractor
+from .data_models import ChunkBatch, DataPoint, DocumentRecord, hash_file
+from .extraction import BaseExtractor, PAGE_WINDOW_SEPARATOR
 from .vector_db import BaseVectorDatabase
 from .embeddings import BaseEmbedder
-from typing import List, Tuple
+from .lexical_index import BM25Index
+from .registry import DocumentRegistry
+from contextlib import aclosing
+from typing import AsyncIterator, List, Optional, Set, Tuple
+import asyncio
+import time
 import uuid
 
 
+def _drop_seen(data_points: List[DataPoint], seen_ids: Set[uuid.UUID]) -> List[DataPoint]:
+    """
+        Drops the DataPoints whose ID was already seen, and records the IDs of the others.
+        Args:
+            data_points (List[DataPoint]): The DataPoints, in document order.
+            seen_ids (Set[uuid.UUID]): The IDs seen so far, updated in place.
+        Returns:
+            List[DataPoint]: The DataPoints with a new ID.
+    """
+    kept = []
+    for p in data_points:
+        if p.id not in seen_ids:
+            seen_ids.add(p.id)
+            kept.append(p)
+    return kept
+
+
+class _WindowBatcher:
+    """
+        Chunks the windows of concurrently indexed files together. A window waits while a batch is being chunked,
+        then joins every other window that became ready in the meantime in the next call to `chunk_batch`,
+        so a chunker backed by a worker pool spreads the files across its workers.
+    """
+    def __init__(self, chunker: BaseChunker):
+        self._chunker = chunker
+        self._pending: List[Tuple[tuple, asyncio.Future]] = []
+        self._task: Optional[asyncio.Task] = None
+
+    async def chunk(self, text: str, document_id: uuid.UUID, document_name: str, first_ordinal: int, section: str | None) -> List[DataPoint]:
+        """
+            Chunks a window of a document along with the windows of other documents.
+            Args:
+                text (str): The text of the window.
+                document_id (uuid.UUID): The unique ID of the document.
+                document_name (str): The human-readable name of the document.
+                first_ordinal (int): The ordinal of the first chunk of the window.
+                section (str | None): The section heading in effect at the start of the window.
+            Returns:
+                List[DataPoint]: The DataPoints of the window.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append(((text, document_id, document_name, first_ordinal, section), future))
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return await future
+
+    async def _run(self):
+        """
+            Chunks the pending windows, batch after batch, until none is left.
+        """
+        batch = []
+        try:
+            while self._pending:
+                batch, self._pending = self._pending, []
+                try:
+                    results = await self._chunker.chunk_batch([document for document, _ in batch])
+                except Exception:
+                    # chunk the windows one by one, so only the failing one fails
+                    results = []
+                    for document, _ in batch:
+                        try:
+                            results.append(await self._chunker.chunk_text(*document))
+                        except Exception as e:
+                            results.append(e)
+                for (_, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+        finally:
+            for _, future in batch + self._pending:
+                future.cancel()
+            self._pending = []
+            self._task = None
+
+
 class IndexManager:
     """
         Manages the end-to-end process of indexing documents into a vector database.
@@ -13,96 +99,410 @@ class IndexManager:
         This class orchestrates the pipeline involving text extraction, chunking,
         embedding generation, and storage in a vector database.
     """
-    def __init__(self, extractor: BaseExtractor, chunker: BaseChunker, embedder: BaseEmbedder, vector_db: BaseVectorDatabase, collection_name: str):
+    def __init__(self, extractor: BaseExtractor, chunker: BaseChunker, embedder: BaseEmbedder, vector_db: BaseVectorDatabase, collection_name: str, pages_per_batch: int = 4, max_concurrent_files: int = 4, lexical_index: Optional[BM25Index] = None, registry: Optional[DocumentRegistry] = None, answer_cache: Optional[AnswerCache] = None):
         """
             Initializes the IndexManager with all required service dependencies.
-            It also ensures the target vector collection is created if it does not already exist,
-            using a default vector dimension of 1536.
+            The target collection is prepared by `initialize`, which must be awaited before use.
             Args:
                 extractor (BaseExtractor): The service responsible for extracting text from files.
                 chunker (BaseChunker): The service responsible for splitting text into manageable chunks (DataPoints).
                 embedder (BaseEmbedder): The service responsible for generating vector embeddings from text.
                 vector_db (BaseVectorDatabase): The service responsible for storing and retrieving vectors.
                 collection_name (str): The name of the collection/index in the vector database to use.
+                pages_per_batch (int, optional): The number of pages extracted and indexed at a time. Defaults to 4.
+                max_concurrent_files (int, optional): The number of files indexed at the same time. Defaults to 4.
+                lexical_index (Optional[BM25Index], optional): A lexical index kept in sync with the vector database
+                                                               as documents are inserted, updated and removed. Defaults to None.
+                registry (Optional[DocumentRegistry], optional): The catalog of indexed documents. Defaults to an
+                                                                 in-memory registry built from the stored chunks.
+                answer_cache (Optional[AnswerCache], optional): A cache of chatbot answers, whose answers depending on a
+                                                                document are dropped when the document is re-indexed or
+                                                                removed. Defaults to None.
         """
         self._extractor = extractor
         self._chunker = chunker
+        self._window_batcher = _WindowBatcher(chunker)
         self._embedder = embedder
         self._vector_db = vector_db
         self._collection_name = collection_name
+        self._pages_per_batch = pages_per_batch
+        self._max_concurrent_files = max_concurrent_files
+        self._lexical_index = lexical_index
+        self._registry = registry if registry is not None else DocumentRegistry()
+        self._answer_cache = answer_cache
+
+    async def initialize(self):
+        """
+            Ensures the target vector collection is created if it does not already exist,
+            with the dimension of the embedder's vectors. Then rebuilds the lexical index from the stored
+            chunks, and the document registry too if it was not loaded from its file.
+            Raises:
+                ValueError: If the collection exists with a dimension different from the embedder's.
+        """
+        # create collection if it doesn't already exist, sized for the embedder's vectors
+        dimension = self._embedder.dimension()
+        stored_dimension = await self._vector_db.collection_dimension(self._collection_name)
+        if stored_dimension is None:
+            await self._vector_db.create_collection(self._collection_name, vector_field_dimension=dimension)
+        elif stored_dimension != dimension:
+            raise ValueError(
+                f"Collection '{self._collection_name}' stores {stored_dimension}-dimensional vectors, but the embedder "
+                f"produces {dimension}-dimensional ones. Re-create the collection or configure the embedder to match."
+            )
+        else:
+            # collections created by older versions may lack newer payload indexes
+            await self._vector_db.ensure_payload_indexes(self._collection_name)
+        if self._lexical_index is None and self._registry.loaded:
+            return
+        data_points = await self._vector_db.list_data_points(self._collection_name)
+        if self._lexical_index is not None:
+            self._lexical_index.clear()
+            self._lexical_index.add(data_points)
+            print(f"Lexical index rebuilt with {len(self._lexical_index)} chunks")
+        if not self._registry.loaded:
+            self._registry.rebuild(data_points)
+            print(f"Document registry rebuilt with {len(self._registry)} documents")
+
+    async def rebuild_registry(self):
+        """
+            Rebuilds the document registry from the chunks stored in the vector database,
+            e.g., after the collection was modified by another process.
+        """
+        self._registry.rebuild(await self._vector_db.list_data_points(self._collection_name))
+
+    def is_indexed(self, file_name: str) -> bool:
+        """
+            Checks in the document registry whether a document is indexed.
+            Args:
+                file_name (str): The name of the document.
+            Returns:
+                bool: True if the document is indexed.
+        """
+        return file_name in self._registry
+
+    def list_documents(self) -> List[DocumentRecord]:
+        """
+            Lists the registry records (ID, chunk count, content hash and ingestion time) of the indexed documents.
+            Returns:
+                List[DocumentRecord]: The records, sorted by document name.
+        """
+        return self._registry.list()
+
+    async def export_bundle(self, path: str) -> BundleManifest:
+        """
+            Writes the whole index (vectors, payloads and document registry) to a portable bundle, along with
+            the embedder and chunker configuration, so another deployment can import it instead of re-indexing.
+            Args:
+                path (str): The directory of the bundle. An existing bundle there is replaced.
+            Returns:
+                BundleManifest: The manifest of the written bundle.
+        """
+        data_points = await self._vector_db.list_data_points(self._collection_name, with_vectors=True)
+        records = self._registry.list()
+        manifest = BundleManifest(
+            created_at=time.time(),
+            collection_name=self._collection_name,
+            dimension=self._embedder.dimension(),
+            point_count=len(data_points),
+            document_count=len(records),
+            embedder=self._embedder.fingerprint(),
+            chunker=self._chunker.fingerprint(),
+        )
+        await asyncio.to_thread(write_bundle, path, manifest, data_points, records)
+        print(f"Exported {manifest.point_count} chunks of {manifest.document_count} documents to {path}")
+        return manifest
+
+    async def import_bundle(self, path: str, batch_size: int = 1_000) -> BundleManifest:
+        """
+            Restores an index bundle into the collection in bulk, without extracting, chunking or embedding
+            anything. Chunks already stored with the same ID are overwritten, so importing is idempotent.
+            The collection must have been prepared by `initialize`.
+            Args:
+                path (str): The directory of the bundle.
+                batch_size (int, optional): The number of chunks inserted per batch. Defaults to 1,000.
+            Returns:
+                BundleManifest: The manifest of the imported bundle.
+            Raises:
+                ValueError: If the bundle was built with another embedder, whose vectors are not comparable
+                            with the query embeddings, or with another vector dimension.
+        """
+        manifest = await asyncio.to_thread(read_manifest, path)
+        if manifest.embedder != self._embedder.fingerprint() or manifest.dimension != self._embedder.dimension():
+            raise ValueError(
+                f"Index bundle was built with embedder '{manifest.embedder}' ({manifest.dimension} dimensions), but the "
+                f"configured embedder is '{self._embedder.fingerprint()}' ({self._embedder.dimension()} dimensions)."
+            )
+        if manifest.chunker != self._chunker.fingerprint():
+            # still usable, but the next update of each document re-chunks and re-embeds it entirely
+            print(f"Index bundle was chunked with '{manifest.chunker}', the configured chunker is '{self._chunker.fingerprint()}'")
+
+        batches = iter_chunk_batches(path, batch_size=batch_size)
+        while True:
+            batch = await asyncio.to_thread(next, batches, None)
+            if batch is None:
+                break
+            if not await self._vector_db.insert_batch(collection_name=self._collection_name, batch=batch):
+                raise RuntimeError(f"Failed to import index bundle {path}")
+            if self._lexical_index is not None:
+                self._lexical_index.add(batch.to_data_points())
+        self._registry.put_many(await asyncio.to_thread(read_registry, path))
+        if self._answer_cache is not None:
+            self._answer_cache.clear()
+        print(f"Imported {manifest.point_count} chunks of {manifest.document_count} documents from {path}")
+        return manifest
+
+    def _invalidate_answers(self, file_names: List[str]):
+        """
+            Drops the cached answers generated from chunks of documents that changed.
+            Args:
+                file_names (List[str]): The names of the changed documents.
+        """
+        if self._answer_cache is not None and file_names:
+            self._answer_cache.invalidate_documents(file_names)
+
+    async def _index_data_points(self, data_points: List[DataPoint], content_hash: str = "", ingested_at: Optional[float] = None) -> bool:
+        """
+            Embeds a list of chunks as documents and inserts them into the vector database.
+            Args:
+                data_points (List[DataPoint]): The chunks to be embedded and inserted.
+                content_hash (str, optional): The hash of the source file, stored with each chunk. Defaults to "".
+                ingested_at (Optional[float], optional): The ingestion time, stored with each chunk. Defaults to None.
+            Returns:
+                bool: True if the insertion was successful, False otherwise.
+        """
+        if not data_points:
+            return True
+
+        # assign source file metadata to data_points
+        for p in data_points:
+            p.content_hash = content_hash
+            p.ingested_at = ingested_at
 
-        # create collection if it doesn't already exist
-        exists = self._vector_db.collection_exists(self._collection_name)
-        if not exists:
-            self._vector_db.create_collection(self._collection_name, vector_field_dimension=1536)
+        # embed texts as documents into one float32 matrix, carried alongside the chunk columns
+        batch = ChunkBatch.from_data_points(data_points)
+        batch.vectors = await self._embedder.embed_array(batch.chunk_texts, is_query=False)
+
+        # insert data into vector database
+        success = await self._vector_db.insert_batch(collection_name=self._collection_name, batch=batch)
+        if success and self._lexical_index is not None:
+            self._lexical_index.add(data_points)
+        return success
+
+    async def _chunk_windows(self, file_path: str, file_id: uuid.UUID) -> AsyncIterator[List[DataPoint]]:
+        """
+            Streams the chunks of a file, one window of pages at a time. The last chunk of a window is held
+            back and prepended to the next window, since its text may continue on the following pages.
+            Windows of files indexed at the same time are chunked together, in batches.
+            Identical chunks of a document share an ID, so only the first one is yielded.
+            Insertion and update both chunk files through this pipeline, so the same file always yields
+            the same chunks, and thus the same chunk IDs.
+            Args:
+                file_path (str): The path of the file to be chunked.
+                file_id (uuid.UUID): The unique ID of the document.
+            Yields:
+                List[DataPoint]: The chunks completed by the next window, without vectors.
+        """
+        file_name = file_path.split("/")[-1]
+        carry = ""
+        # position and section heading where the held-back chunk starts
+        next_ordinal = 0
+        section = None
+        seen_ids = set()
+        # extract text from pdf into markdown text, one window of pages at a time
+        async for md_text in self._extractor.extract_pages(file_path, pages_per_batch=self._pages_per_batch):
+            text = carry + PAGE_WINDOW_SEPARATOR + md_text if carry else md_text
+
+            # chunk the text, holding back the last chunk, even if it repeats an earlier one
+            data_points = await self._window_batcher.chunk(text, file_id, file_name, next_ordinal, section)
+            if data_points:
+                last = data_points.pop()
+                carry, next_ordinal, section = last.chunk_text, last.ordinal, last.section
+            else:
+                carry = ""
+            yield _drop_seen(data_points, seen_ids)
+
+        # chunk the text left over from the last window
+        if carry:
+            data_points = await self._window_batcher.chunk(carry, file_id, file_name, next_ordinal, section)
+            yield _drop_seen(data_points, seen_ids)
+
+    async def _insert_file(self, file_path: str, file_id: uuid.UUID) -> bool:
+        """
+            Streams a single file through the indexing pipeline, one window of pages at a time.
+            Args:
+                file_path (str): The path of the file to be indexed.
+                file_id (uuid.UUID): The unique ID of the document.
+            Returns:
+                bool: True if the whole file was indexed, False otherwise.
+        """
+        file_name = file_path.split("/")[-1]
+        content_hash = await asyncio.to_thread(hash_file, file_path)
+        ingested_at = time.time()
+        chunk_ids = set()
+        success = True
+        try:
+            async with aclosing(self._chunk_windows(file_path, file_id)) as windows:
+                async for data_points in windows:
+                    success = await self._index_data_points(data_points, content_hash, ingested_at)
+                    if not success:
+                        break
+                    chunk_ids.update(p.id for p in data_points)
+        except Exception as e:
+            # e.g., the extraction timed out or its worker crashed
+            print(f"Failed to index {file_name}: {e}")
+            success = False
+
+        self._invalidate_answers([file_name])
+        # if the document fails to upload, remove its partial upload
+        if not success:
+            await self._vector_db.remove(collection_name=self._collection_name, document_name=file_name)
+            if self._lexical_index is not None:
+                self._lexical_index.remove_document(file_name)
+            self._registry.remove(file_name)
+        else:
+            self._registry.put(DocumentRecord(
+                name=file_name, document_id=file_id, chunk_count=len(chunk_ids), content_hash=content_hash, ingested_at=ingested_at
+            ))
+        return success
 
     async def insert(self, file_paths: List[Tuple[str, uuid.UUID]]) -> List[bool]:
         """
             Processes and indexes documents from a list of file paths into the vector database.
-            The indexing pipeline performs the following steps for each file:
-            1. Extract text (e.g., from PDF to Markdown).
-            2. Chunk the text into DataPoints.
+            Up to `max_concurrent_files` files go through the pipeline at the same time, so their
+            conversions, chunking and embedding requests run in parallel. Each file is streamed
+            through the pipeline in windows of pages (see `_chunk_windows`), so chunking, embedding
+            and insertion of early pages overlap with the conversion of later ones:
+            1. Extract text window by window (e.g., from PDF to Markdown).
+            2. Chunk the window's text into DataPoints. The last chunk of a window is held back and
+               prepended to the next window, since its text may continue on the following pages.
+               The windows that other files have ready at the same time are chunked in the same batch.
             3. Generate vector embeddings for all chunk texts.
             4. Assign the generated vectors to the DataPoints.
             5. Insert the DataPoints (vectors and metadata) into the vector database.
+            If a window fails to be extracted or inserted, the chunks already stored for that file are removed.
             Args:
                 file_paths (List[Tuple[str, uuid.UUID]]): A list where each element is a tuple
                                                           containing the file path and its associated UUID.
             Returns:
                 List[bool]: A list of booleans indicating the success status for each corresponding file in the input list.
         """
-        files_uploaded = [False for _ in range(len(file_paths))]
-        for idx, f in enumerate(file_paths):
-            file_path = f[0]
-            file_id = f[1]
+        semaphore = asyncio.Semaphore(self._max_concurrent_files)
 
-            # extract text from pdf into markdown text
-            md_text = await self._extractor.extract_text(file_path)
+        async def insert_file(file_path: str, file_id: uuid.UUID) -> bool:
+            async with semaphore:
+                return await self._insert_file(file_path, file_id)
 
-            # chunk the text
-            data_points = await self._chunker.chunk_text(md_text, file_id, file_path.split("/")[-1])
+        return list(await asyncio.gather(*[insert_file(file_path, file_id) for file_path, file_id in file_paths]))
 
-            # get text from chunks
-            chunk_texts = [p.chunk_text for p in data_points]
+    async def update(self, file_paths: List[Tuple[str, uuid.UUID]]) -> List[bool]:
+        """
+            Re-indexes documents that may already be stored, touching only the chunks that changed.
+            Up to `max_concurrent_files` files are extracted and chunked at the same time, through the same
+            windowed pipeline as `insert`, so an unchanged file yields exactly the chunk IDs it was inserted with.
+            Then, for each file, the new chunk set is compared with the chunk IDs stored in the vector database.
+            Since chunk IDs are derived from the document ID and the chunk content hash:
+            1. Chunks whose ID is not stored yet are new or changed, so only they are embedded and inserted.
+            2. Stored chunks whose ID is no longer produced have disappeared, so they are removed.
+            3. Unchanged chunks are not embedded again. If their position in the document shifted,
+               only their ordinal and section payload is updated.
+            New chunks are inserted before stale ones are removed, so the document stays searchable throughout.
+            Args:
+                file_paths (List[Tuple[str, uuid.UUID]]): A list where each element is a tuple
+                                                          containing the file path and its associated UUID.
+            Returns:
+                List[bool]: A list of booleans indicating the success status for each corresponding file in the input list.
+        """
+        files_updated = [False for _ in range(len(file_paths))]
+        file_names = [file_path.split("/")[-1] for file_path, _ in file_paths]
 
-            # embed texts as documents
-            embeddings = await self._embedder.embed(chunk_texts, is_query=False)
+        semaphore = asyncio.Semaphore(self._max_concurrent_files)
 
-            # assign vectors to data_points
-            for p, e in zip(data_points, embeddings):
-                p.vector = e
+        async def chunk_file(file_path: str, file_id: uuid.UUID) -> Optional[List[DataPoint]]:
+            async with semaphore:
+                data_points = []
+                try:
+                    async for window in self._chunk_windows(file_path, file_id):
+                        data_points.extend(window)
+                except Exception as e:
+                    print(f"Failed to extract {file_path}: {e}")
+                    return None
+                return data_points
 
-            # insert data into vector database
-            success = await self._vector_db.insert(collection_name=self._collection_name, data_points=data_points)
+        # the whole chunk set is needed before anything can be removed
+        chunked_files = await asyncio.gather(*[chunk_file(file_path, file_id) for file_path, file_id in file_paths])
+        content_hashes = await asyncio.gather(*[asyncio.to_thread(hash_file, file_path) for file_path, _ in file_paths])
 
-            # if any document fails to upload, return an error
+        for idx, (file_name, data_points) in enumerate(zip(file_names, chunked_files)):
+            # a file that failed to be extracted keeps its stored chunks
+            if data_points is None:
+                continue
+            # diff the new chunk set against the stored one
+            stored_positions = await self._vector_db.list_chunk_positions(collection_name=self._collection_name, document_name=file_name)
+            new_ids = {p.id for p in data_points}
+            new_data_points = [p for p in data_points if p.id not in stored_positions]
+            moved_data_points = [
+                p for p in data_points
+                if p.id in stored_positions and stored_positions[p.id] != (p.ordinal, p.section)
+            ]
+            stale_ids = [i for i in stored_positions if i not in new_ids]
+
+            ingested_at = time.time()
+            success = await self._index_data_points(new_data_points, content_hashes[idx], ingested_at)
+            # unchanged chunks that shifted position only need their payload updated
+            if success and moved_data_points:
+                success = await self._vector_db.update_chunk_positions(collection_name=self._collection_name, data_points=moved_data_points)
+                if success and self._lexical_index is not None:
+                    self._lexical_index.update_positions(moved_data_points)
+            if success and stale_ids:
+                success = await self._vector_db.remove_chunks(collection_name=self._collection_name, chunk_ids=stale_ids)
+                if success and self._lexical_index is not None:
+                    self._lexical_index.remove_chunks(stale_ids)
+            print(f"Updated {file_name}: {len(new_data_points)} chunks embedded, {len(moved_data_points)} moved, "
+                  f"{len(stale_ids)} removed, {len(data_points) - len(new_data_points)} unchanged")
+
+            if new_data_points or moved_data_points or stale_ids:
+                self._invalidate_answers([file_name])
+            # if any document fails to update, return an error
             if not success:
                 break
-            files_uploaded[idx] = success
-        return files_uploaded
+            self._registry.put(DocumentRecord(
+                name=file_name, document_id=file_paths[idx][1], chunk_count=len(data_points),
+                content_hash=content_hashes[idx], ingested_at=ingested_at,
+            ))
+            files_updated[idx] = success
+        return files_updated
 
     async def remove(self, file_names: List[str]) -> List[bool]:
         """
-            Removes all vectors and associated metadata for a list of documents from the vector database.
+            Removes all vectors and associated metadata for a list of documents from the vector database,
+            with a single bulk delete filtering on their document IDs. Documents that are not indexed are
+            reported as not removed; the others all share the outcome of the bulk delete.
             Args:
                 file_names (List[str]): A list of document names to be removed.
             Returns:
                 List[bool]: A list of booleans indicating the success status for each corresponding file removal.
         """
-        files_removed = [False for _ in range(len(file_names))]
-        for idx, f in enumerate(file_names):
-            success = await self._vector_db.remove(collection_name=self._collection_name, document_name=f)
+        records = [self._registry.get(f) for f in file_names]
+        document_ids = list({r.document_id for r in records if r is not None})
+        if not document_ids:
+            return [False for _ in file_names]
 
-            # if any document fails to be removed, return an error
-            if not success:
-                break
-            files_removed[idx] = success
-        return files_removed
+        success = await self._vector_db.remove_documents(collection_name=self._collection_name, document_ids=document_ids)
+        if not success:
+            return [False for _ in file_names]
+        removed_names = [f for f, record in zip(file_names, records) if record is not None]
+        if self._lexical_index is not None:
+            for f in removed_names:
+                self._lexical_index.remove_document(f)
+        self._registry.remove_many(removed_names)
+        self._invalidate_answers(removed_names)
+        return [record is not None for record in records]
 
     async def list_stored_files(self) -> List[str]:
         """
-            Retrieves a list of all unique document names currently stored in the vector database collection.
+            Retrieves a list of all unique document names currently stored in the vector database collection,
+            from the document registry.
             Returns:
                 List[str]: A list of unique document names (strings).
         """
-        return await self._vector_db.list_unique_documents(collection_name=self._collection_name)
\ No newline at end of file
+        return [record.name for record in self._registry.list()]
\ No newline at end of file
@@ -0,0 +1,190 @@
+from .data_models import DataPoint
+from typing import Dict, Iterable, List, Set, Tuple
+import unicodedata
+import heapq
+import math
+import re
+import uuid
+
+
+# Common Portuguese function words, accent-folded, that carry no meaning for retrieval.
+PORTUGUESE_STOPWORDS = frozenset("""
+a ao aos aquela aquelas aquele aqueles aquilo as ate com como da das de dela delas dele deles depois do dos
+e ela elas ele eles em entre era eram essa essas esse esses esta estao estas este estes eu foi foram ha isso
+isto ja la lhe lhes mais mas me mesmo meu meus minha minhas muito na nao nas nem no nos nossa nossas nosso
+nossos num numa o os ou para pela pelas pelo pelos por qual quando que quem se sem ser seu seus so sua suas
+tambem te tem tinha um uma umas uns voce voces vos sera serao sao seja sejam pode podem deve devem
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def _singular(token: str) -> str:
+    """
+        Light Portuguese plural folding, so "bolsas" matches "bolsa" and "qualificacoes" matches "qualificacao".
+    """
+    if token.endswith(("oes", "aes")):
+        return token[:-3] + "ao"
+    if len(token) > 3 and token.endswith("s") and not token.endswith("ss") and not token[-2].isdigit():
+        return token[:-1]
+    return token
+
+
+def tokenize(text: str) -> List[str]:
+    """
+        Splits text into lowercase, accent-folded tokens with plurals folded, dropping Portuguese stopwords.
+        Numbers and codes are kept whole (e.g., "Art. 12" -> ["art", "12"], "INF2102" -> ["inf2102"]).
+        Args:
+            text (str): The text to be tokenized.
+        Returns:
+            List[str]: The tokens, in text order.
+    """
+    folded = unicodedata.normalize("NFKD", text.lower())
+    folded = "".join(c for c in folded if not unicodedata.combining(c))
+    return [
+        _singular(t) for t in TOKEN_PATTERN.findall(folded)
+        if t not in PORTUGUESE_STOPWORDS and (len(t) > 1 or t.isdigit())
+    ]
+
+
+class BM25Index:
+    """
+        In-memory BM25 inverted index over chunk texts.
+
+        Chunks are added and removed incrementally as documents are indexed, updated and removed,
+        so the index always mirrors the vector database. Exact terms such as article numbers,
+        acronyms or course codes, which dense embeddings tend to blur, rank highly here.
+    """
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        """
+            Initializes an empty index.
+            Args:
+                k1 (float, optional): The term frequency saturation parameter. Defaults to 1.2.
+                b (float, optional): The document length normalization parameter. Defaults to 0.75.
+        """
+        self._k1 = k1
+        self._b = b
+        # token -> chunk ID -> term frequency
+        self._postings: Dict[str, Dict[uuid.UUID, int]] = {}
+        self._chunk_tokens: Dict[uuid.UUID, Dict[str, int]] = {}
+        self._chunk_lengths: Dict[uuid.UUID, int] = {}
+        self._chunks: Dict[uuid.UUID, DataPoint] = {}
+        self._document_chunks: Dict[str, Set[uuid.UUID]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def add(self, data_points: Iterable[DataPoint]):
+        """
+            Indexes chunks. A chunk whose ID is already indexed is replaced.
+            Args:
+                data_points (Iterable[DataPoint]): The chunks to be indexed. Their vectors are not kept.
+        """
+        for p in data_points:
+            if p.id in self._chunks:
+                self._remove_chunk(p.id)
+            counts: Dict[str, int] = {}
+            for token in tokenize(p.chunk_text):
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                self._postings.setdefault(token, {})[p.id] = count
+            length = sum(counts.values())
+            self._chunk_tokens[p.id] = counts
+            self._chunk_lengths[p.id] = length
+            self._total_length += length
+            self._chunks[p.id] = p.model_copy(update={"vector": None, "score": None})
+            self._document_chunks.setdefault(p.document_name, set()).add(p.id)
+
+    def _remove_chunk(self, chunk_id: uuid.UUID):
+        chunk = self._chunks.pop(chunk_id, None)
+        if chunk is None:
+            return
+        for token in self._chunk_tokens.pop(chunk_id):
+            postings = self._postings[token]
+            del postings[chunk_id]
+            if not postings:
+                del self._postings[token]
+        self._total_length -= self._chunk_lengths.pop(chunk_id)
+        document_chunks = self._document_chunks[chunk.document_name]
+        document_chunks.discard(chunk_id)
+        if not document_chunks:
+            del self._document_chunks[chunk.document_name]
+
+    def remove_chunks(self, chunk_ids: Iterable[uuid.UUID]):
+        """
+            Removes chunks from the index.
+            Args:
+                chunk_ids (Iterable[uuid.UUID]): The IDs of the chunks to remove.
+        """
+        for chunk_id in chunk_ids:
+            self._remove_chunk(chunk_id)
+
+    def remove_document(self, document_name: str):
+        """
+            Removes all chunks of a document from the index.
+            Args:
+                document_name (str): The name of the document.
+        """
+        self.remove_chunks(list(self._document_chunks.get(document_name, ())))
+
+    def update_positions(self, data_points: Iterable[DataPoint]):
+        """
+            Updates the ordinal and section of indexed chunks whose text did not change.
+            Args:
+                data_points (Iterable[DataPoint]): The chunks carrying their new ordinal and section.
+        """
+        for p in data_points:
+            if p.id in self._chunks:
+                self._chunks[p.id] = self._chunks[p.id].model_copy(update={"ordinal": p.ordinal, "section": p.section})
+
+    def clear(self):
+        """
+            Empties the index.
+        """
+        self.__init__(self._k1, self._b)
+
+    def _idf(self, token: str) -> float:
+        document_frequency = len(self._postings.get(token, ()))
+        return math.log(1 + (len(self._chunks) - document_frequency + 0.5) / (document_frequency + 0.5))
+
+    def search(self, query: str, top_k: int = 3) -> List[Tuple[DataPoint, float]]:
+        """
+            Ranks chunks by their BM25 score for a query.
+            Args:
+                query (str): The query text.
+                top_k (int, optional): The number of chunks to return. Defaults to 3.
+            Returns:
+                List[Tuple[DataPoint, float]]: The best chunks, with their BM25 score set, each paired with its
+                                               coverage of the query: the IDF-weighted share of the query terms
+                                               it contains, between 0 and 1.
+        """
+        tokens = set(tokenize(query))
+        if not tokens or not self._chunks:
+            return []
+        average_length = self._total_length / len(self._chunks) or 1.0
+        idfs = {token: self._idf(token) for token in tokens}
+        scores: Dict[uuid.UUID, float] = {}
+        for token, idf in idfs.items():
+            for chunk_id, frequency in self._postings.get(token, {}).items():
+                norm = self._k1 * (1 - self._b + self._b * self._chunk_lengths[chunk_id] / average_length)
+                scores[chunk_id] = scores.get(chunk_id, 0.0) + idf * frequency * (self._k1 + 1) / (frequency + norm)
+        best = heapq.nlargest(top_k, scores.items(), key=lambda item: item[1])
+        total_idf = sum(idfs.values())
+        return [
+            (
+                self._chunks[chunk_id].model_copy(update={"score": score}),
+                sum(idf for token, idf in idfs.items() if token in self._chunk_tokens[chunk_id]) / total_idf,
+            )
+            for chunk_id, score in best
+        ]
+
+    def query_terms(self, query: str) -> int:
+        """
+            Counts the distinct terms of a query that the index would search for.
+            Args:
+                query (str): The query text.
+            Returns:
+                int: The number of distinct tokens after stopword removal.
+        """
+        return len(set(tokenize(query)))
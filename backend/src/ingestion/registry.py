@@ -0,0 +1,129 @@
+from .data_models import DataPoint, DocumentRecord
+from typing import Dict, Iterable, List, Optional
+import json
+import os
+
+
+class DocumentRegistry:
+    """
+        In-process catalog of the indexed documents, maintained by the IndexManager.
+
+        The catalog is loaded once at startup and updated as documents are inserted, updated and
+        removed, so checking whether a document is indexed or listing documents never scans the
+        vector database. It is persisted as a JSON file, and can be rebuilt from the stored chunks.
+    """
+    def __init__(self, path: Optional[str] = None):
+        """
+            Initializes the registry, loading it from its file if it exists.
+            Args:
+                path (Optional[str], optional): The JSON file where the registry is persisted.
+                                                None keeps it in memory only. Defaults to None.
+        """
+        self._path = path
+        self._records: Dict[str, DocumentRecord] = {}
+        self.loaded = False
+        if path is not None and os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                self._records = {r["name"]: DocumentRecord(**r) for r in json.load(f)}
+            self.loaded = True
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._records
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def get(self, name: str) -> Optional[DocumentRecord]:
+        """
+            Returns the record of a document.
+            Args:
+                name (str): The name of the document.
+            Returns:
+                Optional[DocumentRecord]: The record, or None if the document is not indexed.
+        """
+        return self._records.get(name)
+
+    def list(self) -> List[DocumentRecord]:
+        """
+            Returns the records of all indexed documents, sorted by name.
+        """
+        return [self._records[name] for name in sorted(self._records)]
+
+    def put(self, record: DocumentRecord):
+        """
+            Adds or replaces the record of a document.
+            Args:
+                record (DocumentRecord): The record.
+        """
+        self._records[record.name] = record
+        self._save()
+
+    def put_many(self, records: Iterable[DocumentRecord]):
+        """
+            Adds or replaces the records of several documents, saving the registry once.
+            Args:
+                records (Iterable[DocumentRecord]): The records.
+        """
+        for record in records:
+            self._records[record.name] = record
+        self._save()
+
+    def remove(self, name: str):
+        """
+            Removes the record of a document, if present.
+            Args:
+                name (str): The name of the document.
+        """
+        if self._records.pop(name, None) is not None:
+            self._save()
+
+    def remove_many(self, names: Iterable[str]):
+        """
+            Removes the records of several documents, saving the registry once.
+            Args:
+                names (Iterable[str]): The names of the documents.
+        """
+        removed = [name for name in names if self._records.pop(name, None) is not None]
+        if removed:
+            self._save()
+
+    def rebuild(self, data_points: List[DataPoint]):
+        """
+            Replaces the catalog with one derived from the stored chunks. The content hash and ingestion
+            time of a document are taken from its most recently indexed chunks.
+            Args:
+                data_points (List[DataPoint]): All the chunks stored in the vector database.
+        """
+        records: Dict[str, DocumentRecord] = {}
+        for p in data_points:
+            record = records.get(p.document_name)
+            if record is None:
+                records[p.document_name] = DocumentRecord(
+                    name=p.document_name,
+                    document_id=p.document_id,
+                    chunk_count=1,
+                    content_hash=p.content_hash,
+                    ingested_at=p.ingested_at,
+                )
+                continue
+            record.chunk_count += 1
+            if p.ingested_at is not None and (record.ingested_at is None or p.ingested_at > record.ingested_at):
+                record.ingested_at = p.ingested_at
+                record.content_hash = p.content_hash
+        self._records = records
+        self._save()
+
+    def _save(self):
+        """
+            Atomically writes the registry to its file.
+        """
+        if self._path is None:
+            return
+        directory = os.path.dirname(self._path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self._path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump([r.model_dump(mode="json") for r in self.list()], f, indent=2)
+        os.replace(tmp_path, self._path)
+        self.loaded = True
@@ -1,7 +1,149 @@
-from .data_models import DataPoint
+from .data_models import ChunkBatch, DataPoint
 from abc import ABC, abstractmethod
-from qdrant_client import QdrantClient, models
-from typing import List
+from qdrant_client import AsyncQdrantClient, models
+from pydantic import BaseModel
+from typing import Dict, List, Literal, Optional, Tuple
+import numpy as np
+import threading
+import asyncio
+import shutil
+import json
+import uuid
+import os
+
+
+def data_point_to_payload(data_point: DataPoint) -> dict:
+    """
+        Builds the payload stored alongside the vector of a DataPoint.
+        Args:
+            data_point (DataPoint): The data point.
+        Returns:
+            dict: The payload (chunk text, position and document metadata).
+    """
+    return {
+        "chunk_text": data_point.chunk_text,
+        "chunk_hash": data_point.chunk_hash,
+        "ordinal": data_point.ordinal,
+        "section": data_point.section,
+        "document_id": data_point.document_id.hex,
+        "document_name": data_point.document_name,
+        "content_hash": data_point.content_hash,
+        "ingested_at": data_point.ingested_at,
+    }
+
+
+def chunk_batch_to_payloads(batch: ChunkBatch) -> List[dict]:
+    """
+        Builds the payloads stored alongside the vectors of a chunk batch, as `data_point_to_payload` does for one DataPoint.
+        Args:
+            batch (ChunkBatch): The chunk batch.
+        Returns:
+            List[dict]: The payload of each chunk, in batch order.
+    """
+    return [
+        {
+            "chunk_text": batch.chunk_texts[i],
+            "chunk_hash": batch.chunk_hashes[i],
+            "ordinal": batch.ordinals[i],
+            "section": batch.sections[i],
+            "document_id": batch.document_ids[i].hex,
+            "document_name": batch.document_names[i],
+            "content_hash": batch.content_hashes[i],
+            "ingested_at": batch.ingested_ats[i],
+        }
+        for i in range(len(batch))
+    ]
+
+
+def payload_to_data_point(point_id, payload: dict, score: Optional[float] = None, vector: Optional[List[float]] = None) -> DataPoint:
+    """
+        Converts a stored point ID and payload back into a DataPoint (without its vector, unless given).
+        Args:
+            point_id: The ID of the stored point.
+            payload (dict): The stored payload of the point.
+            score (Optional[float], optional): The similarity score of the point, if it was returned by a search.
+            vector (Optional[List[float]], optional): The stored vector of the point, if it was fetched.
+        Returns:
+            DataPoint: The corresponding DataPoint.
+    """
+    return DataPoint(
+        id=uuid.UUID(str(point_id)),
+        document_id=uuid.UUID(payload["document_id"]),
+        document_name=payload["document_name"],
+        chunk_text=payload["chunk_text"],
+        chunk_hash=payload.get("chunk_hash", ""),
+        ordinal=payload.get("ordinal", 0),
+        section=payload.get("section"),
+        content_hash=payload.get("content_hash", ""),
+        ingested_at=payload.get("ingested_at"),
+        score=score,
+        vector=vector,
+    )
+
+
+def merge_neighbors(hits: List[DataPoint], window_points: List[DataPoint], neighbors: int) -> List[DataPoint]:
+    """
+        Assembles each hit and its neighboring chunks into one passage. Hits whose windows overlap
+        in the same document, directly or through other hits, are merged into a single passage,
+        so no chunk is repeated.
+        Args:
+            hits (List[DataPoint]): The retrieved chunks, ordered by similarity.
+            window_points (List[DataPoint]): The chunks within the neighbor windows of the hits.
+            neighbors (int): The number of chunks before and after each hit in its window.
+        Returns:
+            List[DataPoint]: One DataPoint per passage, ordered by the best similarity among its hits.
+                             Each passage keeps the ID, section and score of its best hit, the ordinal of
+                             its first chunk, and the texts of its chunks joined in document order.
+    """
+    by_position = {(p.document_name, p.ordinal): p for p in window_points}
+    for hit in hits:
+        by_position.setdefault((hit.document_name, hit.ordinal), hit)
+
+    passages = []
+    for hit in hits:
+        ordinals = set(range(hit.ordinal - neighbors, hit.ordinal + neighbors + 1))
+        overlapping = [p for p in passages if p["hit"].document_name == hit.document_name and ordinals & p["ordinals"]]
+        if not overlapping:
+            passages.append({"hit": hit, "ordinals": ordinals})
+            continue
+        # a window bridging several passages joins them into one, kept at the rank of the best one
+        first = overlapping[0]
+        first["ordinals"] |= ordinals
+        for passage in overlapping[1:]:
+            first["ordinals"] |= passage["ordinals"]
+            passages.remove(passage)
+
+    merged = []
+    for passage in passages:
+        hit = passage["hit"]
+        chunks = [by_position[(hit.document_name, o)] for o in sorted(passage["ordinals"]) if (hit.document_name, o) in by_position]
+        merged.append(hit.model_copy(update={
+            "chunk_text": "\n\n".join(c.chunk_text for c in chunks),
+            "ordinal": chunks[0].ordinal,
+        }))
+    return merged
+
+
+def reciprocal_rank_fusion(rankings: List[List[DataPoint]], k: int = 60) -> List[DataPoint]:
+    """
+        Fuses several rankings of chunks with reciprocal-rank fusion: each chunk scores the sum of
+        1 / (k + rank) over the rankings it appears in. Scores of different retrievers need not be comparable.
+        Args:
+            rankings (List[List[DataPoint]]): The rankings, each ordered from best to worst.
+            k (int, optional): The rank smoothing constant. Defaults to 60.
+        Returns:
+            List[DataPoint]: The fused ranking, with the fused score set on each chunk.
+    """
+    scores: Dict[uuid.UUID, float] = {}
+    chunks: Dict[uuid.UUID, DataPoint] = {}
+    for ranking in rankings:
+        for rank, chunk in enumerate(ranking, start=1):
+            scores[chunk.id] = scores.get(chunk.id, 0.0) + 1 / (k + rank)
+            chunks.setdefault(chunk.id, chunk)
+    return [
+        chunks[chunk_id].model_copy(update={"score": score})
+        for chunk_id, score in sorted(scores.items(), key=lambda item: item[1], reverse=True)
+    ]
 
 
 class BaseVectorDatabase(ABC):
@@ -22,30 +164,135 @@ class BaseVectorDatabase(ABC):
         """
         pass
 
+    async def insert_batch(self, collection_name: str, batch: ChunkBatch) -> bool:
+        """
+            Inserts an embedded chunk batch into a collection. The default implementation converts
+            it into DataPoints and calls `insert`.
+            Args:
+                collection_name (str): The name of the collection to insert into.
+                batch (ChunkBatch): The chunks, with their vectors.
+            Returns:
+                bool: True if the insertion was successful, False otherwise.
+        """
+        return await self.insert(collection_name, batch.to_data_points(with_vectors=True))
+
     @abstractmethod
-    async def retrieve(self, collection_name: str, query_vector: List[float]) -> List[DataPoint]:
+    async def retrieve(self, collection_name: str, query_vector: List[float], top_k: int = 3, neighbors: int = 0) -> List[DataPoint]:
         """
             Retrieves the most similar data points to a given query vector.
             Args:
                 collection_name (str): The name of the collection to search.
                 query_vector (List[float]): The vector used for similarity search.
+                top_k (int, optional): The number of top results to return. Defaults to 3.
+                neighbors (int, optional): If greater than 0, each hit is expanded with the chunks up to
+                                           this many positions before and after it in its document,
+                                           merged into a single passage. Defaults to 0.
             Returns:
-                List[DataPoint]: A list of retrieved DataPoint objects, ordered by similarity.
+                List[DataPoint]: A list of retrieved DataPoint objects (without vectors), ordered by similarity.
         """
         pass
 
+    async def retrieve_batch(self, collection_name: str, query_vectors: List[List[float]], top_k: int = 3) -> List[List[DataPoint]]:
+        """
+            Retrieves the most similar data points to each of several query vectors. The default
+            implementation searches them one after the other.
+            Args:
+                collection_name (str): The name of the collection to search.
+                query_vectors (List[List[float]]): The vectors used for similarity search.
+                top_k (int, optional): The number of top results to return per query. Defaults to 3.
+            Returns:
+                List[List[DataPoint]]: The retrieved DataPoint objects (without vectors) of each query,
+                                       ordered by similarity, in the order of the input list.
+        """
+        return [await self.retrieve(collection_name, query_vector, top_k=top_k) for query_vector in query_vectors]
+
     @abstractmethod
-    async def remove(self, collection_name, document_name: str):
+    async def fetch_neighbors(self, collection_name: str, hits: List[DataPoint], neighbors: int) -> List[DataPoint]:
+        """
+            Fetches, in one batched lookup, the chunks within `neighbors` positions of each hit in its document.
+            Args:
+                collection_name (str): The name of the collection to query.
+                hits (List[DataPoint]): The retrieved chunks whose neighbors should be fetched.
+                neighbors (int): The number of chunks to fetch before and after each hit.
+            Returns:
+                List[DataPoint]: The chunks within the neighbor windows (hits included), without vectors.
+        """
+        pass
+
+    @abstractmethod
+    async def remove(self, collection_name, document_name: str) -> bool:
         """
             Removes all data points associated with a specific document name from a collection.
             Args:
                 collection_name (str): The name of the collection to update.
                 document_name (str): The name of the document whose points should be removed.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
         """
         pass
 
     @abstractmethod
-    def create_collection(self, collection_name: str, vector_field_dimension: int) -> bool:
+    async def remove_documents(self, collection_name: str, document_ids: List[uuid.UUID]) -> bool:
+        """
+            Removes all data points of several documents from a collection in a single operation.
+            Args:
+                collection_name (str): The name of the collection to update.
+                document_ids (List[uuid.UUID]): The IDs of the documents whose points should be removed.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        pass
+
+    @abstractmethod
+    async def list_chunk_positions(self, collection_name: str, document_name: str) -> Dict[uuid.UUID, Tuple[int, Optional[str]]]:
+        """
+            Lists the IDs of all data points stored for a document, along with their stored position.
+            Args:
+                collection_name (str): The name of the collection to query.
+                document_name (str): The name of the document whose points should be listed.
+            Returns:
+                Dict[uuid.UUID, Tuple[int, Optional[str]]]: The ordinal and section of each of the document's data points, by ID.
+        """
+        pass
+
+    @abstractmethod
+    async def list_data_points(self, collection_name: str, with_vectors: bool = False) -> List[DataPoint]:
+        """
+            Lists every data point stored in a collection (e.g., to rebuild a lexical index or export the index).
+            Args:
+                collection_name (str): The name of the collection to query.
+                with_vectors (bool, optional): Whether the stored vectors are fetched too. Defaults to False.
+            Returns:
+                List[DataPoint]: The stored data points.
+        """
+        pass
+
+    @abstractmethod
+    async def update_chunk_positions(self, collection_name: str, data_points: List[DataPoint]) -> bool:
+        """
+            Updates the stored ordinal and section of existing data points, without touching their vectors.
+            Args:
+                collection_name (str): The name of the collection to update.
+                data_points (List[DataPoint]): The data points carrying their new ordinal and section.
+            Returns:
+                bool: True if the update was successful, False otherwise.
+        """
+        pass
+
+    @abstractmethod
+    async def remove_chunks(self, collection_name: str, chunk_ids: List[uuid.UUID]) -> bool:
+        """
+            Removes data points by ID from a collection.
+            Args:
+                collection_name (str): The name of the collection to update.
+                chunk_ids (List[uuid.UUID]): The IDs of the data points to remove.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        pass
+
+    @abstractmethod
+    async def create_collection(self, collection_name: str, vector_field_dimension: int) -> bool:
         """
             Creates a new collection in the database.
             Args:
@@ -79,7 +326,7 @@ class BaseVectorDatabase(ABC):
         pass
 
     @abstractmethod
-    def collection_exists(self, collection_name: str) -> bool:
+    async def collection_exists(self, collection_name: str) -> bool:
         """
             Checks if a collection with the given name already exists.
             Args:
@@ -89,18 +336,130 @@ class BaseVectorDatabase(ABC):
         """
         pass
 
+    async def ensure_payload_indexes(self, collection_name: str) -> bool:
+        """
+            Creates the payload indexes a collection is missing, e.g., indexes added after it was created.
+            The default implementation does nothing, for databases without payload indexes.
+            Args:
+                collection_name (str): The name of the collection.
+            Returns:
+                bool: True if all payload indexes exist.
+        """
+        return True
+
+    @abstractmethod
+    async def collection_dimension(self, collection_name: str) -> Optional[int]:
+        """
+            Returns the dimensionality of the vectors stored in a collection.
+            Args:
+                collection_name (str): The name of the collection.
+            Returns:
+                Optional[int]: The vector dimension, or None if the collection does not exist.
+        """
+        pass
+
+
+# Payload fields indexed in every Qdrant collection, used by the removal and neighbor lookup filters.
+PAYLOAD_INDEXES = {
+    "document_name": models.PayloadSchemaType.KEYWORD,
+    "document_id": models.PayloadSchemaType.KEYWORD,
+    "ordinal": models.PayloadSchemaType.INTEGER,
+}
+
+
+# Number of points sent per upsert request.
+UPSERT_BATCH_SIZE = 1_000
+
+
+class CollectionProfile(BaseModel):
+    """
+        Storage, indexing and search settings of a Qdrant collection, trading memory for recall.
+        The storage and HNSW settings apply when the collection is created; the search settings
+        apply to every query.
+    """
+    # "scalar" stores int8 copies of the vectors (4x smaller), "binary" stores 1 bit per dimension
+    # (32x smaller, best suited to high-dimensional embeddings), "none" searches the float32 vectors
+    quantization: Literal["none", "scalar", "binary"] = "none"
+    # keep the quantized vectors in RAM
+    quantized_in_ram: bool = True
+    # keep the original vectors on disk (used for rescoring only when quantization is enabled)
+    vectors_on_disk: bool = False
+    # HNSW graph degree and construction beam width. None keeps the Qdrant defaults
+    hnsw_m: Optional[int] = None
+    hnsw_ef_construct: Optional[int] = None
+    # HNSW search beam width. None keeps the Qdrant default
+    hnsw_ef: Optional[int] = None
+    # fetch `top_k * oversampling` candidates with the quantized vectors before rescoring
+    oversampling: Optional[float] = None
+    # re-rank the quantized candidates with the original vectors
+    rescore: bool = True
+
+    def vectors_config(self, dimension: int) -> models.VectorParams:
+        """
+            Builds the vector parameters of a collection of this profile.
+        """
+        return models.VectorParams(size=dimension, distance=models.Distance.COSINE, on_disk=self.vectors_on_disk)
+
+    def hnsw_config(self) -> Optional[models.HnswConfigDiff]:
+        if self.hnsw_m is None and self.hnsw_ef_construct is None:
+            return None
+        return models.HnswConfigDiff(m=self.hnsw_m, ef_construct=self.hnsw_ef_construct)
+
+    def quantization_config(self):
+        if self.quantization == "scalar":
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=self.quantized_in_ram)
+            )
+        if self.quantization == "binary":
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=self.quantized_in_ram))
+        return None
+
+    def search_params(self) -> Optional[models.SearchParams]:
+        """
+            Builds the search parameters of a query on a collection of this profile.
+        """
+        quantization = None
+        if self.quantization != "none":
+            quantization = models.QuantizationSearchParams(rescore=self.rescore, oversampling=self.oversampling)
+        if quantization is None and self.hnsw_ef is None:
+            return None
+        return models.SearchParams(hnsw_ef=self.hnsw_ef, quantization=quantization)
+
+
+# Named collection profiles, selectable from configuration.
+COLLECTION_PROFILES = {
+    # full float32 vectors in RAM, default HNSW
+    "default": CollectionProfile(),
+    # int8 vectors in RAM, originals on disk, rescored from 2x candidates
+    "balanced": CollectionProfile(quantization="scalar", vectors_on_disk=True, oversampling=2.0),
+    # 1-bit vectors in RAM, originals on disk, rescored from 3x candidates
+    "low_memory": CollectionProfile(quantization="binary", vectors_on_disk=True, hnsw_m=16, hnsw_ef_construct=100, oversampling=3.0),
+    # denser graph and wider search beam for the best recall
+    "high_recall": CollectionProfile(hnsw_m=32, hnsw_ef_construct=256, hnsw_ef=128),
+}
+
 
 class QdrantVectorDatabase(BaseVectorDatabase):
     """
-        Concrete implementation of BaseVectorDatabase using the Qdrant vector search engine.
+        Concrete implementation of BaseVectorDatabase using the Qdrant vector search engine,
+        accessed through the asynchronous client (over gRPC by default).
     """
-    def __init__(self, url: str):
+    def __init__(self, url: str, prefer_grpc: bool = True, grpc_port: int = 6334, timeout: int = 30, profile: CollectionProfile = COLLECTION_PROFILES["default"]):
         """
-            Initializes the Qdrant client connection.
+            Initializes the asynchronous Qdrant client. A single client is shared by all requests,
+            so its connections are reused and concurrent searches run in parallel without blocking
+            the event loop.
             Args:
                 url (str): The URL of the Qdrant service (e.g., "http://localhost:6333").
+                prefer_grpc (bool, optional): Whether to talk to Qdrant over gRPC instead of REST. Defaults to True.
+                grpc_port (int, optional): The gRPC port of the Qdrant service. Defaults to 6334.
+                timeout (int, optional): The timeout of each request, in seconds. Defaults to 30.
+                profile (CollectionProfile, optional): The quantization, storage and HNSW settings of created
+                                                       collections and the search settings of queries.
+                                                       Defaults to the 'default' profile.
         """
-        self._client = QdrantClient(url=url)
+        self._client = AsyncQdrantClient(url=url, prefer_grpc=prefer_grpc, grpc_port=grpc_port, timeout=timeout)
+        self._profile = profile
 
     async def _create_qdrant_points(self, data_points: List[DataPoint]) -> List[models.PointStruct]:
         """
@@ -116,12 +475,7 @@ class QdrantVectorDatabase(BaseVectorDatabase):
                 models.PointStruct(
                     id=p.id.hex,
                     vector= p.vector,
-                    payload=
-                    {
-                        "chunk_text": p.chunk_text,
-                        "document_id": p.document_id.hex,
-                        "document_name": p.document_name
-                    },
+                    payload=data_point_to_payload(p),
                 )
             )
         return qdrant_points
@@ -138,65 +492,291 @@ class QdrantVectorDatabase(BaseVectorDatabase):
         """
         qdrant_points = await self._create_qdrant_points(data_points)
         try:
-            self._client.upload_points(
-                collection_name=collection_name,
-                points=qdrant_points,
-                batch_size=10_000,
-                wait=True
-            )
+            # the async client's upload helper blocks, so batches are upserted directly
+            for start in range(0, len(qdrant_points), UPSERT_BATCH_SIZE):
+                await self._client.upsert(
+                    collection_name=collection_name,
+                    points=qdrant_points[start:start + UPSERT_BATCH_SIZE],
+                    wait=True
+                )
         except Exception as e:
             print(f"Error occurred while inserting points into qdrant collection {collection_name}. Exception: {str(e)}")
             return False
         print(f"Successfully uploaded points to Qdrant collection {collection_name}")
         return True
 
+    async def insert_batch(self, collection_name: str, batch: ChunkBatch) -> bool:
+        """
+            Inserts an embedded chunk batch as column-oriented Qdrant batches, without building a
+            PointStruct per chunk. The client's request models take vectors as lists, so only one
+            upsert request worth of vectors is converted at a time.
+            Args:
+                collection_name (str): The name of the collection to insert into.
+                batch (ChunkBatch): The chunks, with their vectors.
+            Returns:
+                bool: True if the insertion was successful, False otherwise.
+        """
+        try:
+            for start in range(0, len(batch), UPSERT_BATCH_SIZE):
+                part = batch.slice(start, start + UPSERT_BATCH_SIZE)
+                await self._client.upsert(
+                    collection_name=collection_name,
+                    points=models.Batch(
+                        ids=[i.hex for i in part.ids],
+                        vectors=part.vectors.tolist(),
+                        payloads=chunk_batch_to_payloads(part),
+                    ),
+                    wait=True
+                )
+        except Exception as e:
+            print(f"Error occurred while inserting points into qdrant collection {collection_name}. Exception: {str(e)}")
+            return False
+        print(f"Successfully uploaded points to Qdrant collection {collection_name}")
+        return True
 
-    async def retrieve(self, collection_name:str, query_vector: List[float], top_k: int = 3) -> List[DataPoint]:
+    async def retrieve(self, collection_name: str, query_vector: List[float], top_k: int = 3, neighbors: int = 0) -> List[DataPoint]:
         """
             Retrieves the top_k most similar data points to a given query vector from Qdrant.
             Args:
                 collection_name (str): The name of the collection to search.
                 query_vector (List[float]): The vector used for similarity search.
                 top_k (int, optional): The number of top results to return. Defaults to 3.
+                neighbors (int, optional): If greater than 0, each hit is expanded with the chunks up to
+                                           this many positions before and after it in its document,
+                                           merged into a single passage. Defaults to 0.
             Returns:
-                List[DataPoint]: A list of retrieved Qdrant points (models.ScoredPoint),
-                                 which would typically need conversion back to DataPoint objects
-                                 for full compliance with the BaseVectorDatabase return type.
+                List[DataPoint]: A list of retrieved DataPoint objects (without vectors), ordered by similarity.
         """
-        results = self._client.query_points(
+        results = (await self._client.query_points(
             collection_name=collection_name,
             query=query_vector,
             with_payload=True,
             limit=top_k,
-        ).points
-        return results
+            search_params=self._profile.search_params(),
+        )).points
+        hits = [payload_to_data_point(r.id, r.payload, r.score) for r in results]
+        if neighbors > 0 and hits:
+            window_points = await self.fetch_neighbors(collection_name, hits, neighbors)
+            return merge_neighbors(hits, window_points, neighbors)
+        return hits
 
+    async def retrieve_batch(self, collection_name: str, query_vectors: List[List[float]], top_k: int = 3) -> List[List[DataPoint]]:
+        """
+            Retrieves the top_k most similar data points to each query vector with a single batch query request.
+            Args:
+                collection_name (str): The name of the collection to search.
+                query_vectors (List[List[float]]): The vectors used for similarity search.
+                top_k (int, optional): The number of top results to return per query. Defaults to 3.
+            Returns:
+                List[List[DataPoint]]: The retrieved DataPoint objects (without vectors) of each query,
+                                       ordered by similarity, in the order of the input list.
+        """
+        if not query_vectors:
+            return []
+        responses = await self._client.query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=query_vector,
+                    with_payload=True,
+                    limit=top_k,
+                    params=self._profile.search_params(),
+                )
+                for query_vector in query_vectors
+            ],
+        )
+        return [[payload_to_data_point(r.id, r.payload, r.score) for r in response.points] for response in responses]
+
+    async def fetch_neighbors(self, collection_name: str, hits: List[DataPoint], neighbors: int) -> List[DataPoint]:
+        """
+            Fetches the chunks within `neighbors` positions of each hit with a single scroll request,
+            filtering on the indexed document name and ordinal payload fields.
+            Args:
+                collection_name (str): The name of the collection to query.
+                hits (List[DataPoint]): The retrieved chunks whose neighbors should be fetched.
+                neighbors (int): The number of chunks to fetch before and after each hit.
+            Returns:
+                List[DataPoint]: The chunks within the neighbor windows (hits included), without vectors.
+        """
+        windows = [
+            models.Filter(
+                must=[
+                    models.FieldCondition(key="document_name", match=models.MatchValue(value=hit.document_name)),
+                    models.FieldCondition(key="ordinal", range=models.Range(gte=hit.ordinal - neighbors, lte=hit.ordinal + neighbors)),
+                ]
+            )
+            for hit in hits
+        ]
+        points, _ = await self._client.scroll(
+            collection_name=collection_name,
+            scroll_filter=models.Filter(should=windows),
+            limit=len(hits) * (2 * neighbors + 1),
+            with_payload=True,
+            with_vectors=False,
+        )
+        return [payload_to_data_point(p.id, p.payload) for p in points]
+
+
+    async def _delete_where(self, collection_name: str, condition: models.FieldCondition) -> bool:
+        """
+            Deletes the points matching a payload condition and waits for the operation to complete.
+            Args:
+                collection_name (str): The name of the collection to update.
+                condition (models.FieldCondition): The condition selecting the points to delete.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        try:
+            result = await self._client.delete(
+                collection_name=collection_name,
+                points_selector=models.FilterSelector(filter=models.Filter(must=[condition])),
+                wait=True,
+            )
+        except Exception as e:
+            print(f"Error occurred while removing points from qdrant collection {collection_name}. Exception: {str(e)}")
+            return False
+        return result.status == models.UpdateStatus.COMPLETED
 
-    async def remove(self, collection_name: str, document_name: str):
+    async def remove(self, collection_name: str, document_name: str) -> bool:
         """
             Removes all data points associated with a specific document name using a filter.
             Args:
                 collection_name (str): The name of the collection to update.
                 document_name (str): The name of the document whose points should be removed.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
         """
-        updated_results = self._client.delete(
-            collection_name=collection_name,
-            points_selector=models.FilterSelector(
-                filter=models.Filter(
+        return await self._delete_where(
+            collection_name, models.FieldCondition(key="document_name", match=models.MatchValue(value=document_name))
+        )
+
+    async def remove_documents(self, collection_name: str, document_ids: List[uuid.UUID]) -> bool:
+        """
+            Removes all data points of several documents with one delete request, filtering on the
+            indexed 'document_id' payload field.
+            Args:
+                collection_name (str): The name of the collection to update.
+                document_ids (List[uuid.UUID]): The IDs of the documents whose points should be removed.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        if not document_ids:
+            return True
+        return await self._delete_where(
+            collection_name, models.FieldCondition(key="document_id", match=models.MatchAny(any=[i.hex for i in document_ids]))
+        )
+
+    async def list_chunk_positions(self, collection_name: str, document_name: str) -> Dict[uuid.UUID, Tuple[int, Optional[str]]]:
+        """
+            Lists the IDs and positions of all points stored for a document, scrolling through the
+            collection without fetching chunk texts or vectors.
+            Args:
+                collection_name (str): The name of the collection to query.
+                document_name (str): The name of the document whose points should be listed.
+            Returns:
+                Dict[uuid.UUID, Tuple[int, Optional[str]]]: The ordinal and section of each of the document's points, by ID.
+        """
+        positions = {}
+        offset = None
+        while True:
+            points, offset = await self._client.scroll(
+                collection_name=collection_name,
+                scroll_filter=models.Filter(
                     must=[
                         models.FieldCondition(
                             key="document_name",
                             match=models.MatchValue(value=document_name),
                         ),
                     ],
+                ),
+                limit=1_000,
+                offset=offset,
+                with_payload=["ordinal", "section"],
+                with_vectors=False,
+            )
+            for p in points:
+                positions[uuid.UUID(str(p.id))] = (p.payload.get("ordinal", 0), p.payload.get("section"))
+            if offset is None:
+                break
+        return positions
+
+    async def list_data_points(self, collection_name: str, with_vectors: bool = False) -> List[DataPoint]:
+        """
+            Scrolls through the whole collection, fetching payloads and, optionally, vectors.
+            Args:
+                collection_name (str): The name of the collection to query.
+                with_vectors (bool, optional): Whether the stored vectors are fetched too. Defaults to False.
+            Returns:
+                List[DataPoint]: The stored data points.
+        """
+        data_points = []
+        offset = None
+        while True:
+            points, offset = await self._client.scroll(
+                collection_name=collection_name,
+                limit=1_000,
+                offset=offset,
+                with_payload=True,
+                with_vectors=with_vectors,
+            )
+            data_points.extend(payload_to_data_point(p.id, p.payload, vector=p.vector if with_vectors else None) for p in points)
+            if offset is None:
+                break
+        return data_points
+
+    async def update_chunk_positions(self, collection_name: str, data_points: List[DataPoint]) -> bool:
+        """
+            Updates the ordinal and section payload of existing points in one batched request.
+            Args:
+                collection_name (str): The name of the collection to update.
+                data_points (List[DataPoint]): The data points carrying their new ordinal and section.
+            Returns:
+                bool: True if the update was successful, False otherwise.
+        """
+        operations = [
+            models.SetPayloadOperation(
+                set_payload=models.SetPayload(
+                    payload={"ordinal": p.ordinal, "section": p.section},
+                    points=[p.id.hex],
                 )
-            ),
-        )
+            )
+            for p in data_points
+        ]
+        try:
+            results = await self._client.batch_update_points(
+                collection_name=collection_name,
+                update_operations=operations,
+                wait=True,
+            )
+        except Exception as e:
+            print(f"Error occurred while updating points in qdrant collection {collection_name}. Exception: {str(e)}")
+            return False
+        return all(r.status == models.UpdateStatus.COMPLETED for r in results)
 
+    async def remove_chunks(self, collection_name: str, chunk_ids: List[uuid.UUID]) -> bool:
+        """
+            Removes points by ID from a Qdrant collection.
+            Args:
+                collection_name (str): The name of the collection to update.
+                chunk_ids (List[uuid.UUID]): The IDs of the points to remove.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        try:
+            result = await self._client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=[i.hex for i in chunk_ids]),
+                wait=True,
+            )
+        except Exception as e:
+            print(f"Error occurred while removing points from qdrant collection {collection_name}. Exception: {str(e)}")
+            return False
+        return result.status == models.UpdateStatus.COMPLETED
 
-    def create_collection(self, collection_name: str, vector_field_dimension: int) -> bool:
+    async def create_collection(self, collection_name: str, vector_field_dimension: int) -> bool:
         """
-            Creates a new Qdrant collection with COSINE distance and indexes the 'document_name' payload field.
+            Creates a new Qdrant collection with COSINE distance, configured by the collection profile
+            (quantization, on-disk vectors and HNSW parameters), and indexes the payload fields in PAYLOAD_INDEXES.
             Args:
                 collection_name (str): The name for the new collection.
                 vector_field_dimension (int): The dimensionality of the vectors in the collection.
@@ -205,27 +785,25 @@ class QdrantVectorDatabase(BaseVectorDatabase):
             Raises:
                 Exception: If collection creation or payload index creation fails.
         """
-        success = self._client.create_collection(
+        success = await self._client.create_collection(
             collection_name=collection_name,
-            vectors_config= models.VectorParams(
-                size=vector_field_dimension,
-                distance=models.Distance.COSINE
-            ),
+            vectors_config=self._profile.vectors_config(vector_field_dimension),
+            hnsw_config=self._profile.hnsw_config(),
+            quantization_config=self._profile.quantization_config(),
         )
         if not success:
             raise Exception("Failed to create collection.")
-        else:
-            operation_result = self._client.create_payload_index(
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            operation_result = await self._client.create_payload_index(
                 collection_name=collection_name,
-                field_name="document_name",
-                field_schema=models.PayloadSchemaType.KEYWORD,
+                field_name=field_name,
+                field_schema=field_schema,
             )
-            if operation_result.status == "completed":
-                print("Collection created successfully")
-            else:
+            if operation_result.status != "completed":
                 # remove collection
-                self._client.delete_collection(collection_name=collection_name)
+                await self._client.delete_collection(collection_name=collection_name)
                 raise Exception("Failed to create collection. Error while creating payload index.")
+        print("Collection created successfully")
         return success
 
 
@@ -239,7 +817,7 @@ class QdrantVectorDatabase(BaseVectorDatabase):
             Raises:
                 Exception: If collection deletion fails.
         """
-        success = self._client.delete_collection(
+        success = await self._client.delete_collection(
             collection_name=collection_name
         )
         if not success:
@@ -257,14 +835,14 @@ class QdrantVectorDatabase(BaseVectorDatabase):
             Returns:
                 List[str]: A list of unique document names (strings).
         """
-        results = self._client.facet(
+        results = (await self._client.facet(
             collection_name=collection_name,
             key="document_name"
-        ).hits
+        )).hits
         unique_documents = [hit.value for hit in results]
         return unique_documents
 
-    def collection_exists(self, collection_name: str) -> bool:
+    async def collection_exists(self, collection_name: str) -> bool:
         """
             Checks if a Qdrant collection with the given name already exists.
             Args:
@@ -272,4 +850,599 @@ class QdrantVectorDatabase(BaseVectorDatabase):
             Returns:
                 bool: True if the collection exists, False otherwise.
         """
-        return self._client.collection_exists(collection_name=collection_name)
+        return await self._client.collection_exists(collection_name=collection_name)
+
+    async def ensure_payload_indexes(self, collection_name: str) -> bool:
+        """
+            Creates the payload indexes in PAYLOAD_INDEXES that an existing collection is missing,
+            such as the 'document_id' index on collections created before it was added.
+            Args:
+                collection_name (str): The name of the collection.
+            Returns:
+                bool: True if all payload indexes exist.
+        """
+        collection = await self._client.get_collection(collection_name=collection_name)
+        indexed_fields = collection.payload_schema or {}
+        success = True
+        for field_name, field_schema in PAYLOAD_INDEXES.items():
+            if field_name in indexed_fields:
+                continue
+            operation_result = await self._client.create_payload_index(
+                collection_name=collection_name,
+                field_name=field_name,
+                field_schema=field_schema,
+                wait=True,
+            )
+            print(f"Created missing payload index '{field_name}' on collection {collection_name}")
+            success = success and operation_result.status == models.UpdateStatus.COMPLETED
+        return success
+
+    async def collection_dimension(self, collection_name: str) -> Optional[int]:
+        """
+            Reads the vector size from the configuration of a Qdrant collection.
+            Args:
+                collection_name (str): The name of the collection.
+            Returns:
+                Optional[int]: The vector dimension, or None if the collection does not exist.
+        """
+        if not await self._client.collection_exists(collection_name=collection_name):
+            return None
+        collection = await self._client.get_collection(collection_name=collection_name)
+        vectors = collection.config.params.vectors
+        return vectors.size
+
+    async def close(self):
+        """
+            Closes the connections of the Qdrant client.
+        """
+        await self._client.close()
+
+
+class _NumpyCollection:
+    """
+        In-memory state of one collection of the NumPy vector database.
+
+        The collection lives in its own directory. Each insert appends a segment: a raw float32
+        matrix of normalized vectors (`<segment>.f32`, memory-mapped when loaded) and the IDs and
+        payloads of its rows (`<segment>.jsonl`). Removed rows are recorded in `tombstones.jsonl`
+        as (segment, row) pairs. `meta.json` lists the live segments and is replaced atomically,
+        so segment files written by an interrupted operation are simply ignored.
+    """
+    def __init__(self, path: str, dimension: int, segment_names: List[str], next_segment: int):
+        self.path = path
+        self.dimension = dimension
+        self.next_segment = next_segment
+        self.segment_names: List[str] = []
+        self.vectors: List[np.ndarray] = []
+        self.alive: List[np.ndarray] = []
+        self.ids: List[List[str]] = []
+        self.payloads: List[List[dict]] = []
+        # point ID -> (segment index, row) of its live row
+        self.rows: Dict[str, Tuple[int, int]] = {}
+        for name in segment_names:
+            self._load_segment(name)
+        self._load_tombstones()
+
+    @classmethod
+    def create(cls, path: str, dimension: int) -> "_NumpyCollection":
+        os.makedirs(path, exist_ok=True)
+        collection = cls(path, dimension, [], 0)
+        collection.write_meta()
+        return collection
+
+    @classmethod
+    def open(cls, path: str) -> "_NumpyCollection":
+        with open(os.path.join(path, "meta.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        return cls(path, meta["dimension"], meta["segments"], meta["next_segment"])
+
+    def write_meta(self):
+        tmp_path = os.path.join(self.path, "meta.json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"dimension": self.dimension, "segments": self.segment_names, "next_segment": self.next_segment}, f)
+        os.replace(tmp_path, os.path.join(self.path, "meta.json"))
+
+    def _load_segment(self, name: str):
+        with open(os.path.join(self.path, f"{name}.jsonl"), "r", encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        if records:
+            vectors = np.memmap(os.path.join(self.path, f"{name}.f32"), dtype=np.float32, mode="r", shape=(len(records), self.dimension))
+        else:
+            vectors = np.empty((0, self.dimension), dtype=np.float32)
+        segment = len(self.segment_names)
+        self.segment_names.append(name)
+        self.vectors.append(vectors)
+        self.alive.append(np.ones(len(records), dtype=bool))
+        self.ids.append([r["id"] for r in records])
+        self.payloads.append([r["payload"] for r in records])
+        for row, r in enumerate(records):
+            # a later segment holds the newer version of a re-inserted point
+            if r["id"] in self.rows:
+                self._kill(*self.rows[r["id"]])
+            self.rows[r["id"]] = (segment, row)
+
+    def _load_tombstones(self):
+        path = os.path.join(self.path, "tombstones.jsonl")
+        if not os.path.exists(path):
+            return
+        segments = {name: i for i, name in enumerate(self.segment_names)}
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                name, row = json.loads(line)
+                # tombstones of compacted segments are stale
+                if name in segments:
+                    self._kill(segments[name], row)
+
+    def _kill(self, segment: int, row: int):
+        self.alive[segment][row] = False
+        point_id = self.ids[segment][row]
+        if self.rows.get(point_id) == (segment, row):
+            del self.rows[point_id]
+
+    def _write_segment(self, ids: List[str], vectors: np.ndarray, payloads: List[dict]) -> str:
+        name = f"segment-{self.next_segment:06d}"
+        self.next_segment += 1
+        vectors.astype(np.float32).tofile(os.path.join(self.path, f"{name}.f32"))
+        with open(os.path.join(self.path, f"{name}.jsonl"), "w", encoding="utf-8") as f:
+            for point_id, payload in zip(ids, payloads):
+                f.write(json.dumps({"id": point_id, "payload": payload}) + "\n")
+        return name
+
+    def append(self, ids: List[str], vectors: np.ndarray, payloads: List[dict]):
+        """
+            Writes a new segment and makes it live. Older rows of re-inserted IDs are superseded
+            by the new segment, which is also how they are resolved when the collection is loaded.
+        """
+        name = self._write_segment(ids, vectors, payloads)
+        self._load_segment(name)
+        self.write_meta()
+
+    def kill(self, rows: List[Tuple[int, int]]):
+        """
+            Tombstones rows, persisting the tombstones before applying them.
+        """
+        if not rows:
+            return
+        with open(os.path.join(self.path, "tombstones.jsonl"), "a", encoding="utf-8") as f:
+            for segment, row in rows:
+                f.write(json.dumps([self.segment_names[segment], row]) + "\n")
+        for segment, row in rows:
+            self._kill(segment, row)
+
+    def rewrite_payloads(self, segments: List[int]):
+        """
+            Atomically rewrites the payload files of segments whose payloads were updated in place.
+        """
+        for segment in segments:
+            path = os.path.join(self.path, f"{self.segment_names[segment]}.jsonl")
+            with open(f"{path}.tmp", "w", encoding="utf-8") as f:
+                for point_id, payload in zip(self.ids[segment], self.payloads[segment]):
+                    f.write(json.dumps({"id": point_id, "payload": payload}) + "\n")
+            os.replace(f"{path}.tmp", path)
+
+    def dead_rows(self) -> int:
+        return sum(int((~alive).sum()) for alive in self.alive)
+
+    def total_rows(self) -> int:
+        return sum(len(alive) for alive in self.alive)
+
+    def compact(self):
+        """
+            Rewrites all live rows into a single segment and drops the old segments and tombstones.
+        """
+        ids = [i for segment, alive in enumerate(self.alive) for i, a in zip(self.ids[segment], alive) if a]
+        payloads = [p for segment, alive in enumerate(self.alive) for p, a in zip(self.payloads[segment], alive) if a]
+        vectors = (
+            np.concatenate([v[alive] for v, alive in zip(self.vectors, self.alive)])
+            if self.vectors else np.empty((0, self.dimension), dtype=np.float32)
+        )
+        old_names = self.segment_names
+        name = self._write_segment(ids, vectors, payloads)
+        self.segment_names = [name]
+        self.write_meta()
+        # the old segments are no longer referenced by meta.json
+        open(os.path.join(self.path, "tombstones.jsonl"), "w").close()
+        self.vectors, self.alive, self.ids, self.payloads, self.rows = [], [], [], [], {}
+        self.segment_names = []
+        self._load_segment(name)
+        for old_name in old_names:
+            for extension in (".f32", ".jsonl"):
+                try:
+                    os.remove(os.path.join(self.path, old_name + extension))
+                except FileNotFoundError:
+                    pass
+
+    def live_rows(self):
+        """
+            Iterates over the (segment, row) pairs of all live rows.
+        """
+        for point_id, (segment, row) in self.rows.items():
+            yield segment, row
+
+    def search(self, queries: np.ndarray, top_k: int) -> List[List[Tuple[float, int, int]]]:
+        """
+            Exact cosine top-k of a batch of normalized queries: one matrix product per segment over normalized vectors.
+        """
+        candidates = [[] for _ in range(len(queries))]
+        for segment, (vectors, alive) in enumerate(zip(self.vectors, self.alive)):
+            if not alive.any():
+                continue
+            # one column of scores per query
+            scores = vectors @ queries.T
+            scores[~alive] = -np.inf
+            k = min(top_k, int(alive.sum()))
+            top = np.argpartition(-scores, k - 1, axis=0)[:k]
+            for q in range(len(queries)):
+                candidates[q].extend((float(scores[row, q]), segment, int(row)) for row in top[:, q])
+        for c in candidates:
+            c.sort(key=lambda c: -c[0])
+        return [c[:top_k] for c in candidates]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    return vectors / np.clip(np.linalg.norm(vectors, axis=-1, keepdims=True), 1e-12, None)
+
+
+class NumpyVectorDatabase(BaseVectorDatabase):
+    """
+        Concrete implementation of BaseVectorDatabase stored in-process with NumPy, for corpora small
+        enough that an exact search is faster than a network hop to a vector search engine.
+
+        Vectors are normalized and stored as float32 in append-only, memory-mapped segments, so a
+        cosine top-k is one vectorized matrix product per segment. Removed points are tombstoned and
+        the collection is compacted into a single segment once tombstones exceed `compaction_ratio`
+        of its rows, or once it has more than `max_segments` segments.
+        Operations run in a worker thread under a lock, off the event loop.
+    """
+    def __init__(self, path: str, compaction_ratio: float = 0.2, max_segments: int = 8):
+        """
+            Opens (or creates) the database directory and loads its collections.
+            Args:
+                path (str): The directory where the collections are stored.
+                compaction_ratio (float, optional): The fraction of removed rows that triggers a compaction. Defaults to 0.2.
+                max_segments (int, optional): The number of segments that triggers a compaction. Defaults to 8.
+        """
+        self._path = path
+        self._compaction_ratio = compaction_ratio
+        self._max_segments = max_segments
+        self._lock = threading.Lock()
+        os.makedirs(path, exist_ok=True)
+        self._collections: Dict[str, _NumpyCollection] = {
+            entry.name: _NumpyCollection.open(entry.path)
+            for entry in os.scandir(path)
+            if entry.is_dir() and os.path.exists(os.path.join(entry.path, "meta.json"))
+        }
+
+    async def _run(self, function, *args):
+        """
+            Runs a function in a worker thread while holding the database lock.
+        """
+        def locked():
+            with self._lock:
+                return function(*args)
+        return await asyncio.to_thread(locked)
+
+    def _maybe_compact(self, collection: _NumpyCollection):
+        total = collection.total_rows()
+        if len(collection.segment_names) > self._max_segments or (total and collection.dead_rows() / total > self._compaction_ratio):
+            collection.compact()
+
+    async def insert(self, collection_name: str, data_points: List[DataPoint]) -> bool:
+        """
+            Appends data points as a new segment. Points whose ID is already stored are replaced.
+            Args:
+                collection_name (str): The name of the collection to insert into.
+                data_points (List[DataPoint]): A list of DataPoint objects to insert.
+            Returns:
+                bool: True if the insertion was successful, False otherwise.
+        """
+        def insert():
+            collection = self._collections[collection_name]
+            vectors = np.asarray([p.vector for p in data_points], dtype=np.float32).reshape(len(data_points), collection.dimension)
+            collection.append([p.id.hex for p in data_points], _normalize(vectors), [data_point_to_payload(p) for p in data_points])
+            self._maybe_compact(collection)
+
+        return await self._insert(collection_name, insert, len(data_points))
+
+    async def insert_batch(self, collection_name: str, batch: ChunkBatch) -> bool:
+        """
+            Appends an embedded chunk batch as a new segment, writing its vector matrix directly.
+            Args:
+                collection_name (str): The name of the collection to insert into.
+                batch (ChunkBatch): The chunks, with their vectors.
+            Returns:
+                bool: True if the insertion was successful, False otherwise.
+        """
+        def insert():
+            collection = self._collections[collection_name]
+            collection.append([i.hex for i in batch.ids], _normalize(batch.vectors), chunk_batch_to_payloads(batch))
+            self._maybe_compact(collection)
+
+        return await self._insert(collection_name, insert, len(batch))
+
+    async def _insert(self, collection_name: str, insert, count: int) -> bool:
+        """
+            Runs an insertion under the lock, reporting failures instead of raising them.
+        """
+        if count == 0:
+            return True
+        try:
+            await self._run(insert)
+        except Exception as e:
+            print(f"Error occurred while inserting points into collection {collection_name}. Exception: {str(e)}")
+            return False
+        return True
+
+    async def retrieve(self, collection_name: str, query_vector: List[float], top_k: int = 3, neighbors: int = 0) -> List[DataPoint]:
+        """
+            Retrieves the top_k most similar data points with an exact cosine search.
+            Args:
+                collection_name (str): The name of the collection to search.
+                query_vector (List[float]): The vector used for similarity search.
+                top_k (int, optional): The number of top results to return. Defaults to 3.
+                neighbors (int, optional): If greater than 0, each hit is expanded with the chunks up to
+                                           this many positions before and after it in its document,
+                                           merged into a single passage. Defaults to 0.
+            Returns:
+                List[DataPoint]: A list of retrieved DataPoint objects (without vectors), ordered by similarity.
+        """
+        hits = (await self.retrieve_batch(collection_name, [query_vector], top_k=top_k))[0]
+        if neighbors > 0 and hits:
+            window_points = await self.fetch_neighbors(collection_name, hits, neighbors)
+            return merge_neighbors(hits, window_points, neighbors)
+        return hits
+
+    async def retrieve_batch(self, collection_name: str, query_vectors: List[List[float]], top_k: int = 3) -> List[List[DataPoint]]:
+        """
+            Retrieves the top_k most similar data points to each query vector, scoring all queries in one matrix product per segment.
+            Args:
+                collection_name (str): The name of the collection to search.
+                query_vectors (List[List[float]]): The vectors used for similarity search.
+                top_k (int, optional): The number of top results to return per query. Defaults to 3.
+            Returns:
+                List[List[DataPoint]]: The retrieved DataPoint objects (without vectors) of each query,
+                                       ordered by similarity, in the order of the input list.
+        """
+        if not query_vectors:
+            return []
+
+        def search():
+            collection = self._collections[collection_name]
+            queries = _normalize(np.asarray(query_vectors, dtype=np.float32))
+            return [
+                [
+                    payload_to_data_point(collection.ids[segment][row], collection.payloads[segment][row], score)
+                    for score, segment, row in results
+                ]
+                for results in collection.search(queries, top_k)
+            ]
+
+        return await self._run(search)
+
+    async def fetch_neighbors(self, collection_name: str, hits: List[DataPoint], neighbors: int) -> List[DataPoint]:
+        """
+            Fetches the chunks within `neighbors` positions of each hit in a single pass over the payloads.
+            Args:
+                collection_name (str): The name of the collection to query.
+                hits (List[DataPoint]): The retrieved chunks whose neighbors should be fetched.
+                neighbors (int): The number of chunks to fetch before and after each hit.
+            Returns:
+                List[DataPoint]: The chunks within the neighbor windows (hits included), without vectors.
+        """
+        windows = {}
+        for hit in hits:
+            windows.setdefault(hit.document_name, []).append((hit.ordinal - neighbors, hit.ordinal + neighbors))
+
+        def fetch():
+            collection = self._collections[collection_name]
+            points = []
+            for segment, row in collection.live_rows():
+                payload = collection.payloads[segment][row]
+                ordinal = payload.get("ordinal", 0)
+                if any(low <= ordinal <= high for low, high in windows.get(payload["document_name"], [])):
+                    points.append(payload_to_data_point(collection.ids[segment][row], payload))
+            return points
+
+        return await self._run(fetch)
+
+    async def _remove_where(self, collection_name: str, predicate) -> bool:
+        """
+            Tombstones the live rows whose (ID, payload) match a predicate, then compacts if needed.
+        """
+        def remove():
+            collection = self._collections[collection_name]
+            rows = [
+                (segment, row) for segment, row in collection.live_rows()
+                if predicate(collection.ids[segment][row], collection.payloads[segment][row])
+            ]
+            collection.kill(rows)
+            self._maybe_compact(collection)
+
+        try:
+            await self._run(remove)
+        except Exception as e:
+            print(f"Error occurred while removing points from collection {collection_name}. Exception: {str(e)}")
+            return False
+        return True
+
+    async def remove(self, collection_name: str, document_name: str) -> bool:
+        """
+            Removes all data points associated with a specific document name.
+            Args:
+                collection_name (str): The name of the collection to update.
+                document_name (str): The name of the document whose points should be removed.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        return await self._remove_where(collection_name, lambda _, payload: payload["document_name"] == document_name)
+
+    async def remove_documents(self, collection_name: str, document_ids: List[uuid.UUID]) -> bool:
+        """
+            Removes all data points of several documents in a single pass over the collection.
+            Args:
+                collection_name (str): The name of the collection to update.
+                document_ids (List[uuid.UUID]): The IDs of the documents whose points should be removed.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        ids = {i.hex for i in document_ids}
+        return await self._remove_where(collection_name, lambda _, payload: payload["document_id"] in ids)
+
+    async def list_chunk_positions(self, collection_name: str, document_name: str) -> Dict[uuid.UUID, Tuple[int, Optional[str]]]:
+        """
+            Lists the IDs and positions of all points stored for a document.
+            Args:
+                collection_name (str): The name of the collection to query.
+                document_name (str): The name of the document whose points should be listed.
+            Returns:
+                Dict[uuid.UUID, Tuple[int, Optional[str]]]: The ordinal and section of each of the document's points, by ID.
+        """
+        def positions():
+            collection = self._collections[collection_name]
+            return {
+                uuid.UUID(collection.ids[segment][row]): (payload.get("ordinal", 0), payload.get("section"))
+                for segment, row in collection.live_rows()
+                if (payload := collection.payloads[segment][row])["document_name"] == document_name
+            }
+
+        return await self._run(positions)
+
+    async def list_data_points(self, collection_name: str, with_vectors: bool = False) -> List[DataPoint]:
+        """
+            Lists every live data point of a collection.
+            Args:
+                collection_name (str): The name of the collection to query.
+                with_vectors (bool, optional): Whether the stored (normalized) vectors are returned too. Defaults to False.
+            Returns:
+                List[DataPoint]: The stored data points.
+        """
+        def data_points():
+            collection = self._collections[collection_name]
+            return [
+                payload_to_data_point(
+                    collection.ids[segment][row],
+                    collection.payloads[segment][row],
+                    vector=collection.vectors[segment][row].tolist() if with_vectors else None,
+                )
+                for segment, row in collection.live_rows()
+            ]
+
+        return await self._run(data_points)
+
+    async def update_chunk_positions(self, collection_name: str, data_points: List[DataPoint]) -> bool:
+        """
+            Updates the ordinal and section payload of existing points, rewriting the payload files
+            of the affected segments.
+            Args:
+                collection_name (str): The name of the collection to update.
+                data_points (List[DataPoint]): The data points carrying their new ordinal and section.
+            Returns:
+                bool: True if the update was successful, False otherwise.
+        """
+        def update():
+            collection = self._collections[collection_name]
+            segments = set()
+            for p in data_points:
+                location = collection.rows.get(p.id.hex)
+                if location is None:
+                    continue
+                segment, row = location
+                collection.payloads[segment][row].update({"ordinal": p.ordinal, "section": p.section})
+                segments.add(segment)
+            collection.rewrite_payloads(sorted(segments))
+
+        try:
+            await self._run(update)
+        except Exception as e:
+            print(f"Error occurred while updating points in collection {collection_name}. Exception: {str(e)}")
+            return False
+        return True
+
+    async def remove_chunks(self, collection_name: str, chunk_ids: List[uuid.UUID]) -> bool:
+        """
+            Removes points by ID.
+            Args:
+                collection_name (str): The name of the collection to update.
+                chunk_ids (List[uuid.UUID]): The IDs of the points to remove.
+            Returns:
+                bool: True if the removal was successful, False otherwise.
+        """
+        ids = {i.hex for i in chunk_ids}
+        return await self._remove_where(collection_name, lambda point_id, _: point_id in ids)
+
+    async def create_collection(self, collection_name: str, vector_field_dimension: int) -> bool:
+        """
+            Creates a new, empty collection directory.
+            Args:
+                collection_name (str): The name for the new collection.
+                vector_field_dimension (int): The dimensionality of the vectors in the collection.
+            Returns:
+                bool: True if the collection was successfully created.
+            Raises:
+                Exception: If the collection already exists.
+        """
+        def create():
+            if collection_name in self._collections:
+                raise Exception("Failed to create collection. Collection already exists.")
+            self._collections[collection_name] = _NumpyCollection.create(os.path.join(self._path, collection_name), vector_field_dimension)
+
+        await self._run(create)
+        print("Collection created successfully")
+        return True
+
+    async def delete_collection(self, collection_name: str) -> bool:
+        """
+            Deletes an entire collection and its files.
+            Args:
+                collection_name (str): The name of the collection to delete.
+            Returns:
+                bool: True if the collection was successfully deleted.
+        """
+        def delete():
+            collection = self._collections.pop(collection_name)
+            shutil.rmtree(collection.path)
+
+        await self._run(delete)
+        print("Collection deleted successfully.")
+        return True
+
+    async def list_unique_documents(self, collection_name: str) -> List[str]:
+        """
+            Retrieves a list of all unique document names present in the collection.
+            Args:
+                collection_name (str): The name of the collection to query.
+            Returns:
+                List[str]: A list of unique document names (strings).
+        """
+        def documents():
+            collection = self._collections[collection_name]
+            return sorted({collection.payloads[segment][row]["document_name"] for segment, row in collection.live_rows()})
+
+        return await self._run(documents)
+
+    async def collection_exists(self, collection_name: str) -> bool:
+        """
+            Checks if a collection with the given name already exists.
+            Args:
+                collection_name (str): The name of the collection to check.
+            Returns:
+                bool: True if the collection exists, False otherwise.
+        """
+        return collection_name in self._collections
+
+    async def collection_dimension(self, collection_name: str) -> Optional[int]:
+        """
+            Returns the dimensionality of the vectors stored in a collection.
+            Args:
+                collection_name (str): The name of the collection.
+            Returns:
+                Optional[int]: The vector dimension, or None if the collection does not exist.
+        """
+        collection = self._collections.get(collection_name)
+        return collection.dimension if collection is not None else None
+
+    async def close(self):
+        """
+            Nothing to release: every write is persisted when it happens.
+        """
+        pass
@@ -1,5 +1,8 @@
 from abc import ABC, abstractmethod
-from openai import OpenAI
+from openai import AsyncOpenAI
+from typing import AsyncIterator, Dict
+import hashlib
+import asyncio
 import os
 
 
@@ -21,26 +24,79 @@ class BaseLlm(ABC):
         """
         pass
 
+    async def stream(self, msg: str, model: str) -> AsyncIterator[str]:
+        """
+            Asynchronously generates a text completion, yielding the text as it is produced.
+            The default implementation yields the whole completion at once.
+            Args:
+                msg (str): The input prompt or message (including context) to send to the model.
+                model (str): The name or identifier of the specific LLM to use for generation.
+            Yields:
+                str: The next piece (delta) of the generated text.
+        """
+        yield await self.complete(msg=msg, model=model)
+
 
 class OpenAiLlm(BaseLlm):
     """
         Concrete implementation of BaseLlm using the OpenAI API for text completion.
         This implementation relies on the 'openai' package and requires the
         OPENAI_API_KEY environment variable to be set for authentication.
+
+        Requests go through the asynchronous client, so a generation never blocks the event loop,
+        and at most `max_in_flight` requests run at a time. Identical prompts (same model and prompt,
+        up to whitespace) that are requested while one is already in flight share its upstream call
+        and its result, so a burst of students asking the same question costs a single completion.
     """
-    def __init__(self):
+    def __init__(self, max_in_flight: int = 8, timeout: float = 120.0, max_retries: int = 2):
         """
-            Initializes the OpenAI client and checks for the necessary API key.
+            Initializes the asynchronous OpenAI client and checks for the necessary API key.
+            Args:
+                max_in_flight (int, optional): The maximum number of concurrent requests. Defaults to 8.
+                timeout (float, optional): The timeout of a single request, in seconds. Defaults to 120.
+                max_retries (int, optional): The number of retries of a failed request. Defaults to 2.
             Raises:
                 EnvironmentError: If the 'OPENAI_API_KEY' environment variable is not set.
         """
         if os.environ.get("OPENAI_API_KEY") is None:
             raise EnvironmentError("OpenAI API key not set")
-        print(f'api key: {os.environ.get("OPENAI_API_KEY")}')
-        self._client = OpenAI()
+        self._client = AsyncOpenAI(timeout=timeout, max_retries=max_retries)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        # prompt key -> the shared upstream call
+        self._pending: Dict[str, asyncio.Task] = {}
+        self.requests = 0
+        self.coalesced = 0
+
+    @staticmethod
+    def _prompt_key(msg: str, model: str) -> str:
+        """
+            Builds the key under which identical in-flight prompts are coalesced.
+            Args:
+                msg (str): The prompt.
+                model (str): The name of the model.
+            Returns:
+                str: A hex SHA-256 digest of the model and the whitespace-normalized prompt.
+        """
+        digest = hashlib.sha256()
+        digest.update(model.encode("utf-8"))
+        digest.update(b"\0")
+        digest.update(" ".join(msg.split()).encode("utf-8"))
+        return digest.hexdigest()
+
+    async def _complete(self, msg: str, model: str) -> str:
+        async with self._in_flight:
+            result = await self._client.responses.create(
+                model=model,
+                input=msg,
+                reasoning={"effort": "low"},
+                text={"verbosity": "low"},
+            )
+        return result.output_text
+
     async def complete(self, msg: str, model: str = "gpt-5-mini") -> str:
         """
-            Generates a text completion using the specified OpenAI model.
+            Generates a text completion using the specified OpenAI model. If the same prompt is already
+            being completed, waits for that call instead of sending another one.
             Args:
                 msg (str): The full input prompt to send to the model.
                 model (str, optional): The name of the OpenAI model to use. Defaults to "gpt-5-mini".
@@ -48,10 +104,48 @@ class OpenAiLlm(BaseLlm):
                 str: The generated text output, specifically the `output_text` attribute
                      of the result object.
         """
-        result = self._client.responses.create(
-            model=model,
-            input=msg,
-            reasoning={"effort": "low"},
-            text={"verbosity": "low"},
-        )
-        return result.output_text
+        key = self._prompt_key(msg, model)
+        task = self._pending.get(key)
+        if task is None:
+            self.requests += 1
+            task = asyncio.ensure_future(self._complete(msg, model))
+            self._pending[key] = task
+            task.add_done_callback(lambda _: self._pending.pop(key, None))
+        else:
+            self.coalesced += 1
+        # a caller that gives up must not cancel the call other callers are waiting on
+        return await asyncio.shield(task)
+
+    async def stream(self, msg: str, model: str = "gpt-5-mini") -> AsyncIterator[str]:
+        """
+            Generates a text completion with a streamed OpenAI response, yielding the output text deltas
+            as they arrive. Streams hold one of the `max_in_flight` slots until they end. Closing the
+            generator (e.g., when the client disconnects) closes the upstream stream.
+            Args:
+                msg (str): The full input prompt to send to the model.
+                model (str, optional): The name of the OpenAI model to use. Defaults to "gpt-5-mini".
+            Yields:
+                str: The next piece (delta) of the generated text.
+        """
+        async with self._in_flight:
+            self.requests += 1
+            events = await self._client.responses.create(
+                model=model,
+                input=msg,
+                reasoning={"effort": "low"},
+                text={"verbosity": "low"},
+                stream=True,
+            )
+            async with events:
+                async for event in events:
+                    if event.type == "response.output_text.delta":
+                        yield event.delta
+
+    def stats(self) -> Dict[str, int]:
+        """
+            Returns the request counters.
+            Returns:
+                Dict[str, int]: The upstream requests sent, the completions served by an in-flight call,
+                                and the number of calls currently in flight.
+        """
+        return {"requests": self.requests, "coalesced": self.coalesced, "in_flight": len(self._pending)}
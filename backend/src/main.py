@@ -1,33 +1,187 @@
-from fastapi import FastAPI, File, UploadFile
+from fastapi import FastAPI, File, Request, UploadFile
+from fastapi.responses import StreamingResponse
 from fastapi.middleware.cors import CORSMiddleware
+from contextlib import asynccontextmanager
+import asyncio
 import shutil
+import json
 import os
-import uuid
 from typing import List, Dict
 from .ingestion.chunking import MarkdownChunker
-from .ingestion.extraction import DoclingExtractor
+from .ingestion.extraction import ProcessPoolExtractor, CachedExtractor
+from .ingestion.cache import AnswerCache, EmbeddingCache, MarkdownCache
 from .ingestion.ingest import IndexManager
-from .ingestion.embeddings import OpenAiEmbedder
-from .ingestion.vector_db import QdrantVectorDatabase
+from .ingestion.lexical_index import BM25Index
+from .ingestion.registry import DocumentRegistry
+from .ingestion.data_models import document_id_from_name
+from .ingestion.embeddings import CachedEmbedder, OnnxEmbedder, OpenAiEmbedder, SentenceTransformerEmbedder
+from .ingestion.vector_db import COLLECTION_PROFILES, NumpyVectorDatabase, QdrantVectorDatabase
+from .prompt import PromptBuilder
 from .llm import OpenAiLlm
 from .chatbot import ChatBot
 
 
 local_filepaths = "./saved_files"
+index_bundle_path = os.environ.get("INDEX_BUNDLE_PATH", "./index_bundle")
 collection_name = "grad_documents"
 
 # Initialization of Ingestion and ChatBot components
-extractor = DoclingExtractor()
-chunker = MarkdownChunker()
-embedder = OpenAiEmbedder()
-# The Qdrant URL is read from an environment variable
-vector_db = QdrantVectorDatabase(url=os.environ["QDRANT_URL"])
-llm = OpenAiLlm()
-index_manager = IndexManager(extractor=extractor, chunker=chunker, embedder=embedder, vector_db=vector_db, collection_name=collection_name)
-chat_bot = ChatBot(embedder=embedder, vector_db=vector_db, llm=llm, collection_name=collection_name)
+# Docling conversions run in a pool of worker processes, off the event loop
+pooled_extractor = ProcessPoolExtractor(
+    num_workers=int(os.environ.get("EXTRACTION_WORKERS", "2")),
+    job_timeout=float(os.environ.get("EXTRACTION_TIMEOUT", "600")),
+    # born-digital pages are read from their text layer; OCR only runs on scanned pages
+    extractor_kwargs={"fast": os.environ.get("EXTRACTION_FAST_MODE", "1") == "1"},
+)
+# Extracted Markdown is cached on disk, keyed by the PDF bytes and the docling version/options
+markdown_cache = MarkdownCache(
+    cache_dir=os.environ.get("EXTRACTION_CACHE_DIR", "./extraction_cache"),
+    max_size_bytes=int(os.environ.get("EXTRACTION_CACHE_MAX_MB", "512")) * 1024 * 1024,
+)
+extractor = CachedExtractor(extractor=pooled_extractor, cache=markdown_cache)
+# chunking runs off the event loop: in a worker thread, or in a process pool with CHUNKING_WORKERS > 0
+chunker = MarkdownChunker(
+    recursive_size=int(os.environ.get("CHUNK_SIZE", "2048")),
+    num_workers=int(os.environ.get("CHUNKING_WORKERS", "0")),
+)
+# Embeddings of queries and chunks are cached in memory and on disk, shared by ingestion and chat
+embedding_cache = EmbeddingCache(
+    cache_dir=os.environ.get("EMBEDDING_CACHE_DIR", "./embedding_cache"),
+    max_memory_entries=int(os.environ.get("EMBEDDING_CACHE_MEMORY_ENTRIES", "10000")),
+    max_disk_entries=int(os.environ.get("EMBEDDING_CACHE_DISK_ENTRIES", "100000")),
+)
+# EMBEDDING_BACKEND selects OpenAI or a self-hosted model; EMBEDDING_DIMENSIONS shortens the vectors,
+# and the collection is created (or validated) with the resulting dimension
+embedding_backend = os.environ.get("EMBEDDING_BACKEND", "openai")
+embedding_dimensions = int(os.environ["EMBEDDING_DIMENSIONS"]) if os.environ.get("EMBEDDING_DIMENSIONS") else None
+if embedding_backend == "onnx":
+    base_embedder = OnnxEmbedder(
+        model_name=os.environ.get("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+        export_dir=os.environ.get("ONNX_EXPORT_DIR", "./onnx_models"),
+        quantize=os.environ.get("ONNX_QUANTIZE", "1") == "1",
+        dimensions=embedding_dimensions,
+        num_threads=int(os.environ.get("ONNX_THREADS", "0")),
+    )
+elif embedding_backend == "sentence-transformers":
+    base_embedder = SentenceTransformerEmbedder(
+        model_name=os.environ.get("EMBEDDING_MODEL", "sentence-transformers/all-MiniLM-L6-v2"),
+        dimensions=embedding_dimensions,
+    )
+else:
+    base_embedder = OpenAiEmbedder(
+        model_name=os.environ.get("EMBEDDING_MODEL", "text-embedding-3-small"),
+        dimensions=embedding_dimensions,
+        max_in_flight=int(os.environ.get("EMBEDDING_MAX_IN_FLIGHT", "4")),
+    )
+embedder = CachedEmbedder(embedder=base_embedder, cache=embedding_cache)
+# one frequent question per line, embedded at startup
+frequent_questions_path = os.environ.get("FREQUENT_QUESTIONS_PATH", os.path.join(os.path.dirname(__file__), "frequent_questions.txt"))
+# VECTOR_DB_BACKEND=numpy keeps small corpora in-process, in memory-mapped files under VECTOR_DB_PATH
+if os.environ.get("VECTOR_DB_BACKEND", "qdrant") == "numpy":
+    vector_db = NumpyVectorDatabase(path=os.environ.get("VECTOR_DB_PATH", "./vector_db"))
+else:
+    # QDRANT_COLLECTION_PROFILE trades memory for recall (default, balanced, low_memory, high_recall);
+    # the search settings of the profile can be overridden without re-creating the collection
+    collection_profile = COLLECTION_PROFILES[os.environ.get("QDRANT_COLLECTION_PROFILE", "default")]
+    profile_overrides = {}
+    if os.environ.get("QDRANT_OVERSAMPLING"):
+        profile_overrides["oversampling"] = float(os.environ["QDRANT_OVERSAMPLING"])
+    if os.environ.get("QDRANT_RESCORE"):
+        profile_overrides["rescore"] = os.environ["QDRANT_RESCORE"] == "1"
+    collection_profile = collection_profile.model_copy(update=profile_overrides)
+    # The Qdrant URL is read from an environment variable; requests go over gRPC unless QDRANT_PREFER_GRPC=0
+    vector_db = QdrantVectorDatabase(
+        url=os.environ["QDRANT_URL"],
+        prefer_grpc=os.environ.get("QDRANT_PREFER_GRPC", "1") == "1",
+        grpc_port=int(os.environ.get("QDRANT_GRPC_PORT", "6334")),
+        timeout=int(os.environ.get("QDRANT_TIMEOUT", "30")),
+        profile=collection_profile,
+    )
+llm = OpenAiLlm(
+    max_in_flight=int(os.environ.get("LLM_MAX_IN_FLIGHT", "8")),
+    timeout=float(os.environ.get("LLM_TIMEOUT", "120")),
+    max_retries=int(os.environ.get("LLM_MAX_RETRIES", "2")),
+)
+prompt_builder = PromptBuilder(
+    model_name="gpt-5-mini",
+    context_budget=int(os.environ.get("PROMPT_CONTEXT_TOKENS", "3000")),
+    duplicate_similarity=float(os.environ.get("PROMPT_DUPLICATE_SIMILARITY", "0.8")),
+)
+# answers are reused for repeated or paraphrased questions over the same retrieved chunks
+answer_cache = AnswerCache(
+    max_entries=int(os.environ.get("ANSWER_CACHE_MAX_ENTRIES", "1000")),
+    ttl_seconds=float(os.environ.get("ANSWER_CACHE_TTL", "3600")),
+    similarity_threshold=float(os.environ.get("ANSWER_CACHE_SIMILARITY", "0.95")),
+) if os.environ.get("ANSWER_CACHE", "1") == "1" else None
+# chunks are also indexed with BM25, so exact terms (article numbers, acronyms, course codes) are found
+lexical_index = BM25Index() if os.environ.get("LEXICAL_SEARCH", "1") == "1" else None
+index_manager = IndexManager(
+    extractor=extractor,
+    chunker=chunker,
+    embedder=embedder,
+    vector_db=vector_db,
+    collection_name=collection_name,
+    pages_per_batch=int(os.environ.get("EXTRACTION_PAGES_PER_BATCH", "4")),
+    max_concurrent_files=int(os.environ.get("INGESTION_CONCURRENT_FILES", "4")),
+    lexical_index=lexical_index,
+    # catalog of indexed documents, so existence checks and listings never scan the collection
+    registry=DocumentRegistry(path=os.environ.get("DOCUMENT_REGISTRY_PATH", "./document_registry.json")),
+    answer_cache=answer_cache,
+)
+# opt-in: first questions covered by one lexical match at least this well skip dense retrieval
+lexical_shortcut_coverage = os.environ.get("LEXICAL_SHORTCUT_COVERAGE")
+chat_bot = ChatBot(
+    embedder=embedder,
+    vector_db=vector_db,
+    llm=llm,
+    collection_name=collection_name,
+    top_k=int(os.environ.get("RETRIEVAL_TOP_K", "3")),
+    # small chunks can be indexed and still be answered from coherent context
+    neighbors=int(os.environ.get("RETRIEVAL_NEIGHBORS", "0")),
+    lexical_index=lexical_index,
+    fusion_candidates=int(os.environ.get("RETRIEVAL_FUSION_CANDIDATES", "10")),
+    # first questions covered by one chunk can be answered without the embedding call
+    lexical_shortcut_coverage=float(lexical_shortcut_coverage) if lexical_shortcut_coverage else None,
+    # the last user message and optional LLM sub-questions are searched alongside the conversation, in one batch
+    multi_query=os.environ.get("MULTI_QUERY", "1") == "1",
+    sub_questions=int(os.environ.get("SUB_QUESTIONS", "0")),
+    answer_cache=answer_cache,
+    # static instructions first, then the retrieved chunks packed into a token budget without duplicates
+    prompt_builder=prompt_builder,
+)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+        Prepares the vector collection and warms up the extraction and chunking workers and the
+        embedding cache on startup, and shuts them down on exit.
+    """
+    await asyncio.gather(pooled_extractor.warm_up(), chunker.warm_up(), index_manager.initialize())
+    # a fresh deployment restores the prebuilt index instead of re-indexing every document
+    if not index_manager.list_documents() and os.path.isfile(os.path.join(index_bundle_path, "manifest.json")):
+        try:
+            await index_manager.import_bundle(index_bundle_path)
+        except Exception as e:
+            print(f"Failed to import index bundle: {e}")
+    if os.path.isfile(frequent_questions_path):
+        with open(frequent_questions_path, "r", encoding="utf-8") as f:
+            questions = [line.strip() for line in f if line.strip()]
+        try:
+            embedded = await chat_bot.warm_up(questions)
+            print(f"Embedding cache warmed up: {embedded} of {len(questions)} frequent questions embedded")
+        except Exception as e:
+            print(f"Failed to warm up the embedding cache: {e}")
+    yield
+    pooled_extractor.close()
+    chunker.close()
+    embedding_cache.close()
+    if hasattr(base_embedder, "close"):
+        base_embedder.close()
+    await vector_db.close()
 
 
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 # CORS Middleware Configuration
 app.add_middleware(
     CORSMiddleware,
@@ -48,12 +202,26 @@ async def health_check():
     return {"status": "api is alive!"}
 
 
+@app.get("/metrics")
+async def metrics():
+    """
+        Reports the counters of the backend caches, of the LLM client and of the prompt builder.
+        Returns:
+            dict: A dictionary with the statistics of each cache, of the LLM client and of the prompt token counts.
+    """
+    stats = {"extraction_cache": markdown_cache.stats(), "embedding_cache": embedding_cache.stats(), "llm": llm.stats(), "prompt": prompt_builder.stats()}
+    if answer_cache is not None:
+        stats["answer_cache"] = answer_cache.stats()
+    return stats
+
+
 @app.post("/documents/insert")
 async def insert_document(file: UploadFile = File(...)):
     """
         Inserts a new document into the index for use by the chatbot.
-        Saves the file locally, checks if it's already indexed, and processes it for
-        extraction, chunking, embedding, and insertion into the vector database.
+        Saves the file locally and processes it for extraction, chunking, embedding, and insertion
+        into the vector database. If a file with the same name is already indexed, it is updated
+        incrementally: only new or changed chunks are embedded and chunks that disappeared are removed.
         Args:
             file (UploadFile): The file to be uploaded and indexed.
 
@@ -64,10 +232,8 @@ async def insert_document(file: UploadFile = File(...)):
     if not os.path.isdir(local_filepaths):
         os.mkdir(local_filepaths)
 
-    # file already indexed -  need to remove it and re-add it if you want to re-index it
-    indexed_files = await index_manager.list_stored_files()
-    if file.filename in indexed_files:
-        return {"filename": file.filename, "message": "file already indexed."}
+    # file already indexed - only its new or changed chunks are re-embedded
+    already_indexed = index_manager.is_indexed(file.filename)
 
     # define the path where you want to save the file
     file_location = os.path.join(local_filepaths, file.filename)
@@ -77,12 +243,20 @@ async def insert_document(file: UploadFile = File(...)):
     finally:
         await file.close()
 
-    status = await index_manager.insert([(file_location, uuid.uuid4())])
-    # Remove the local file after ingestion, regardless of success
-    if not status[0]:
+    # document IDs are derived from the filename, so re-uploads keep their chunk IDs stable
+    document_id = document_id_from_name(file.filename)
+    try:
+        if already_indexed:
+            status = await index_manager.update([(file_location, document_id)])
+        else:
+            status = await index_manager.insert([(file_location, document_id)])
+    finally:
+        # Remove the local file after ingestion, regardless of success
         os.remove(file_location)
+    if not status[0]:
         return {"filename": file.filename, "message": "Failed to insert file."}
-    os.remove(file_location)
+    if already_indexed:
+        return {"filename": file.filename, "message": "file re-indexed successfully"}
     return {"filename": file.filename, "message": "file indexed successfully"}
 
 
@@ -96,8 +270,7 @@ async def remove_document(filename: str):
         Returns:
             dict: A dictionary containing the filename and the status of the operation.
     """
-    indexed_files = await index_manager.list_stored_files()
-    if filename in indexed_files:
+    if index_manager.is_indexed(filename):
         status = await index_manager.remove([filename])
         if status[0]:
             return {"filename": filename, "message": "removed successfully."}
@@ -107,6 +280,28 @@ async def remove_document(filename: str):
         return {"filename": filename, "message": "file not found."}
 
 
+@app.post("/documents/remove_batch")
+async def remove_documents(filenames: List[str]):
+    """
+        Removes several documents from the vector database index with a single bulk delete.
+        Args:
+            filenames (List[str]): The names of the files to be removed.
+        Returns:
+            List[dict]: The filename and the status of the operation for each file, in input order.
+    """
+    status = await index_manager.remove(filenames)
+    results = []
+    for filename, removed in zip(filenames, status):
+        if removed:
+            message = "removed successfully."
+        elif not index_manager.is_indexed(filename):
+            message = "file not found."
+        else:
+            message = "failed to remove file."
+        results.append({"filename": filename, "message": message})
+    return results
+
+
 @app.post("/chat/interact")
 async def chat_interaction(messages: List[Dict[str, str]]):
     """
@@ -123,13 +318,75 @@ async def chat_interaction(messages: List[Dict[str, str]]):
     return {"message": msg}
 
 
+@app.post("/chat/stream")
+async def chat_stream(messages: List[Dict[str, str]], request: Request):
+    """
+        Streams a chat interaction as Server-Sent Events: a `sources` event with the retrieved chunks'
+        sources, `delta` events with the answer text as it is generated, then a `done` event
+        (or an `error` event). Generation stops when the client disconnects.
+        Args:
+            messages (List[Dict[str, str]]): A list of messages in the format
+                `[{"role": "user/bot", "content": "..."}]` representing
+                the conversation history, including the new user message.
+        Returns:
+            StreamingResponse: The `text/event-stream` response.
+    """
+    async def events():
+        stream = chat_bot.interact_stream(messages)
+        try:
+            async for event in stream:
+                if await request.is_disconnected():
+                    break
+                yield f"event: {event['type']}\ndata: {json.dumps(event, ensure_ascii=False)}\n\n"
+        except Exception as e:
+            print(f"Error while streaming chat response: {e}")
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'message': 'failed to generate response.'})}\n\n"
+        finally:
+            # closes the upstream LLM stream too
+            await stream.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # proxies must not buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/documents/list")
 async def list_documents():
     """
-        Lists all filenames that have been indexed in the vector database.
+        Lists all filenames that have been indexed in the vector database, from the document registry.
         Returns:
             dict: A dictionary with the key "local_documents" containing the list
-                of indexed filenames.
+                of indexed filenames, and the key "documents" containing their registry records
+                (document ID, chunk count, content hash and ingestion time).
+    """
+    documents = index_manager.list_documents()
+    return {
+        "local_documents": [d.name for d in documents],
+        "documents": [d.model_dump(mode="json") for d in documents],
+    }
+
+
+@app.post("/documents/bundle/export")
+async def export_index_bundle():
+    """
+        Exports the whole index to the bundle directory (INDEX_BUNDLE_PATH), from which a fresh
+        deployment restores it on startup.
+        Returns:
+            dict: The manifest of the exported bundle.
+    """
+    manifest = await index_manager.export_bundle(index_bundle_path)
+    return manifest.model_dump(mode="json")
+
+
+@app.post("/documents/registry/rebuild")
+async def rebuild_registry():
+    """
+        Rebuilds the document registry from the chunks stored in the vector database.
+        Returns:
+            dict: A dictionary containing the number of documents found.
     """
-    indexed_files = await index_manager.list_stored_files()
-    return {"local_documents": indexed_files}
+    await index_manager.rebuild_registry()
+    return {"documents": len(index_manager.list_documents())}
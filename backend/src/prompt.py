@@ -0,0 +1,193 @@
+from .ingestion.data_models import DataPoint
+from typing import Any, Dict, List, Set, Tuple
+import tiktoken
+import re
+
+
+# The static part of the prompt comes first and never changes between requests,
+# so the provider can serve it from its prompt cache.
+DEFAULT_INSTRUCTIONS = (
+    "Você é um assistente especializado em Normas Acadêmicas do Programa de Pós-Graduação da PUC-Rio.\n"
+    "Responda à pergunta do usuário utilizando estritamente o contexto fornecido, derivado de documentos oficiais das normas do programa.\n"
+    "- A resposta DEVE ser baseada exclusivamente no contexto. Não utilize conhecimento prévio, mesmo que pareça correto, "
+    "se ele não estiver explicitamente suportado no contexto.\n"
+    "- Seja direto, claro e preciso, e responda apenas o que foi perguntado.\n"
+    "- Se a informação puder ser atribuída a uma seção ou documento específico, faça a citação no final da resposta, "
+    "conforme a fonte indicada no contexto (exemplo: \"Ver Seção 3.2 do documento Regimento.pdf\").\n"
+    "- Se a resposta não puder ser encontrada de forma alguma no contexto, responda educadamente: \"Não encontrei "
+    "informações suficientes sobre este tópico nos documentos normativos fornecidos. Por favor, reformule a pergunta ou "
+    "consulte o site do Departamento de Informática ou a Secretaria do Programa de Pós-Graduação da PUC-Rio.\"\n"
+)
+CHUNK_TEMPLATE = "[Fonte: {source}]\n{text}"
+CHUNK_SEPARATOR = "\n\n"
+QUERY_TEMPLATE = "\nContexto:\n{chunks}\n\nPergunta do usuário:\n{query}\n\nResposta:"
+
+# overlaps shorter than this are not trimmed, so common openings are not mistaken for chunk overlap
+MIN_OVERLAP_CHARS = 32
+
+
+def format_source(chunk: DataPoint) -> str:
+    """
+        Formats the source of a chunk as its document name, followed by its section heading if known.
+        Args:
+            chunk (DataPoint): The retrieved chunk.
+        Returns:
+            str: The formatted source.
+    """
+    if chunk.section:
+        return f"{chunk.document_name}, {chunk.section}"
+    return chunk.document_name
+
+
+def _shingles(text: str, size: int = 3) -> Set[Tuple[str, ...]]:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {tuple(words)}
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def _overlap(head: str, tail: str) -> int:
+    """
+        Returns the length of the longest suffix of `head` that is also a prefix of `tail`.
+    """
+    probe = tail[:MIN_OVERLAP_CHARS]
+    if len(probe) < MIN_OVERLAP_CHARS:
+        return 0
+    start = head.find(probe)
+    while start != -1:
+        if tail.startswith(head[start:]):
+            return len(head) - start
+        start = head.find(probe, start + 1)
+    return 0
+
+
+class PromptBuilder:
+    """
+        Builds the prompt sent to the LLM: the static instructions first, then as many retrieved chunks
+        as fit in the context budget, then the question. Token counts use the tokenizer of the target model.
+    """
+    def __init__(self, model_name: str = "gpt-5-mini", context_budget: int = 3000, duplicate_similarity: float = 0.8,
+                 instructions: str = DEFAULT_INSTRUCTIONS):
+        """
+            Initializes the prompt builder.
+            Args:
+                model_name (str, optional): The model the prompt is sent to, whose tokenizer counts the tokens.
+                                            Defaults to "gpt-5-mini".
+                context_budget (int, optional): The maximum number of tokens of retrieved context in a prompt. Defaults to 3,000.
+                duplicate_similarity (float, optional): The word-trigram Jaccard similarity above which a chunk is dropped as a
+                                                        near-duplicate of a higher ranked one. Defaults to 0.8.
+                instructions (str, optional): The static instructions that open every prompt. Defaults to DEFAULT_INSTRUCTIONS.
+        """
+        self._context_budget = context_budget
+        self._duplicate_similarity = duplicate_similarity
+        self._instructions = instructions
+        try:
+            self._encoding = tiktoken.encoding_for_model(model_name)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+        self._separator_tokens = self.count_tokens(CHUNK_SEPARATOR)
+        self._requests = 0
+        self._prompt_tokens = 0
+        self._context_tokens = 0
+        self._last_prompt_tokens = 0
+        self._duplicates_dropped = 0
+        self._budget_dropped = 0
+
+    def count_tokens(self, text: str) -> int:
+        """
+            Counts the tokens of a text with the tokenizer of the target model.
+            Args:
+                text (str): The text.
+            Returns:
+                int: The number of tokens.
+        """
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+    def _deduplicate(self, chunks: List[DataPoint]) -> List[Tuple[DataPoint, str]]:
+        """
+            Drops chunks contained in, or nearly identical to, a higher ranked chunk, and trims the text a
+            chunk shares with a higher ranked chunk of the same document (such as the overlap added by the chunker).
+            Args:
+                chunks (List[DataPoint]): The retrieved chunks, in rank order.
+            Returns:
+                List[Tuple[DataPoint, str]]: The kept chunks, in rank order, with their trimmed texts.
+        """
+        kept: List[Tuple[DataPoint, str, Set[Tuple[str, ...]]]] = []
+        for chunk in chunks:
+            text = chunk.chunk_text.strip()
+            for other, other_text, _ in kept:
+                if other.document_name != chunk.document_name or not text:
+                    continue
+                if text in other_text:
+                    text = ""
+                    break
+                # text already sent at the end of the other chunk is cut from the start of this one, and vice versa
+                text = text[_overlap(other_text, text):]
+                cut = _overlap(text, other_text)
+                text = text[:len(text) - cut] if cut else text
+            shingles = _shingles(text)
+            if not text.strip() or any(len(shingles & s) / len(shingles | s) >= self._duplicate_similarity for _, _, s in kept):
+                self._duplicates_dropped += 1
+                continue
+            kept.append((chunk, text.strip(), shingles))
+        return [(chunk, text) for chunk, text, _ in kept]
+
+    def build(self, query: str, chunks: List[DataPoint]) -> Tuple[str, int]:
+        """
+            Builds the prompt for a query. Chunks are added in rank order while they, and the separators
+            between them, fit in the context budget; a chunk that does not fit is skipped, except the best
+            one, which is truncated.
+            Args:
+                query (str): The query text built from the conversation.
+                chunks (List[DataPoint]): The retrieved chunks, in rank order.
+            Returns:
+                Tuple[str, int]: The prompt and its number of tokens.
+        """
+        blocks = []
+        context_tokens = 0
+        for chunk, text in self._deduplicate(chunks):
+            block = CHUNK_TEMPLATE.format(source=format_source(chunk), text=text)
+            tokens = self._encoding.encode(block, disallowed_special=())
+            separator_tokens = self._separator_tokens if blocks else 0
+            remaining = self._context_budget - context_tokens - separator_tokens
+            if len(tokens) > remaining:
+                if blocks:
+                    self._budget_dropped += 1
+                    continue
+                tokens = tokens[:remaining]
+                block = self._encoding.decode(tokens)
+            blocks.append(block)
+            context_tokens += separator_tokens + len(tokens)
+
+        context = CHUNK_SEPARATOR.join(blocks)
+        # tokens can merge across block boundaries, so the joined context is counted as sent
+        context_tokens = self.count_tokens(context)
+        while context_tokens > self._context_budget and len(blocks) > 1:
+            blocks.pop()
+            self._budget_dropped += 1
+            context = CHUNK_SEPARATOR.join(blocks)
+            context_tokens = self.count_tokens(context)
+        prompt = self._instructions + QUERY_TEMPLATE.format(chunks=context, query=query)
+        prompt_tokens = self.count_tokens(prompt)
+        self._requests += 1
+        self._prompt_tokens += prompt_tokens
+        self._context_tokens += context_tokens
+        self._last_prompt_tokens = prompt_tokens
+        return prompt, prompt_tokens
+
+    def stats(self) -> Dict[str, Any]:
+        """
+            Reports the token counts of the built prompts.
+            Returns:
+                Dict[str, Any]: The number of prompts, their total, average and last token counts, the total tokens of
+                                retrieved context, and the chunks dropped as duplicates or for lack of budget.
+        """
+        return {
+            "requests": self._requests,
+            "prompt_tokens": self._prompt_tokens,
+            "avg_prompt_tokens": self._prompt_tokens / self._requests if self._requests else 0.0,
+            "last_prompt_tokens": self._last_prompt_tokens,
+            "context_tokens": self._context_tokens,
+            "duplicates_dropped": self._duplicates_dropped,
+            "budget_dropped": self._budget_dropped,
+        }
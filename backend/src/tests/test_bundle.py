@@ -0,0 +1,35 @@
+from backend.src.ingestion.bundle import BundleManifest, iter_chunk_batches, read_manifest, read_registry, write_bundle
+from backend.src.ingestion.data_models import DataPoint, DocumentRecord, document_id_from_name
+import asyncio
+import tempfile
+import uuid
+import os
+
+
+async def main():
+    document_id = document_id_from_name("Edital_PIPD.pdf")
+    data_points = [
+        DataPoint(id=uuid.uuid4(), document_id=document_id, document_name="Edital_PIPD.pdf", chunk_text=text,
+                  ordinal=ordinal, vector=vector)
+        for ordinal, (text, vector) in enumerate([("a", [0.1, 0.2, 0.3]), ("b", [0.4, 0.5, 0.6]), ("c", [0.7, 0.8, 0.9])])
+    ]
+    records = [DocumentRecord(name="Edital_PIPD.pdf", document_id=document_id, chunk_count=3)]
+    manifest = BundleManifest(created_at=0.0, collection_name="grad_documents", dimension=3, point_count=3,
+                              document_count=1, embedder="openai:text-embedding-3-small:3", chunker="markdown:2048:None:None")
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bundle")
+        write_bundle(path, manifest, data_points, records)
+        assert read_manifest(path) == manifest, "Manifest not restored"
+        assert read_registry(path) == records, "Registry not restored"
+
+        batches = list(iter_chunk_batches(path, batch_size=2))
+        assert [len(b) for b in batches] == [2, 1], "Unexpected batches"
+        restored = [p for b in batches for p in b.to_data_points(with_vectors=True)]
+        print(restored)
+        assert [(p.id, p.chunk_text, p.ordinal) for p in restored] == [(p.id, p.chunk_text, p.ordinal) for p in data_points], "Chunks not restored"
+        assert abs(restored[2].vector[1] - 0.8) < 1e-6, "Vectors not restored"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,72 @@
+from backend.src.ingestion.cache import AnswerCache, EmbeddingCache, MarkdownCache
+from backend.src.ingestion.extraction import ProcessPoolExtractor, CachedExtractor
+from backend.src.ingestion.embeddings import CachedEmbedder, OpenAiEmbedder
+import asyncio
+import tempfile
+import uuid
+
+
+async def main():
+    sources = [
+        "../ingestion/data/Edital-PG-INF-2025.2.pdf",
+        "../ingestion/data/Edital_PIPD.pdf",
+        "../ingestion/data/Regulamento-PG-DI-2022-12-06.pdf",
+    ]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        # eviction keeps the cache under its size bound, dropping least recently used entries first
+        small_cache = MarkdownCache(cache_dir=cache_dir, max_size_bytes=10)
+        small_cache.put("a", "12345")
+        small_cache.put("b", "12345")
+        assert small_cache.get("a") == "12345", "Cache entry not found"
+        small_cache.put("c", "12345")
+        assert small_cache.get("b") is None, "Least recently used entry was not evicted"
+        print(small_cache.stats())
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pooled_extractor = ProcessPoolExtractor(num_workers=2)
+        extractor = CachedExtractor(extractor=pooled_extractor, cache=MarkdownCache(cache_dir=cache_dir))
+
+        first = [await extractor.extract_text(s) for s in sources]
+        # re-ingestion is served from the cache without running docling
+        second = [await extractor.extract_text(s) for s in sources]
+        assert first == second, "Cached extraction differs from the original"
+        stats = extractor._cache.stats()
+        assert stats["hits"] == len(sources) and stats["misses"] == len(sources), "Unexpected cache counters"
+        print(stats)
+        pooled_extractor.close()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        questions = ["user: Qual é o prazo de qualificação?", "user: Como comprovar a proficiência em inglês?"]
+        embedder = CachedEmbedder(embedder=OpenAiEmbedder(), cache=EmbeddingCache(cache_dir=cache_dir))
+        assert await embedder.warm(questions) == len(questions), "Questions were already cached"
+        # repeated questions are answered from memory, without calling the API
+        first = await embedder.embed(questions, is_query=True)
+        assert embedder.stats()["memory_hits"] == len(questions), "Unexpected cache counters"
+        embedder._cache.close()
+
+        # a new process reads the vectors back from disk
+        embedder = CachedEmbedder(embedder=OpenAiEmbedder(), cache=EmbeddingCache(cache_dir=cache_dir, max_memory_entries=1))
+        second = await embedder.embed(questions, is_query=True)
+        assert first == second, "Cached embeddings differ from the original"
+        stats = embedder.stats()
+        assert stats["disk_hits"] == len(questions) and stats["misses"] == 0, "Unexpected cache counters"
+        print(stats)
+        embedder._cache.close()
+
+    # a paraphrased question answered from the same chunks reuses the answer
+    answers = AnswerCache(similarity_threshold=0.9)
+    chunk_ids = [uuid.uuid4(), uuid.uuid4()]
+    answers.put("Qual é o prazo?", [1.0, 0.0], chunk_ids, ["edital.pdf"], "30 dias")
+    assert answers.get("qual é o  prazo?", None, chunk_ids) == "30 dias", "Exact question was not served"
+    assert answers.get("Qual o prazo final?", [0.99, 0.05], chunk_ids[::-1]) == "30 dias", "Similar question was not served"
+    assert answers.get("Qual o prazo final?", [0.99, 0.05], chunk_ids[:1]) is None, "Answer served from other chunks"
+    assert answers.get("Quem coordena?", [0.0, 1.0], chunk_ids) is None, "Unrelated question was served"
+    # changing a document drops the answers that depend on it
+    assert answers.invalidate_documents(["edital.pdf"]) == 1, "Answer was not invalidated"
+    assert answers.get("Qual é o prazo?", [1.0, 0.0], chunk_ids) is None, "Invalidated answer was served"
+    print(answers.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -17,6 +17,18 @@ async def main():
     for idx, chunk in enumerate(chunks):
         print(f"Chunk {idx}:")
         print(chunk.model_dump())
+    # every chunk is kept, repeated ones included, so ordinals follow the document without gaps
+    assert [p.ordinal for p in chunks] == list(range(len(chunks))), "Chunk ordinals are not contiguous"
+
+    # batch chunking spread over a pool of pre-warmed pipelines maps chunks back to each document
+    pooled_chunker = MarkdownChunker(num_workers=2)
+    await pooled_chunker.warm_up()
+    document_id = uuid.uuid4()
+    batches = await pooled_chunker.chunk_batch([(result, document_id, "a.pdf"), ("# Short\n\nShort document.", uuid.uuid4(), "b.pdf")])
+    assert len(batches) == 2, "Batch chunking did not return one list per document"
+    assert [p.chunk_text for p in batches[0]] == [p.chunk_text for p in chunks], "Batch chunking differs from single chunking"
+    assert all(p.document_name == "b.pdf" for p in batches[1]), "Chunks mapped to the wrong document"
+    pooled_chunker.close()
 
 
 if __name__ == "__main__":
@@ -1,4 +1,5 @@
-from backend.src.ingestion.embeddings import SentenceTransformerEmbedder, OpenAiEmbedder
+from backend.src.ingestion.embeddings import SentenceTransformerEmbedder, OnnxEmbedder, OpenAiEmbedder
+import numpy as np
 import asyncio
 
 
@@ -23,6 +24,27 @@ async def main():
     print(embeddings_st_as_document)
     print(embeddings_openai)
 
+    # concurrent queries are merged into batched encodes and keep their own results
+    concurrent = await asyncio.gather(*[sentence_embedder.embed([d], is_query=True) for d in documents])
+    # padding within a batch may change the last digits of the vectors
+    assert np.allclose([c[0] for c in concurrent], embeddings_st_as_query, atol=1e-5), "Batched embeddings differ from the original"
+
+    # the full-precision ONNX export reproduces the PyTorch embeddings
+    onnx_embedder = OnnxEmbedder(quantize=False)
+    embeddings_onnx = await onnx_embedder.embed(documents, is_query=True)
+    assert np.allclose(embeddings_onnx, embeddings_st_as_query, atol=1e-4), "ONNX embeddings differ from PyTorch"
+    onnx_embedder.close()
+
+    # shortened embeddings match the dimension reported to the vector collection
+    short_embedder = OpenAiEmbedder(dimensions=256)
+    short_embeddings = await short_embedder.embed(documents, is_query=False)
+    assert all(len(e) == short_embedder.dimension() == 256 for e in short_embeddings), "Unexpected embedding dimension"
+    truncated_embedder = SentenceTransformerEmbedder(dimensions=128)
+    truncated_embeddings = await truncated_embedder.embed(documents, is_query=False)
+    assert np.allclose(np.linalg.norm(truncated_embeddings, axis=1), 1.0), "Truncated embeddings are not normalized"
+    truncated_embedder.close()
+    sentence_embedder.close()
+
 
 if __name__ == "__main__":
     asyncio.run(main())
@@ -1,4 +1,4 @@
-from backend.src.ingestion.extraction import DoclingExtractor
+from backend.src.ingestion.extraction import DoclingExtractor, ProcessPoolExtractor
 import asyncio
 
 
@@ -9,5 +9,23 @@ async def main():
     assert type(result) == str, "Extraction not successful. Output type is not a string"
     print(result)
 
+    pooled_extractor = ProcessPoolExtractor(num_workers=2, job_timeout=600)
+    await pooled_extractor.warm_up()
+    sources = [
+        "../ingestion/data/Edital-PG-INF-2025.2.pdf",
+        "../ingestion/data/Edital_PIPD.pdf",
+        source,
+    ]
+    results = await asyncio.gather(*[pooled_extractor.extract_text(s) for s in sources])
+    for r in results:
+        assert type(r) == str, "Pooled extraction not successful. Output type is not a string"
+    assert results[-1] == result, "Pooled extraction differs from in-process extraction"
+
+    # stream the document in windows of two pages
+    windows = [w async for w in pooled_extractor.extract_pages(source, pages_per_batch=2)]
+    assert all(type(w) == str for w in windows), "Streaming extraction not successful. Output type is not a string"
+    print(f"Streamed {len(windows)} windows")
+    pooled_extractor.close()
+
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    asyncio.run(main())
@@ -3,29 +3,55 @@ from backend.src.ingestion.extraction import DoclingExtractor
 from backend.src.ingestion.ingest import IndexManager
 from backend.src.ingestion.embeddings import OpenAiEmbedder
 from backend.src.ingestion.vector_db import QdrantVectorDatabase
-import uuid
+from backend.src.ingestion.data_models import document_id_from_name
+import numpy as np
 import asyncio
 
 
+class CountingEmbedder(OpenAiEmbedder):
+    """
+        Counts the chunks sent to the embedding model.
+    """
+    embedded = 0
+
+    async def embed_array(self, texts, is_query: bool) -> np.ndarray:
+        self.embedded += len(texts)
+        return await super().embed_array(texts, is_query)
+
+
 async def main():
     collection_name = "collection_collection"
 
     db_client = QdrantVectorDatabase(url="localhost:6333")
     files = [
-        ("../ingestion/data/Edital-PG-INF-2025.2.pdf", uuid.uuid4()),
-        ("../ingestion/data/Edital_PIPD.pdf", uuid.uuid4()),
-        ("../ingestion/data/Regulamento-PG-DI-2022-12-06.pdf", uuid.uuid4())
+        ("../ingestion/data/Edital-PG-INF-2025.2.pdf", document_id_from_name("Edital-PG-INF-2025.2.pdf")),
+        ("../ingestion/data/Edital_PIPD.pdf", document_id_from_name("Edital_PIPD.pdf")),
+        ("../ingestion/data/Regulamento-PG-DI-2022-12-06.pdf", document_id_from_name("Regulamento-PG-DI-2022-12-06.pdf"))
     ]
     extractor = DoclingExtractor()
     chunker = MarkdownChunker()
-    embedder = OpenAiEmbedder()
+    embedder = CountingEmbedder()
     vector_db = QdrantVectorDatabase(url="localhost:6333")
 
     index_manager = IndexManager(extractor=extractor, chunker=chunker, embedder=embedder, vector_db=vector_db, collection_name=collection_name)
+    await index_manager.initialize()
 
     status = await index_manager.insert(files)
     print(status)
 
+    stored_ids = {
+        name: set(await vector_db.list_chunk_positions(collection_name, name)) for name in await index_manager.list_stored_files()
+    }
+    embedder.embedded = 0
+
+    # re-indexing unchanged files embeds nothing and keeps every stored chunk
+    status = await index_manager.update(files)
+    print(status)
+    assert all(status), "Update failed"
+    assert embedder.embedded == 0, f"Update re-embedded {embedder.embedded} unchanged chunks"
+    for name, ids in stored_ids.items():
+        assert set(await vector_db.list_chunk_positions(collection_name, name)) == ids, f"Chunk IDs of {name} changed"
+
     unique_documents = await index_manager.list_stored_files()
     print(unique_documents)
 
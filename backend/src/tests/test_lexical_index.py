@@ -0,0 +1,35 @@
+from backend.src.ingestion.lexical_index import BM25Index, tokenize
+from backend.src.ingestion.data_models import DataPoint, document_id_from_name
+import asyncio
+import uuid
+
+
+async def main():
+    # accents and plurals are folded, stopwords dropped, codes kept whole
+    assert tokenize("Qualificações das Bolsas CAPES, Art. 12 e INF2102") == ["qualificacao", "bolsa", "cape", "art", "12", "inf2102"]
+
+    document_name = "Regulamento.pdf"
+    document_id = document_id_from_name(document_name)
+    texts = [
+        "O exame de qualificação deve ocorrer até o 24º mês do doutorado.",
+        "A proficiência em inglês é comprovada por exame.",
+        "Bolsas CAPES exigem dedicação integral.",
+        "Art. 12 trata do trancamento de matrícula.",
+    ]
+    index = BM25Index()
+    index.add([
+        DataPoint(id=uuid.uuid4(), document_id=document_id, document_name=document_name, chunk_text=t, ordinal=i, vector=[])
+        for i, t in enumerate(texts)
+    ])
+
+    results = index.search("bolsa da CAPES", top_k=2)
+    print(results)
+    assert results[0][0].chunk_text == texts[2] and results[0][1] == 1.0, "Exact terms not ranked first"
+    assert index.search("Art. 12")[0][0].chunk_text == texts[3], "Article number not matched"
+
+    index.remove_document(document_name)
+    assert len(index) == 0 and index.search("CAPES") == [], "Document not removed from the index"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
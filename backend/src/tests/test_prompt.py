@@ -0,0 +1,46 @@
+from backend.src.prompt import DEFAULT_INSTRUCTIONS, PromptBuilder
+from backend.src.ingestion.data_models import DataPoint
+import asyncio
+import uuid
+
+# PromptBuilder counts tokens with tiktoken, which downloads the model's encoding on first use:
+# run this test once with network access, or point TIKTOKEN_CACHE_DIR at a directory holding the encoding.
+
+
+def make_chunk(text: str, document_name: str = "Regulamento.pdf", ordinal: int = 0) -> DataPoint:
+    return DataPoint(id=uuid.uuid4(), document_id=uuid.uuid4(), document_name=document_name, chunk_text=text, ordinal=ordinal, vector=[])
+
+
+async def main():
+    shared = "O prazo para o exame de qualificação é de vinte e quatro meses após a matrícula inicial."
+    chunks = [
+        make_chunk("Art. 10. O aluno deve cumprir os créditos obrigatórios. " + shared, ordinal=0),
+        # the overlap added by the chunker is sent once
+        make_chunk(shared + " Art. 11. A defesa ocorre em sessão pública.", ordinal=1),
+        # a near-duplicate of a higher ranked chunk is dropped
+        make_chunk("Art. 10 - O aluno deve cumprir os créditos obrigatórios. " + shared, document_name="Regulamento-copia.pdf"),
+        make_chunk("As bolsas de estudo são concedidas conforme a disponibilidade de cotas.", document_name="Edital.pdf"),
+    ]
+
+    builder = PromptBuilder(context_budget=1000)
+    prompt, prompt_tokens = builder.build("user: Qual é o prazo de qualificação?", chunks)
+    print(prompt)
+    assert prompt.startswith(DEFAULT_INSTRUCTIONS), "Static instructions are not the prompt prefix"
+    assert prompt.count(shared) == 1, "Overlapping text was repeated"
+    assert "Art. 11" in prompt and "bolsas" in prompt, "Distinct context was dropped"
+    assert prompt_tokens == builder.count_tokens(prompt), "Unexpected token count"
+
+    # chunks that do not fit in the budget are left out
+    small = PromptBuilder(context_budget=40)
+    prompt, _ = small.build("user: Qual é o prazo de qualificação?", chunks)
+    assert "bolsas" not in prompt and small.stats()["budget_dropped"] > 0, "Context budget was exceeded"
+    # the separators between chunks count towards the budget
+    for budget in (40, 60, 80, 120):
+        packer = PromptBuilder(context_budget=budget)
+        packer.build("user: Qual é o prazo de qualificação?", chunks)
+        assert packer.stats()["context_tokens"] <= budget, f"Context exceeds a budget of {budget} tokens"
+    print(builder.stats(), small.stats())
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
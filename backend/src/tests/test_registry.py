@@ -0,0 +1,37 @@
+from backend.src.ingestion.registry import DocumentRegistry
+from backend.src.ingestion.data_models import DataPoint, DocumentRecord, document_id_from_name
+import asyncio
+import tempfile
+import uuid
+import os
+
+
+async def main():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "registry.json")
+        registry = DocumentRegistry(path=path)
+        assert not registry.loaded, "Registry file should not exist yet"
+
+        document_id = document_id_from_name("Edital_PIPD.pdf")
+        registry.put(DocumentRecord(name="Edital_PIPD.pdf", document_id=document_id, chunk_count=3, content_hash="abc", ingested_at=1.0))
+        # the registry is persisted and loaded back on startup
+        registry = DocumentRegistry(path=path)
+        assert registry.loaded and "Edital_PIPD.pdf" in registry, "Registry not persisted"
+
+        # rebuilding from stored chunks keeps the metadata of the latest version
+        registry.rebuild([
+            DataPoint(id=uuid.uuid4(), document_id=document_id, document_name="Edital_PIPD.pdf", chunk_text="a",
+                      content_hash="old", ingested_at=1.0, vector=None),
+            DataPoint(id=uuid.uuid4(), document_id=document_id, document_name="Edital_PIPD.pdf", chunk_text="b",
+                      content_hash="new", ingested_at=2.0, vector=None),
+        ])
+        record = registry.get("Edital_PIPD.pdf")
+        print(record)
+        assert record.chunk_count == 2 and record.content_hash == "new", "Unexpected rebuilt record"
+
+        registry.remove("Edital_PIPD.pdf")
+        assert len(DocumentRegistry(path=path)) == 0, "Removal not persisted"
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,13 +1,13 @@
-from backend.src.ingestion.vector_db import QdrantVectorDatabase
+from backend.src.ingestion.vector_db import BaseVectorDatabase, NumpyVectorDatabase, QdrantVectorDatabase, COLLECTION_PROFILES, merge_neighbors
 from backend.src.ingestion.data_models import DataPoint
 import asyncio
+import tempfile
 import uuid
 
 
-async def main():
+async def run_scenario(db_client: BaseVectorDatabase):
     collection_name = "collection_collection"
-    db_client = QdrantVectorDatabase(url="localhost:6333")
-    db_client.create_collection(collection_name, vector_field_dimension=4)
+    await db_client.create_collection(collection_name, vector_field_dimension=4)
 
     document_id_1 = uuid.uuid4()
     document_id_2 = uuid.uuid4()
@@ -25,19 +25,56 @@ async def main():
             DataPoint(id=uuid.uuid4(), document_id=document_id_3, document_name=document_name, chunk_text="f", vector=[0.35, 0.08, 0.11, 0.44]),
         ],
     )
-    assert operation_info, "Points not uploaded to Qdrant collection"
+    assert operation_info, "Points not uploaded to the collection"
 
     search_results = await db_client.retrieve(
         collection_name=collection_name,
         query_vector=[0.2, 0.1, 0.9, 0.7],
     )
     print(search_results)
+    assert [p.chunk_text for p in search_results] == ["d", "a", "e"], "Unexpected search results"
+
+    batch_results = await db_client.retrieve_batch(
+        collection_name=collection_name,
+        query_vectors=[[0.2, 0.1, 0.9, 0.7], [0.35, 0.08, 0.11, 0.44]],
+        top_k=3,
+    )
+    assert [p.chunk_text for p in batch_results[0]] == ["d", "a", "e"], "Unexpected batch search results"
+    assert batch_results[1][0].chunk_text == "f", "Unexpected batch search results"
 
     unique_documents = await db_client.list_unique_documents(collection_name=collection_name)
     print(unique_documents)
 
-    await db_client.remove(collection_name=collection_name , document_name=document_name)
+    assert await db_client.remove_documents(collection_name=collection_name, document_ids=[document_id_1, document_id_2]), "Bulk removal failed"
+    remaining = await db_client.retrieve(collection_name=collection_name, query_vector=[0.2, 0.1, 0.9, 0.7], top_k=6)
+    assert sorted(p.chunk_text for p in remaining) == ["c", "f"], "Documents not removed in bulk"
+
+    assert await db_client.remove(collection_name=collection_name , document_name=document_name), "Removal failed"
+    assert await db_client.list_unique_documents(collection_name=collection_name) == [], "Document not removed"
     await db_client.delete_collection(collection_name)
 
+
+def check_merge_neighbors():
+    document_id = uuid.uuid4()
+    chunks = [
+        DataPoint(id=uuid.uuid4(), document_id=document_id, document_name="doc", chunk_text=str(i), ordinal=i, vector=[])
+        for i in range(6)
+    ]
+    # the third hit's window bridges the windows of the first two, so all three form one passage
+    hits = [chunks[0], chunks[4], chunks[2]]
+    passages = merge_neighbors(hits, chunks, neighbors=1)
+    assert len(passages) == 1, "Chained windows were not merged"
+    assert passages[0].chunk_text == "\n\n".join(str(i) for i in range(6)), "Chunks repeated or missing"
+    assert passages[0].id == chunks[0].id and passages[0].ordinal == 0, "Unexpected passage position"
+
+
+async def main():
+    check_merge_neighbors()
+    await run_scenario(QdrantVectorDatabase(url="localhost:6333"))
+    # quantized collections return the same results once rescored
+    await run_scenario(QdrantVectorDatabase(url="localhost:6333", profile=COLLECTION_PROFILES["balanced"]))
+    with tempfile.TemporaryDirectory() as path:
+        await run_scenario(NumpyVectorDatabase(path=path))
+
 if __name__ == "__main__":
     asyncio.run(main())
@@ -12,6 +12,7 @@ export default function DocumentChatApp() {
     uploadUrl: 'http://localhost:8000/documents/insert',
     deleteUrl: 'http://localhost:8000/documents/remove',
     chatUrl: 'http://localhost:8000/chat/interact',
+    streamUrl: 'http://localhost:8000/chat/stream',
     listUrl: 'http://localhost:8000/documents/list'
   });
 
@@ -119,7 +120,7 @@ export default function DocumentChatApp() {
     setIsLoading(true);
 
     try {
-      const response = await fetch(apiConfig.chatUrl, {
+      const response = await fetch(apiConfig.streamUrl, {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
@@ -127,18 +128,39 @@ export default function DocumentChatApp() {
         body: JSON.stringify(updatedMessages.map(m => ({ role: m.role, content: m.content }))),
       });
 
-      if (response.ok) {
-        const data = await response.json();
-        const assistantMessage = {
-          role: 'assistant',
-          content: data.message,
-          timestamp: new Date().toLocaleTimeString('pt-BR', { hour: '2-digit', minute: '2-digit' })
-        };
-        setMessages([...updatedMessages, assistantMessage]);
-      } else {
+      if (!response.ok) {
         console.error('Erro na API:', response.statusText);
         throw new Error('Erro na API');
       }
+
+      // A resposta chega como Server-Sent Events: as fontes primeiro, depois o texto aos poucos
+      const assistantMessage = {
+        role: 'assistant',
+        content: '',
+        timestamp: new Date().toLocaleTimeString('pt-BR', { hour: '2-digit', minute: '2-digit' })
+      };
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      while (true) {
+        const { done, value } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+        const events = buffer.split('\n\n');
+        buffer = events.pop();
+        for (const raw of events) {
+          const dataLine = raw.split('\n').find(line => line.startsWith('data: '));
+          if (!dataLine) continue;
+          const event = JSON.parse(dataLine.slice(6));
+          if (event.type === 'delta') {
+            assistantMessage.content += event.text;
+            setMessages([...updatedMessages, { ...assistantMessage }]);
+            setIsLoading(false);
+          } else if (event.type === 'error') {
+            throw new Error(event.message);
+          }
+        }
+      }
     } catch (error) {
       console.error('Erro na requisição:', error);
     } finally {